@@ -0,0 +1,28 @@
+import api from './api'
+
+// Syncs a list against one of the /changes/ endpoints. `synced` is the result of the
+// previous call ({ token, list }); the first call fetches the whole list, later calls
+// only what was inserted, updated or deleted since.
+export async function syncList(url, synced = { token: null, list: [] }) {
+    let { token, list } = synced;
+    let more = true;
+    while (more) {
+        const res = await api.get(url, { params: token === null ? {} : { since: token } });
+        const { changed, deleted, reset } = res.data;
+        if (reset) {
+            list = changed;
+        } else {
+            const updates = new Map(changed.map(item => [item.id, item]));
+            const known = new Set(list.map(item => item.id));
+            list = [
+                ...changed.filter(item => !known.has(item.id)),
+                ...list
+                    .filter(item => !deleted.includes(item.id))
+                    .map(item => updates.get(item.id) || item),
+            ];
+        }
+        token = res.data.token;
+        more = res.data.more;
+    }
+    return { token, list };
+}
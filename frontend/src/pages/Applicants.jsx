@@ -1,6 +1,7 @@
-import { useEffect, useState } from "react";
+import { useEffect, useRef, useState } from "react";
 import { useParams, useNavigate } from "react-router-dom";
 import api from "../api";
+import { syncList } from "../changes";
 import ApplicantStack from "../components/ApplicantStack";
 import { FaAngleLeft, FaClone, FaList } from "react-icons/fa";
 
@@ -12,18 +13,26 @@ function Applicants() {
     const [statusFilter, setStatusFilter] = useState("PENDING");
     const [view, setView] = useState("stack");
     const navigate = useNavigate();
+    // Server copy of the list, kept current through the applicants change feed
+    const syncedRef = useRef(undefined);
 
     useEffect(() => {
+        syncedRef.current = undefined;
         fetchApplicants();
     }, [jobId]);
 
+    const syncApplicants = async () => {
+        syncedRef.current = await syncList(`/api/jobs/${jobId}/applicants/changes/`, syncedRef.current);
+        return syncedRef.current.list;
+    };
+
     const fetchApplicants = async () => {
         setLoading(true);
         try {
-            const res = await api.get(`/api/jobs/${jobId}/applicants/`);
-            setApplicants(res.data);
+            const list = await syncApplicants();
+            setApplicants(list);
             setOrderedApplicants(prev =>
-                prev.length === 0 ? res.data : prev
+                prev.length === 0 ? list : prev
             );
         } catch (err) {
             alert("Failed to load applicants");
@@ -35,9 +44,9 @@ function Applicants() {
     const refreshApplicants = async () => {
         setLoading(true);
         try {
-            const res = await api.get(`/api/jobs/${jobId}/applicants/`);
-            setApplicants(res.data);
-            setOrderedApplicants(res.data);
+            const list = await syncApplicants();
+            setApplicants(list);
+            setOrderedApplicants(list);
         } catch (err) {
             alert("Failed to load applicants");
         } finally {
@@ -1,18 +1,24 @@
-import { useEffect, useState } from "react";
+import { useEffect, useRef, useState } from "react";
 import api from "../api";
+import { syncList } from "../changes";
 import JobCard from "../components/JobCard";
 
 function AppliedJobs() {
     const [jobs, setJobs] = useState([]);
     const [confirmWithdrawId, setConfirmWithdrawId] = useState(null);
+    const syncedRef = useRef(undefined);
 
     useEffect(() => {
         getApplications();
     }, []);
 
+    // Whole list on first load, then only what changed (status updates, withdrawals)
     const getApplications = () => {
-        api.get("/api/applied/")
-            .then(res => setJobs(res.data))
+        syncList("/api/applied/changes/", syncedRef.current)
+            .then(synced => {
+                syncedRef.current = synced;
+                setJobs(synced.list);
+            })
             .catch(() => alert("Failed to load applied jobs"));
     };
 
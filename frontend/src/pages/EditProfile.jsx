@@ -39,9 +39,6 @@ function EditProfile() {
         experiences: []
     });
 
-    const [deletedEducationIds, setDeletedEducationIds] = useState([]);
-    const [deletedExperienceIds, setDeletedExperienceIds] = useState([]);
-
     useEffect(() => {
         const fetchData = async () => {
             try {
@@ -155,7 +152,6 @@ function EditProfile() {
     };
 
     const markEducationForDeletion = (id, idx) => {
-        if (id) setDeletedEducationIds([...deletedEducationIds, id]);
         setProfile(prev => ({
             ...prev,
             educations: prev.educations.filter((_, i) => i !== idx)
@@ -187,7 +183,6 @@ function EditProfile() {
     };
 
     const markExperienceForDeletion = (id, idx) => {
-        if (id) setDeletedExperienceIds([...deletedExperienceIds, id]);
         setProfile(prev => ({
             ...prev,
             experiences: prev.experiences.filter((_, i) => i !== idx)
@@ -217,37 +212,11 @@ function EditProfile() {
             if (profile.city) profileData.append("city", profile.city);
             if (profile.country) profileData.append("country", profile.country);
 
-            await api.put("/api/profile/edit/", profileData);
-
-            // Save educations
-            for (const edu of profile.educations) {
-                if (edu.id) {
-                    await api.put(`/api/educations/${edu.id}/`, edu);
-                } else {
-                    await api.post("/api/educations/", edu);
-                }
-            }
-
-            // Delete marked educations
-            for (const id of deletedEducationIds) {
-                await api.delete(`/api/educations/${id}/`);
-            }
-            setDeletedEducationIds([]);
+            // Rows missing from these lists are deleted by the server
+            profileData.append("educations", JSON.stringify(profile.educations));
+            profileData.append("experiences", JSON.stringify(profile.experiences));
 
-            // Save experiences
-            for (const exp of profile.experiences) {
-                if (exp.id) {
-                    await api.put(`/api/experiences/${exp.id}/`, exp);
-                } else {
-                    await api.post("/api/experiences/", exp);
-                }
-            }
-
-            // Delete marked experiences
-            for (const id of deletedExperienceIds) {
-                await api.delete(`/api/experiences/${id}/`);
-            }
-            setDeletedExperienceIds([]);
+            await api.put("/api/profile/sync/", profileData);
 
             setSuccess("Profile updated successfully!");
             setTimeout(() => navigate(`/profile/${username}`), 1500);
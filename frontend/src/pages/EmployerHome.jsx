@@ -11,7 +11,8 @@ function EmployerHome() {
     }, []);
 
     const getJobs = () => {
-        api.get("/api/jobs/")
+        // Every job of this employer with its applicant counts
+        api.get("/api/jobs/dashboard/")
             .then((res) => res.data)
             .then((data) => setJobs(data))
             .catch((err) => alert(err));
@@ -45,7 +46,7 @@ function EmployerHome() {
                                     to={`/jobs/${job.id}/applicants`}
                                     className="text-blue-600 hover:underline text-sm"
                                 >
-                                    View Applicants
+                                    View Applicants ({job.applicant_count}, {job.pending_count} pending)
                                 </Link>
                                 <button
                                     onClick={() => deleteJob(job.id)}
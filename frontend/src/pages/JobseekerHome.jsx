@@ -1,20 +1,26 @@
-import { useState, useEffect } from 'react';
+import { useState, useEffect, useRef } from 'react';
 import { jwtDecode } from "jwt-decode";
 import { ACCESS_TOKEN } from "../constants";
 import api from '../api';
 import JobStack from '../components/JobStack';
 import TutorialCard, { TutorialRotate } from '../components/TutorialCard';
 
+// Fetch the next page once fewer unswiped cards than this are left
+const PREFETCH_AT = 5;
+// Served one after the other: the personalized ranking, then every other unseen job, newest first
+const JOB_FEEDS = ["/api/jobs/recommended/", "/api/jobs/feed/"];
+
 function JobseekerHome() {
-    const [jobs, setJobs] = useState([]);
     const [orderedJobs, setOrderedJobs] = useState([]);
     const [appliedJobIds, setAppliedJobIds] = useState([]);
+    const [skippedJobIds, setSkippedJobIds] = useState([]);
+    const [pagesLoaded, setPagesLoaded] = useState(0);
     const [showTutorial, setShowTutorial] = useState(false);
+    const nextPage = useRef(JOB_FEEDS[0]);
+    const feedIndex = useRef(0);
+    const loadingPage = useRef(false);
 
     useEffect(() => {
-        getJobs();
-        getAppliedJobs();
-
         const token = localStorage.getItem(ACCESS_TOKEN);
         let username = null;
         let account = null;
@@ -37,23 +43,33 @@ function JobseekerHome() {
         }
     }, []);
 
+    // Recommended jobs, best match first, then the unseen-jobs feed once the ranking runs
+    // out; both exclude jobs the user has applied to. Pages are fetched one at a time by
+    // following `next` as the stack drains.
     const getJobs = () => {
-        api.get("/api/jobs/")
-            .then((res) => res.data)
-            .then((data) => {
-                setJobs(data);
-                setOrderedJobs(prev => prev.length === 0 ? data : prev);
-            })
-            .catch((err) => alert(err));
-    };
-
-    const getAppliedJobs = () => {
-        api.get("/api/applied/")
-            .then((res) => res.data)
-            .then((data) => {
-                setAppliedJobIds(data.map(app => typeof app.job === "object" ? app.job.id : app.job));
+        if (!nextPage.current || loadingPage.current) return;
+        loadingPage.current = true;
+        api.get(nextPage.current)
+            .then((res) => {
+                loadingPage.current = false;
+                if (res.data.next) {
+                    nextPage.current = res.data.next;
+                } else {
+                    feedIndex.current += 1;
+                    nextPage.current = JOB_FEEDS[feedIndex.current] || null;
+                }
+                setOrderedJobs(prev => {
+                    const known = new Set(prev.map(job => job.id));
+                    // The top card is the last one, so a page goes in reversed, under the cards already there
+                    const page = res.data.results.filter(job => !known.has(job.id)).reverse();
+                    return [...page, ...prev];
+                });
+                setPagesLoaded(n => n + 1);
             })
-            .catch((err) => alert(err));
+            .catch((err) => {
+                loadingPage.current = false;
+                alert(err);
+            });
     };
 
     const applyToJob = (jobId) => {
@@ -62,7 +78,7 @@ function JobseekerHome() {
                 if (res.status === 201) {
                     localStorage.setItem("hasUnseenApplications", "true");
                     window.dispatchEvent(new Event("hasUnseenApplications"));
-                    getAppliedJobs();
+                    setAppliedJobIds(prev => [...prev, jobId]);
                 } else {
                     alert('Failed to apply.');
                 }
@@ -82,6 +98,7 @@ function JobseekerHome() {
     };
 
     const handleSkipJob = (jobId) => {
+        setSkippedJobIds(prev => prev.includes(jobId) ? prev : [...prev, jobId]);
         setOrderedJobs(prev => {
             const idx = prev.findIndex(job => job.id === jobId);
             if (idx === -1) return prev;
@@ -95,6 +112,13 @@ function JobseekerHome() {
     const unappliedJobs = orderedJobs.filter(
         job => !appliedJobIds.includes(job.id)
     );
+    const unswipedCount = unappliedJobs.filter(job => !skippedJobIds.includes(job.id)).length;
+
+    useEffect(() => {
+        if (unswipedCount < PREFETCH_AT) {
+            getJobs();
+        }
+    }, [unswipedCount, pagesLoaded]);
 
     const handleTutorialClose = () => {
         setShowTutorial(false);
@@ -7,4 +7,5 @@ admin.site.register(JobSeeker)
 admin.site.register(Job)
 admin.site.register(Application)
 admin.site.register(Education)
-admin.site.register(Experience)
\ No newline at end of file
+admin.site.register(Experience)
+admin.site.register(Task)
\ No newline at end of file
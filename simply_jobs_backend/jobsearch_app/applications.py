@@ -0,0 +1,19 @@
+from django.db import IntegrityError, transaction
+from .models import Application
+
+class AlreadyApplied(Exception):
+    pass
+
+def apply_to_job(jobseeker, job_id):
+    # Inserts optimistically and lets the (job, jobseeker) unique constraint reject
+    # duplicates, so concurrent double-taps can't both pass an exists() check. There is
+    # no job lookup: the post_save counter UPDATE raises Job.DoesNotExist when it finds
+    # no row, since the insert's foreign key is only checked at commit.
+    try:
+        with transaction.atomic():
+            return Application.objects.create(job_id=job_id, jobseeker=jobseeker)
+    except IntegrityError:
+        # Anything but the unique pair (e.g. from a signal handler) isn't a duplicate
+        if Application.objects.filter(job_id=job_id, jobseeker=jobseeker).exists():
+            raise AlreadyApplied
+        raise
@@ -4,3 +4,6 @@ from django.apps import AppConfig
 class JobsearchAppConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'jobsearch_app'
+
+    def ready(self):
+        from . import signals, uploads, matching, notifications  # noqa: F401
@@ -0,0 +1,200 @@
+import asyncio
+import base64
+import json
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.db.models import Q
+from django.http import JsonResponse, StreamingHttpResponse
+from django.utils.dateparse import parse_datetime
+from django.views.decorators.http import require_GET
+from rest_framework import exceptions
+from rest_framework.request import Request
+from rest_framework.utils.encoders import JSONEncoder
+from .authentication import StatelessProfileJWTAuthentication
+from .filters import JobFilter
+from .models import Job, JobSeeker, Employer, Application
+from .serializers import JobSerializer, JobSeekerSerializer, ApplicationSerializer, ApplicationSummarySerializer, ChangeFeedSerializer
+from .changes import ChangeFeed, parse_token
+
+# Async twins of the hot read endpoints in views.py. Under ASGI each request awaits the
+# database instead of holding a worker thread, so one worker overlaps many clients.
+# Responses match the sync endpoints, except the job feed's cursor, which is a plain
+# (created_at, id) keyset token.
+
+FEED_PAGE_SIZE = 20
+FEED_MAX_PAGE_SIZE = 100
+# Change feeds: ?wait= is capped at CHANGE_FEED_MAX_WAIT seconds, the log is checked
+# every CHANGE_FEED_POLL_INTERVAL, and event streams close after CHANGE_STREAM_MAX_AGE
+# (EventSource-style clients reconnect with Last-Event-ID)
+CHANGE_FEED_MAX_WAIT = 30
+CHANGE_FEED_POLL_INTERVAL = 1
+CHANGE_STREAM_MAX_AGE = 300
+CHANGE_STREAM_KEEPALIVE = 15
+
+def json_response(data, status=200):
+    return JsonResponse(data, status=status, encoder=JSONEncoder, safe=False)
+
+async def authenticate(request, profile_model=None):
+    # Returns a DRF Request with user/profile set, or a 401/403 response
+    drf_request = Request(request)
+    try:
+        result = await sync_to_async(StatelessProfileJWTAuthentication().authenticate)(drf_request)
+    except exceptions.AuthenticationFailed as exc:
+        return None, json_response({'detail': str(exc.detail)}, status=401)
+    if result is None:
+        return None, json_response({'detail': 'Authentication credentials were not provided.'}, status=401)
+    drf_request.user, drf_request.auth = result
+    if profile_model is not None and not isinstance(drf_request.profile, profile_model):
+        return None, json_response({'detail': 'You do not have permission to perform this action.'}, status=403)
+    return drf_request, None
+
+def encode_cursor(job):
+    return base64.urlsafe_b64encode(f'{job.created_at.isoformat()}|{job.pk}'.encode()).decode()
+
+def decode_cursor(value):
+    try:
+        created_at, pk = base64.urlsafe_b64decode(value.encode()).decode().split('|')
+        created_at, pk = parse_datetime(created_at), int(pk)
+    except ValueError:
+        return None
+    return (created_at, pk) if created_at else None
+
+def page_size(request):
+    try:
+        return min(int(request.GET.get('page_size', FEED_PAGE_SIZE)), FEED_MAX_PAGE_SIZE)
+    except ValueError:
+        return FEED_PAGE_SIZE
+
+@require_GET
+async def job_feed(request):
+    drf_request, error = await authenticate(request)
+    if error:
+        return error
+    profile = drf_request.profile
+    qs = Job.objects.filter(employer=profile) if isinstance(profile, Employer) else Job.objects.all()
+    filterset = JobFilter(request.GET, queryset=qs, request=drf_request)
+    if not filterset.is_valid():
+        return json_response(filterset.errors, status=400)
+    qs = filterset.qs.order_by('-created_at', '-id')
+    cursor = request.GET.get('cursor')
+    if cursor:
+        position = decode_cursor(cursor)
+        if position is None:
+            return json_response({'detail': 'Invalid cursor'}, status=404)
+        created_at, pk = position
+        qs = qs.filter(Q(created_at__lt=created_at) | Q(created_at=created_at, id__lt=pk))
+    size = page_size(request)
+    jobs = [job async for job in qs[:size + 1]]
+    next_url = None
+    if len(jobs) > size:
+        jobs = jobs[:size]
+        params = request.GET.copy()
+        params['cursor'] = encode_cursor(jobs[-1])
+        next_url = drf_request.build_absolute_uri(f'{request.path}?{params.urlencode()}')
+    data = JobSerializer(jobs, many=True, context={'request': drf_request}).data
+    return json_response({'next': next_url, 'previous': None, 'results': data})
+
+@require_GET
+async def applied_jobs(request):
+    drf_request, error = await authenticate(request, JobSeeker)
+    if error:
+        return error
+    qs = ApplicationSerializer.setup_eager_loading(Application.objects.filter(jobseeker=drf_request.profile))
+    applications = [application async for application in qs.aiterator(chunk_size=500)]
+    return json_response(ApplicationSerializer(applications, many=True, context={'request': drf_request}).data)
+
+@require_GET
+async def job_applicants(request, job_id):
+    drf_request, error = await authenticate(request, Employer)
+    if error:
+        return error
+    qs = Application.objects.filter(job_id=job_id, job__employer=drf_request.profile)
+    status = request.GET.get('status')
+    if status:
+        qs = qs.filter(status=status)
+    qs = ApplicationSerializer.order_applicants(qs, request.GET.get('ordering'))
+    if request.GET.get('view') == 'summary' or 'fields' in request.GET:
+        fields = ApplicationSummarySerializer.parse_fields(request.GET.get('fields'))
+        rows = [row async for row in ApplicationSummarySerializer.setup_projection(qs, fields).aiterator(chunk_size=2000)]
+        return json_response(ApplicationSummarySerializer(rows, many=True, fields=fields).data)
+    qs = ApplicationSerializer.setup_eager_loading(qs)
+    applications = [application async for application in qs.aiterator(chunk_size=500)]
+    return json_response(ApplicationSerializer(applications, many=True, context={'request': drf_request}).data)
+
+def change_setting(name, default):
+    return getattr(settings, name, default)
+
+async def read_changes(feed, since, drf_request):
+    def read():
+        return ChangeFeedSerializer(feed.read(since), context={'request': drf_request}).data
+    return await sync_to_async(read)()
+
+async def change_events(feed, since, drf_request):
+    # Server-sent events: one "changes" event per delta, its id the token to resume from
+    loop = asyncio.get_running_loop()
+    started = last_sent = loop.time()
+    interval = change_setting('CHANGE_FEED_POLL_INTERVAL', CHANGE_FEED_POLL_INTERVAL)
+    while loop.time() - started < change_setting('CHANGE_STREAM_MAX_AGE', CHANGE_STREAM_MAX_AGE):
+        if since is None or await sync_to_async(feed.has_changes)(since):
+            data = await read_changes(feed, since, drf_request)
+            since = int(data['token'])
+            last_sent = loop.time()
+            yield f'id: {since}\nevent: changes\ndata: {json.dumps(data, cls=JSONEncoder)}\n\n'
+            if data['more']:
+                continue
+        elif loop.time() - last_sent >= change_setting('CHANGE_STREAM_KEEPALIVE', CHANGE_STREAM_KEEPALIVE):
+            last_sent = loop.time()
+            yield ': keepalive\n\n'
+        await asyncio.sleep(interval)
+
+async def change_feed_response(request, drf_request, feed):
+    # ?since= delta, long-polled for up to ?wait= seconds when there's nothing new yet, or
+    # a stream of deltas for Accept: text/event-stream. Waiting costs a coroutine and an
+    # indexed EXISTS query per poll, not a worker thread.
+    try:
+        since = parse_token(request.GET.get('since') or request.headers.get('Last-Event-ID'))
+        wait = min(max(float(request.GET.get('wait', 0)), 0), change_setting('CHANGE_FEED_MAX_WAIT', CHANGE_FEED_MAX_WAIT))
+    except ValueError:
+        return json_response({'detail': 'Invalid since or wait.'}, status=400)
+    if 'text/event-stream' in request.headers.get('Accept', ''):
+        response = StreamingHttpResponse(change_events(feed, since, drf_request), content_type='text/event-stream')
+        response['Cache-Control'] = 'no-cache'
+        response['X-Accel-Buffering'] = 'no'
+        return response
+    if since is not None and wait:
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + wait
+        interval = change_setting('CHANGE_FEED_POLL_INTERVAL', CHANGE_FEED_POLL_INTERVAL)
+        while not await sync_to_async(feed.has_changes)(since) and loop.time() < deadline:
+            await asyncio.sleep(min(interval, max(deadline - loop.time(), 0)))
+    return json_response(await read_changes(feed, since, drf_request))
+
+@require_GET
+async def job_applicant_changes(request, job_id):
+    drf_request, error = await authenticate(request, Employer)
+    if error:
+        return error
+    if not await Job.objects.filter(pk=job_id, employer=drf_request.profile).aexists():
+        return json_response({'detail': 'Not found.'}, status=404)
+    applications = ApplicationSerializer.setup_eager_loading(Application.objects.filter(job_id=job_id))
+    return await change_feed_response(request, drf_request, ChangeFeed.applicants(job_id, applications))
+
+@require_GET
+async def applied_changes(request):
+    drf_request, error = await authenticate(request, JobSeeker)
+    if error:
+        return error
+    jobseeker = drf_request.profile
+    applications = ApplicationSerializer.setup_eager_loading(Application.objects.filter(jobseeker=jobseeker))
+    return await change_feed_response(request, drf_request, ChangeFeed.applied(jobseeker.pk, applications))
+
+@require_GET
+async def profile_detail(request, username):
+    drf_request, error = await authenticate(request)
+    if error:
+        return error
+    try:
+        jobseeker = await JobSeekerSerializer.setup_eager_loading(JobSeeker.objects.all()).aget(user__username=username)
+    except JobSeeker.DoesNotExist:
+        return json_response({'detail': 'No JobSeeker matches the given query.'}, status=404)
+    return json_response(JobSeekerSerializer(jobseeker, context={'request': drf_request}).data)
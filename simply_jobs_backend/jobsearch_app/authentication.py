@@ -0,0 +1,46 @@
+from django.utils.functional import cached_property
+from rest_framework.permissions import SAFE_METHODS
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.models import TokenUser
+from rest_framework_simplejwt.settings import api_settings
+from .profiles import resolve_profile, profile_from_claims
+
+class ProfileJWTAuthentication(JWTAuthentication):
+    # Resolves the caller's JobSeeker/Employer once, using the account claim added by
+    # MyTokenObtainPairSerializer, and exposes it as request.profile.
+    def authenticate(self, request):
+        header = self.get_header(request)
+        if header is None:
+            return None
+        raw_token = self.get_raw_token(header)
+        if raw_token is None:
+            return None
+        return self.authenticate_token(request, self.get_validated_token(raw_token))
+
+    def authenticate_token(self, request, token):
+        user = self.get_user(token)
+        request._request.profile = resolve_profile(user, token.get('account'))
+        return user, token
+
+class ClaimsUser(TokenUser):
+    # TokenUser that also carries the account type from our custom claims
+    @cached_property
+    def account(self):
+        return self.token.get('account', '')
+
+class StatelessProfileJWTAuthentication(ProfileJWTAuthentication):
+    # Read requests are authenticated from the token claims alone: no users table hit and
+    # request.profile is a keys-only instance whose other fields load on first access.
+    # Writes, tokens without a profile_id claim and CHECK_REVOKE_TOKEN deployments still
+    # load the user row so password changes and deactivations take effect.
+    def authenticate_token(self, request, token):
+        if (
+            request.method not in SAFE_METHODS
+            or api_settings.CHECK_REVOKE_TOKEN
+            or token.get('profile_id') is None
+            or api_settings.USER_ID_CLAIM not in token
+        ):
+            return super().authenticate_token(request, token)
+        user = ClaimsUser(token)
+        request._request.profile = profile_from_claims(user.account, token['profile_id'], user.id)
+        return user, token
@@ -0,0 +1,55 @@
+import hashlib
+import time
+from django.conf import settings
+from django.core.cache import caches
+from django.utils.http import parse_etags, quote_etag
+from rest_framework import status
+from rest_framework.response import Response
+
+FEED_GENERATION_KEY = 'job_feed:generation'
+
+def feed_cache():
+    return caches[getattr(settings, 'JOB_FEED_CACHE_ALIAS', 'default')]
+
+def get_feed_generation():
+    cache = feed_cache()
+    generation = cache.get(FEED_GENERATION_KEY)
+    if generation is None:
+        # Seed from the clock so an evicted counter never restarts below a value still
+        # baked into cached keys
+        cache.add(FEED_GENERATION_KEY, int(time.time() * 1000), timeout=None)
+        generation = cache.get(FEED_GENERATION_KEY)
+    return generation
+
+def bump_feed_generation():
+    # Every cached feed page and ETag embeds the generation, so this invalidates them all at once
+    try:
+        feed_cache().incr(FEED_GENERATION_KEY)
+    except ValueError:
+        get_feed_generation()
+
+class CachedFeedMixin:
+    # Caches list() responses per (generation, scope, host, query params) and answers
+    # If-None-Match with a 304 before touching the database or the serializer.
+    feed_cache_timeout = 300
+
+    def get_feed_scope(self):
+        return 'public'
+
+    def get_feed_cache_key(self, request):
+        params = sorted(request.query_params.lists())
+        raw = f'{self.get_feed_scope()}|{request.get_host()}|{params}'
+        digest = hashlib.sha1(raw.encode()).hexdigest()
+        return f'job_feed:{get_feed_generation()}:{digest}'
+
+    def list(self, request, *args, **kwargs):
+        key = self.get_feed_cache_key(request)
+        etag = quote_etag(hashlib.sha1(key.encode()).hexdigest())
+        if etag in parse_etags(request.headers.get('If-None-Match', '')):
+            return Response(status=status.HTTP_304_NOT_MODIFIED, headers={'ETag': etag})
+        cache = feed_cache()
+        data = cache.get(key)
+        if data is None:
+            data = super().list(request, *args, **kwargs).data
+            cache.set(key, data, getattr(settings, 'JOB_FEED_CACHE_TIMEOUT', self.feed_cache_timeout))
+        return Response(data, headers={'ETag': etag})
@@ -0,0 +1,110 @@
+import datetime
+from django.conf import settings
+from django.db import connection
+from django.db.models import Max, Min, Q
+from django.utils import timezone
+from .models import Change
+
+# Change log behind the ?since= delta endpoints. Every Job/Application write appends
+# Change rows in the same transaction (signals, counters.update_statuses,
+# matching.score_applications), and a client holding the last id it saw gets back
+# just the applications inserted, updated or deleted since. Ids commit in order while
+# writes are serialized (SQLite); on Postgres a slow transaction can commit an id below
+# one already visible, so tokens stop short of entries newer than COMMIT_LAG seconds.
+
+FEED_LIMIT = 1000
+COMMIT_LAG = 5
+
+def log_jobs(job_ids, action):
+    Change.objects.bulk_create([Change(model=Change.JOB, object_id=pk, action=action, job_id=pk) for pk in job_ids])
+
+def log_applications(rows, action):
+    # rows: (application id, job id, jobseeker id)
+    Change.objects.bulk_create([
+        Change(model=Change.APPLICATION, object_id=pk, action=action, job_id=job_id, jobseeker_id=jobseeker_id)
+        for pk, job_id, jobseeker_id in rows
+    ], batch_size=1000)
+
+def settled_id():
+    # Highest id that no transaction still in flight can commit below, or None when ids
+    # commit in order. Assumes a transaction writing the log commits within
+    # CHANGE_FEED_COMMIT_LAG seconds of its insert.
+    lag = getattr(settings, 'CHANGE_FEED_COMMIT_LAG', 0 if connection.vendor == 'sqlite' else COMMIT_LAG)
+    if not lag:
+        return None
+    cutoff = timezone.now() - datetime.timedelta(seconds=lag)
+    return Change.objects.filter(created_at__lte=cutoff).order_by('-id').values_list('id', flat=True).first() or 0
+
+def parse_token(value):
+    # None when no token was sent; ValueError for a malformed one
+    if value in (None, ''):
+        return None
+    token = int(value)
+    if token < 0:
+        raise ValueError(value)
+    return token
+
+def prune(before):
+    # Drops entries older than `before`, keeping the newest so stale tokens are still
+    # recognized (and answered with a reset) after everything old is gone
+    newest = Change.objects.aggregate(newest=Max('id'))['newest']
+    return Change.objects.filter(created_at__lt=before).exclude(id=newest).delete()[0]
+
+class ChangeFeed:
+    # Deltas for one list of applications. `applications` is the list's queryset,
+    # `entries` selects the log entries that can touch it.
+    def __init__(self, applications, entries):
+        self.applications = applications
+        self.entries = entries
+
+    @classmethod
+    def applicants(cls, job_id, applications):
+        return cls(applications, Q(job_id=job_id))
+
+    @classmethod
+    def applied(cls, jobseeker_id, applications):
+        # Edits to a job show up in the applications nesting it
+        return cls(applications, Q(jobseeker_id=jobseeker_id) | Q(model=Change.JOB, job_id__in=applications.values('job_id')))
+
+    def unread(self, since, settled):
+        entries = Change.objects.filter(self.entries, id__gt=since)
+        return entries if settled is None else entries.filter(id__lte=settled)
+
+    def has_changes(self, since):
+        return self.unread(since, settled_id()).exists()
+
+    def read(self, since):
+        # {'token', 'more', 'reset', 'changed': [Application], 'deleted': [id]} in a
+        # constant number of queries. Without a token, or with one the log can no longer
+        # replay (pruned, or from another database), the whole list comes back with
+        # reset set and replaces whatever the client has.
+        # Tokens never pass settled_id(), so entries still committing out of order are
+        # read next time rather than skipped.
+        bounds = Change.objects.aggregate(first=Min('id'), last=Max('id'))
+        latest = bounds['last'] or 0
+        oldest = (bounds['first'] or latest + 1) - 1
+        settled = settled_id()
+        if since is None or not oldest <= since <= latest:
+            token = latest if settled is None else max(min(settled, latest), oldest)
+            return {'token': token, 'more': False, 'reset': True, 'changed': list(self.applications), 'deleted': []}
+        limit = getattr(settings, 'CHANGE_FEED_LIMIT', FEED_LIMIT)
+        entries = list(
+            self.unread(since, settled).order_by('id')
+            .values_list('id', 'model', 'object_id', 'action')[:limit + 1]
+        )
+        more = len(entries) > limit
+        entries = entries[:limit]
+        application_ids = {pk for _, model, pk, _ in entries if model == Change.APPLICATION}
+        job_ids = {pk for _, model, pk, action in entries if model == Change.JOB and action == Change.UPSERT}
+        changed = []
+        if application_ids or job_ids:
+            changed = list(self.applications.filter(Q(id__in=application_ids) | Q(job_id__in=job_ids)))
+        # Deleted rows, and upserted ones that have since been deleted, aren't found
+        found = {application.id for application in changed}
+        return {
+            'token': entries[-1][0] if entries else since,
+            'more': more,
+            'reset': False,
+            'changed': changed,
+            'deleted': sorted(application_ids - found),
+        }
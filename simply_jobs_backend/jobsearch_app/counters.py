@@ -0,0 +1,82 @@
+from collections import Counter, defaultdict
+from django.db.models import Count, F, OuterRef, Q, Subquery, Value
+from django.db.models.functions import Coalesce
+from .models import Job, Application, ApplicationStatusEvent, Change
+from .changes import log_applications
+from .tasks import enqueue
+
+# Job.applicant_count and the per-status counters. Callers run these inside the
+# transaction that inserts, deletes or re-statuses the applications, so the counts
+# (and status events) commit or roll back with the rows.
+
+STATUS_COUNTERS = {
+    Application.PENDING: 'pending_count',
+    Application.SHORTLISTED: 'shortlisted_count',
+    Application.REJECTED: 'rejected_count',
+}
+COUNTER_FIELDS = ['applicant_count', *STATUS_COUNTERS.values()]
+
+def apply_deltas(deltas):
+    # deltas: {job_id: {counter field: change}}, one UPDATE per job; returns the rows updated
+    updated = 0
+    for job_id, changes in deltas.items():
+        changes = {field: F(field) + delta for field, delta in changes.items() if delta}
+        if changes:
+            updated += Job.objects.filter(pk=job_id).update(**changes)
+    return updated
+
+def application_added(application):
+    # Doubles as the check that the job exists, which its foreign key only enforces at commit
+    if not apply_deltas({application.job_id: {'applicant_count': 1, STATUS_COUNTERS[application.status]: 1}}):
+        raise Job.DoesNotExist
+
+def application_removed(application):
+    apply_deltas({application.job_id: {'applicant_count': -1, STATUS_COUNTERS[application.status]: -1}})
+
+def update_statuses(applications, status):
+    # Bulk status change that moves counters along with it and records an event per
+    # changed application (plus its change log entry); returns the number of rows matched,
+    # like QuerySet.update(). Queries don't grow with the number of applications, only
+    # with the jobs touched.
+    rows = list(applications.select_for_update().values_list('id', 'job_id', 'jobseeker_id', 'status'))
+    if not rows:
+        return 0
+    Application.objects.filter(id__in=[pk for pk, _, _, _ in rows]).update(status=status)
+    changed = [row for row in rows if row[3] != status]
+    if changed:
+        ApplicationStatusEvent.objects.bulk_create([
+            ApplicationStatusEvent(application_id=pk, old_status=old, new_status=status)
+            for pk, _, _, old in changed
+        ], batch_size=1000)
+        log_applications([row[:3] for row in changed], Change.UPSERT)
+        enqueue('notify_status_changes')
+    moved = Counter((job_id, old) for _, job_id, _, old in changed)
+    deltas = defaultdict(Counter)
+    for (job_id, old), count in moved.items():
+        deltas[job_id][STATUS_COUNTERS[old]] -= count
+        deltas[job_id][STATUS_COUNTERS[status]] += count
+    apply_deltas(deltas)
+    return len(rows)
+
+def actual_counts():
+    # Subqueries computing each counter from the applications table
+    def count(condition=Q()):
+        applications = (
+            Application.objects.filter(condition, job=OuterRef('pk')).order_by()
+            .values('job').annotate(n=Count('id')).values('n')
+        )
+        return Coalesce(Subquery(applications), Value(0))
+    counts = {'applicant_count': count()}
+    for status, field in STATUS_COUNTERS.items():
+        counts[field] = count(Q(status=status))
+    return counts
+
+def repair_counters():
+    # Recomputes every job's counters in one UPDATE; returns how many jobs had drifted
+    drifted = Q()
+    for field in COUNTER_FIELDS:
+        drifted |= ~Q(**{field: F(f'actual_{field}')})
+    annotations = {f'actual_{field}': expression for field, expression in actual_counts().items()}
+    count = Job.objects.annotate(**annotations).filter(drifted).count()
+    Job.objects.update(**actual_counts())
+    return count
@@ -0,0 +1,35 @@
+import sys
+from django.db import connections
+from django_filters import rest_framework as filters
+from .models import Job
+
+class JobFilter(filters.FilterSet):
+    # Every lookup here is served by one of the Job indexes in models.py
+    location__istartswith = filters.CharFilter(method='filter_location_prefix')
+
+    class Meta:
+        model = Job
+        fields = {
+            'company': ['exact', 'in'],
+            'job_type': ['exact', 'in'],
+            'location': ['exact', 'in'],
+            'salary': ['exact', 'gte', 'lte'],
+            'created_at': ['gte', 'lte'],
+        }
+
+    def filter_location_prefix(self, queryset, name, value):
+        # Matches Job.location_lower, lowercased in Python like the prefix, so non-ASCII
+        # letters fold on SQLite too. SQLite's case-insensitive LIKE can't use the index,
+        # so there the prefix becomes a range, which equals startswith under its binary
+        # collation. Other backends compare with the column's collation, where a range
+        # isn't a prefix match, so they use LIKE (the index's varchar_pattern_ops on Postgres).
+        prefix = value.lower()
+        if not prefix:
+            return queryset
+        last = ord(prefix[-1])
+        if connections[queryset.db].vendor != 'sqlite' or last == sys.maxunicode:
+            # Also at the max code point, which has no higher one to bound a range with
+            return queryset.filter(location_lower__startswith=prefix)
+        # Surrogates can't be encoded, so the bound skips over them
+        successor = 0xE000 if 0xD7FF <= last < 0xE000 else last + 1
+        return queryset.filter(location_lower__gte=prefix, location_lower__lt=prefix[:-1] + chr(successor))
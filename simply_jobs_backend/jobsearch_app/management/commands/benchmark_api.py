@@ -0,0 +1,204 @@
+import json
+import time
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
+from django.db.models import Count, Max
+from django.test import Client
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from jobsearch_app import urls as api_urls
+from jobsearch_app.models import User, JobSeeker, Job, Application, Change
+from jobsearch_app.serializers import MyTokenObtainPairSerializer
+from .benchmark_http import run_load, percentile, format_report
+
+class Command(BaseCommand):
+    help = (
+        "Drive every jobsearch_app endpoint through the test client against the current "
+        "database (seed it with seed_data) and report requests/s, p50/p99 latency and "
+        "queries per request. Writes are rolled back. --base-url also load-tests the GET "
+        "endpoints of a running server. --baseline fails the run on regressions."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--iterations', type=int, default=20, help="Requests per endpoint.")
+        parser.add_argument('--endpoints', nargs='+', help="Only run endpoints whose label contains one of these.")
+        parser.add_argument('--password', default='benchmark', help="Password of the seeded users, for /api/token/.")
+        parser.add_argument('--base-url', help="Also load-test the GET endpoints of a server at this URL.")
+        parser.add_argument('--concurrency', type=int, default=16)
+        parser.add_argument('--requests', type=int, default=500, help="Requests per endpoint with --base-url.")
+        parser.add_argument('--baseline', help="JSON results of an earlier run to compare against.")
+        parser.add_argument('--save-baseline', help="Write this run's results to a JSON file.")
+        parser.add_argument('--tolerance', type=float, default=0.5,
+                            help="Allowed latency growth over the baseline, as a fraction.")
+        parser.add_argument('--queries-only', action='store_true',
+                            help="Compare only query counts, e.g. when the baseline came from another machine.")
+
+    def handle(self, *args, **options):
+        fixture = load_fixture(options['password'])
+        clients = {role: Client(headers=headers) for role, headers in fixture['headers'].items()}
+        selected = [
+            scenario for scenario in scenarios(fixture)
+            if not options['endpoints'] or any(part in scenario[0] for part in options['endpoints'])
+        ]
+        covered = {scenario[1] for scenario in scenarios(fixture)}
+        for pattern in api_urls.urlpatterns:
+            if pattern.name not in covered:
+                self.stderr.write(f"{pattern.name}: no benchmark scenario")
+
+        results, failures = {}, []
+        for label, name, method, role, kwargs, data in selected:
+            path = reverse(name, kwargs=kwargs)
+            latencies, queries, status = measure(clients[role], method, path, data, options['iterations'])
+            if status >= 400:
+                failures.append(f"{label}: HTTP {status}")
+                continue
+            results[label] = summarize(latencies, sum(latencies), queries)
+            self.stdout.write(f"{format_report(label, latencies, 0, sum(latencies))}, queries {queries}")
+
+        if options['base_url']:
+            for label, name, method, role, kwargs, data in selected:
+                if method != 'get':
+                    continue
+                url = options['base_url'].rstrip('/') + reverse(name, kwargs=kwargs)
+                if data:
+                    url += '?' + '&'.join(f'{key}={value}' for key, value in data.items())
+                latencies, errors, elapsed = run_load(url, fixture['headers'][role], options['requests'], options['concurrency'])
+                self.stdout.write(format_report(f'http {label}', latencies, errors, elapsed))
+                if latencies:
+                    results[f'http {label}'] = summarize(latencies, elapsed, None)
+                if errors:
+                    failures.append(f"http {label}: {errors} failed requests")
+
+        if options['save_baseline']:
+            with open(options['save_baseline'], 'w') as f:
+                json.dump(results, f, indent=2, sort_keys=True)
+            self.stdout.write(f"Saved results to {options['save_baseline']}")
+        if options['baseline']:
+            with open(options['baseline']) as f:
+                baseline = json.load(f)
+            failures += regressions(results, baseline, options['tolerance'], options['queries_only'])
+        if failures:
+            raise CommandError("Benchmark failed:\n  " + "\n  ".join(failures))
+        self.stdout.write(self.style.SUCCESS(f"Benchmarked {len(results)} endpoints."))
+
+def load_fixture(password):
+    # The busiest job and its employer, and the jobseeker with the most applications,
+    # so the numbers reflect the heaviest realistic pages
+    job = Job.objects.select_related('employer__user').order_by('-applicant_count', 'id').first()
+    jobseeker = (
+        JobSeeker.objects.filter(experiences__isnull=False, educations__isnull=False).select_related('user')
+        .annotate(n=Count('applications', distinct=True)).order_by('-n', 'id').first()
+    )
+    if job is None or not job.applicant_count or jobseeker is None or not jobseeker.n:
+        raise CommandError("No applications to benchmark; run `manage.py seed_data` first.")
+    employer_user = job.employer.user
+    spare_job = Job.objects.filter(employer=job.employer).order_by('applicant_count', 'id').first()
+    return {
+        'job': job,
+        'spare_job': spare_job,
+        'jobseeker': jobseeker,
+        'employer_user': employer_user,
+        'password': password,
+        'application': jobseeker.applications.order_by('id').first(),
+        'unapplied_job': Job.objects.exclude(applications__jobseeker=jobseeker).order_by('-created_at').first(),
+        'applicant_ids': list(job.applications.order_by('id').values_list('id', flat=True)[:100]),
+        'education': jobseeker.educations.order_by('id').first(),
+        'experience': jobseeker.experiences.order_by('id').first(),
+        'token': Change.objects.aggregate(last=Max('id'))['last'] or 0,
+        'headers': {
+            'employer': auth_headers(employer_user),
+            'jobseeker': auth_headers(jobseeker.user),
+            'anonymous': {},
+        },
+    }
+
+def auth_headers(user):
+    return {'Authorization': f'Bearer {MyTokenObtainPairSerializer.get_token(user).access_token}'}
+
+def scenarios(f):
+    # (label, url name, method, role, url kwargs, query or JSON body)
+    job = {'job_id': f['job'].id}
+    seeker = f['jobseeker']
+    return [
+        ('job-list', 'job-list', 'get', 'jobseeker', {}, {}),
+        ('job-list create', 'job-list', 'post', 'employer', {}, {
+            'company': 'Bench', 'title': 'Benchmark Engineer', 'description': 'Measure things',
+            'location': 'Remote', 'salary': 50000, 'job_type': 'Full-time',
+        }),
+        ('job-feed', 'job-feed', 'get', 'jobseeker', {}, {}),
+        ('job-recommended', 'job-recommended', 'get', 'jobseeker', {}, {}),
+        ('job-dashboard', 'job-dashboard', 'get', 'employer', {}, {}),
+        ('job-search', 'job-search', 'get', 'jobseeker', {}, {'q': 'engineer'}),
+        ('delete-job', 'delete-job', 'delete', 'employer', {'pk': f['spare_job'].id}, {}),
+        ('apply-to-job', 'apply-to-job', 'post', 'jobseeker', {}, {'job': f['unapplied_job'].id}),
+        ('get_token', 'get_token', 'post', 'anonymous', {}, {'username': seeker.user.username, 'password': f['password']}),
+        ('edit-profile', 'edit-profile', 'get', 'jobseeker', {}, {}),
+        ('edit-profile patch', 'edit-profile', 'patch', 'jobseeker', {}, {'bio': 'Benchmarking'}),
+        ('profile-sync', 'profile-sync', 'put', 'jobseeker', {}, {'first_name': seeker.first_name}),
+        ('profile-detail', 'profile-detail', 'get', 'employer', {'username': seeker.user.username}, {}),
+        ('job-applicants', 'job-applicants', 'get', 'employer', job, {}),
+        ('job-applicants summary', 'job-applicants', 'get', 'employer', job, {'view': 'summary', 'ordering': 'score'}),
+        ('job-applicant-changes', 'job-applicant-changes', 'get', 'employer', job, {'since': f['token']}),
+        ('job-applicants-search', 'job-applicants-search', 'get', 'employer', job, {'q': 'python'}),
+        ('job-applicants-export', 'job-applicants-export', 'get', 'employer', {**job, 'fmt': 'csv'}, {}),
+        ('update-applications', 'update-applications', 'put', 'employer', {}, {
+            'application_ids': f['applicant_ids'], 'status': Application.SHORTLISTED,
+        }),
+        ('applied-jobs', 'applied-jobs', 'get', 'jobseeker', {}, {}),
+        ('applied-changes', 'applied-changes', 'get', 'jobseeker', {}, {'since': f['token']}),
+        ('delete-application', 'delete-application', 'delete', 'jobseeker', {'pk': f['application'].id}, {}),
+        ('application-history', 'application-history', 'get', 'jobseeker', {'pk': f['application'].id}, {}),
+        ('education-list', 'education-list', 'get', 'jobseeker', {}, {}),
+        ('education-detail', 'education-detail', 'get', 'jobseeker', {'pk': f['education'].id}, {}),
+        ('experience-list', 'experience-list', 'get', 'jobseeker', {}, {}),
+        ('experience-detail', 'experience-detail', 'get', 'jobseeker', {'pk': f['experience'].id}, {}),
+        ('tutorial-seen', 'tutorial-seen', 'get', 'jobseeker', {}, {}),
+        ('async-job-list', 'async-job-list', 'get', 'jobseeker', {}, {}),
+        ('async-job-applicants', 'async-job-applicants', 'get', 'employer', job, {}),
+        ('async-job-applicant-changes', 'async-job-applicant-changes', 'get', 'employer', job, {'since': f['token']}),
+        ('async-applied-jobs', 'async-applied-jobs', 'get', 'jobseeker', {}, {}),
+        ('async-applied-changes', 'async-applied-changes', 'get', 'jobseeker', {}, {'since': f['token']}),
+        ('async-profile-detail', 'async-profile-detail', 'get', 'employer', {'username': seeker.user.username}, {}),
+    ]
+
+def measure(client, method, path, data, iterations):
+    # Sorted latencies, the most queries any request ran and the last status code. Each
+    # request runs in a transaction that is rolled back, so writes can repeat.
+    latencies, queries, status = [], 0, 200
+    for _ in range(iterations):
+        with transaction.atomic(), CaptureQueriesContext(connection) as captured:
+            start = time.perf_counter()
+            if method == 'get':
+                response = client.get(path, data)
+            else:
+                response = getattr(client, method)(path, json.dumps(data), content_type='application/json')
+            if response.streaming:
+                b''.join(response.streaming_content)
+            latencies.append(time.perf_counter() - start)
+            transaction.set_rollback(True)
+        queries = max(queries, len(captured))
+        status = response.status_code
+    return sorted(latencies), queries, status
+
+def summarize(latencies, elapsed, queries):
+    return {
+        'rps': round(len(latencies) / elapsed, 1),
+        'p50_ms': round(percentile(latencies, 0.5) * 1000, 2),
+        'p99_ms': round(percentile(latencies, 0.99) * 1000, 2),
+        'queries': queries,
+    }
+
+def regressions(results, baseline, tolerance, queries_only):
+    failures = []
+    for label, expected in sorted(baseline.items()):
+        actual = results.get(label)
+        if actual is None:
+            continue
+        if expected.get('queries') is not None and actual['queries'] > expected['queries']:
+            failures.append(f"{label}: {actual['queries']} queries, baseline {expected['queries']}")
+        if queries_only:
+            continue
+        for metric in ('p50_ms', 'p99_ms'):
+            if actual[metric] > expected[metric] * (1 + tolerance):
+                failures.append(f"{label}: {metric} {actual[metric]}, baseline {expected[metric]}")
+    return failures
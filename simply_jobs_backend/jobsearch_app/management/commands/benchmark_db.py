@@ -0,0 +1,133 @@
+import threading
+import time
+import uuid
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, connections, OperationalError
+from django.db.models import Q
+from jobsearch_app.applications import apply_to_job, AlreadyApplied
+from jobsearch_app.models import User, Employer, JobSeeker, Job, Application, Change, Task
+
+class Command(BaseCommand):
+    help = (
+        "Measure apply/list throughput with concurrent writers and readers against the "
+        "configured database. The writes have to commit to measure lock contention, so it "
+        "refuses to run without --force; point DB_NAME at a scratch copy of the database. "
+        "Its own rows are deleted afterwards."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--writers', type=int, default=4)
+        parser.add_argument('--readers', type=int, default=4)
+        parser.add_argument('--seconds', type=float, default=10.0)
+        parser.add_argument('--jobs', type=int, default=2000)
+        parser.add_argument('--contended', action='store_true',
+                            help="All writers apply as one jobseeker, so they race on the same applications.")
+        parser.add_argument('--force', action='store_true',
+                            help="Write benchmark rows to the configured database.")
+
+    def handle(self, *args, **options):
+        if not options['force']:
+            raise CommandError(
+                f"benchmark_db commits rows to {connection.settings_dict['NAME']}; "
+                "run it against a scratch database (DB_NAME=...) with --force."
+            )
+        self.stdout.write(f"Database: {connection.vendor} {connection.settings_dict['NAME']}")
+        if connection.vendor == 'sqlite':
+            with connection.cursor() as cursor:
+                cursor.execute('PRAGMA journal_mode')
+                self.stdout.write(f"journal_mode: {cursor.fetchone()[0]}")
+
+        prefix = f"bench-{uuid.uuid4().hex[:8]}"
+        try:
+            self.run(prefix, options)
+        finally:
+            # Also drop the change log entries and queued scoring tasks the applies left behind.
+            # The ids are collected first because deleting the users cascades to their rows.
+            job_ids = list(Job.objects.filter(employer__user__username__startswith=prefix).values_list('id', flat=True))
+            application_ids = list(Application.objects.filter(job_id__in=job_ids).values_list('id', flat=True))
+            User.objects.filter(username__startswith=prefix).delete()
+            Change.objects.filter(job_id__in=job_ids).delete()
+            Task.objects.filter(status=Task.PENDING).filter(
+                Q(kwargs__application_id__in=application_ids) | Q(kwargs__job_id__in=job_ids)
+            ).delete()
+
+    def run(self, prefix, options):
+        employer = Employer.objects.create(
+            user=User.objects.create_user(username=f"{prefix}-employer", account='EMPLOYER')
+        )
+        Job.objects.bulk_create([
+            Job(employer=employer, company="Bench", title=f"Job {i}", description="Benchmark",
+                location="Remote", salary=40000, job_type="Full-time")
+            for i in range(options['jobs'])
+        ])
+        job_ids = list(Job.objects.filter(employer=employer).values_list('id', flat=True))
+        seekers = [
+            JobSeeker.objects.create(
+                user=User.objects.create_user(username=f"{prefix}-seeker{i}", account='JOBSEEKER'),
+                first_name="Bench", last_name=str(i), email="bench@example.com",
+            )
+            for i in range(1 if options['contended'] else options['writers'])
+        ]
+        if options['contended']:
+            seekers *= options['writers']
+
+        deadline = time.monotonic() + options['seconds']
+        results = {'apply': [], 'list': [], 'locked': 0, 'duplicates': 0}
+        lock = threading.Lock()
+
+        def writer(jobseeker):
+            latencies, locked, duplicates = [], 0, 0
+            for job_id in job_ids:
+                if time.monotonic() >= deadline:
+                    break
+                start = time.perf_counter()
+                try:
+                    apply_to_job(jobseeker, job_id)
+                except AlreadyApplied:
+                    duplicates += 1
+                except OperationalError:
+                    locked += 1
+                    continue
+                latencies.append(time.perf_counter() - start)
+            with lock:
+                results['apply'] += latencies
+                results['locked'] += locked
+                results['duplicates'] += duplicates
+            connections.close_all()
+
+        def reader(index):
+            latencies = []
+            while time.monotonic() < deadline:
+                start = time.perf_counter()
+                list(Application.objects.filter(job_id=job_ids[index % len(job_ids)]).select_related('jobseeker')[:50])
+                list(Job.objects.order_by('-created_at', '-id')[:20])
+                latencies.append(time.perf_counter() - start)
+                index += 1
+            with lock:
+                results['list'] += latencies
+            connections.close_all()
+
+        threads = [threading.Thread(target=writer, args=(seeker,)) for seeker in seekers]
+        threads += [threading.Thread(target=reader, args=(i,)) for i in range(options['readers'])]
+        started = time.monotonic()
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        elapsed = time.monotonic() - started
+
+        for name in ('apply', 'list'):
+            self.report(name, results[name], elapsed)
+        self.stdout.write(f"locked errors: {results['locked']}, already applied: {results['duplicates']}")
+
+    def report(self, name, latencies, elapsed):
+        if not latencies:
+            self.stdout.write(f"{name}: no operations completed")
+            return
+        latencies.sort()
+        p50 = latencies[len(latencies) // 2] * 1000
+        p99 = latencies[min(len(latencies) - 1, int(len(latencies) * 0.99))] * 1000
+        self.stdout.write(
+            f"{name}: {len(latencies)} ops, {len(latencies) / elapsed:.1f} ops/s, "
+            f"p50 {p50:.2f} ms, p99 {p99:.2f} ms"
+        )
@@ -0,0 +1,66 @@
+import time
+import urllib.error
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+from django.core.management.base import BaseCommand, CommandError
+from jobsearch_app.models import User
+from jobsearch_app.serializers import MyTokenObtainPairSerializer
+
+DEFAULT_PATHS = ['/api/jobs/', '/api/applied/', '/api/profile/{username}/']
+
+class Command(BaseCommand):
+    help = (
+        "Fire concurrent GET requests at a running server and report requests/s and latency. "
+        "Run it once against a WSGI deployment and once against an ASGI one to compare, e.g. "
+        "--paths /api/jobs/ vs --paths /api/async/jobs/."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--base-url', default='http://127.0.0.1:8000')
+        parser.add_argument('--user', required=True, help="Username to mint an access token for.")
+        parser.add_argument('--paths', nargs='+', default=DEFAULT_PATHS,
+                            help="Paths to request; {username} is replaced with --user.")
+        parser.add_argument('--concurrency', type=int, default=32)
+        parser.add_argument('--requests', type=int, default=1000, help="Requests per path.")
+
+    def handle(self, *args, **options):
+        try:
+            user = User.objects.get(username=options['user'])
+        except User.DoesNotExist:
+            raise CommandError(f"User {options['user']!r} does not exist.")
+        token = str(MyTokenObtainPairSerializer.get_token(user).access_token)
+        headers = {'Authorization': f'Bearer {token}'}
+
+        for path in options['paths']:
+            url = options['base_url'].rstrip('/') + path.format(username=user.username)
+            latencies, errors, elapsed = run_load(url, headers, options['requests'], options['concurrency'])
+            self.stdout.write(format_report(path, latencies, errors, elapsed))
+
+def fetch(url, headers):
+    request = urllib.request.Request(url, headers=headers)
+    start = time.perf_counter()
+    try:
+        with urllib.request.urlopen(request, timeout=30) as response:
+            response.read()
+    except (urllib.error.URLError, OSError):
+        return None
+    return time.perf_counter() - start
+
+def run_load(url, headers, total, concurrency):
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        results = list(pool.map(lambda _: fetch(url, headers), range(total)))
+    elapsed = time.perf_counter() - started
+    latencies = sorted(result for result in results if result is not None)
+    return latencies, len(results) - len(latencies), elapsed
+
+def percentile(sorted_values, fraction):
+    return sorted_values[min(len(sorted_values) - 1, int(len(sorted_values) * fraction))]
+
+def format_report(name, latencies, errors, elapsed):
+    if not latencies:
+        return f"{name}: all {errors} requests failed"
+    return (
+        f"{name}: {len(latencies) / elapsed:.1f} req/s, p50 {percentile(latencies, 0.5) * 1000:.1f} ms, "
+        f"p99 {percentile(latencies, 0.99) * 1000:.1f} ms, errors {errors}"
+    )
@@ -0,0 +1,41 @@
+import os
+import posixpath
+import time
+from django.core.files.storage import default_storage
+from django.core.management.base import BaseCommand
+from jobsearch_app.models import JobSeeker
+from jobsearch_app.uploads import FILE_FIELDS
+
+class Command(BaseCommand):
+    help = (
+        "Delete uploaded files that no JobSeeker references any more, including "
+        "abandoned partial uploads."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--grace', type=int, default=3600,
+                            help="Keep files younger than this many seconds; their rows may not be committed yet.")
+        parser.add_argument('--dry-run', action='store_true')
+
+    def handle(self, *args, **options):
+        referenced = set()
+        for row in JobSeeker.objects.values_list(*FILE_FIELDS).iterator(chunk_size=2000):
+            referenced.update(name for name in row if name)
+        directories = sorted({JobSeeker._meta.get_field(field).upload_to.rstrip('/') for field in FILE_FIELDS})
+        cutoff = time.time() - options['grace']
+        count = size = 0
+        for directory in directories:
+            try:
+                entries = list(os.scandir(default_storage.path(directory)))
+            except FileNotFoundError:
+                continue
+            for entry in entries:
+                name = posixpath.join(directory, entry.name)
+                if not entry.is_file() or name in referenced or entry.stat().st_mtime > cutoff:
+                    continue
+                count += 1
+                size += entry.stat().st_size
+                if not options['dry_run']:
+                    default_storage.delete(name)
+        verb = "Would delete" if options['dry_run'] else "Deleted"
+        self.stdout.write(self.style.SUCCESS(f"{verb} {count} unreferenced files ({size} bytes)."))
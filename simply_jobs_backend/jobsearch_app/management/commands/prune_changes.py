@@ -0,0 +1,17 @@
+import datetime
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+from jobsearch_app.changes import prune
+
+class Command(BaseCommand):
+    help = (
+        "Delete change log entries older than --days. Clients holding an older token "
+        "get the full list back (reset) on their next sync."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--days', type=int, default=7)
+
+    def handle(self, *args, **options):
+        deleted = prune(timezone.now() - datetime.timedelta(days=options['days']))
+        self.stdout.write(self.style.SUCCESS(f"Deleted {deleted} change log entries."))
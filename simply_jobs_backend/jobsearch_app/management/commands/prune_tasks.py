@@ -0,0 +1,14 @@
+import datetime
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+from jobsearch_app.tasks import prune
+
+class Command(BaseCommand):
+    help = "Delete DONE and FAILED tasks last updated more than --days ago."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--days', type=int, default=7)
+
+    def handle(self, *args, **options):
+        deleted = prune(timezone.now() - datetime.timedelta(days=options['days']))
+        self.stdout.write(self.style.SUCCESS(f"Deleted {deleted} finished tasks."))
@@ -0,0 +1,10 @@
+from django.core.management.base import BaseCommand
+from jobsearch_app.search import get_search_backend
+
+class Command(BaseCommand):
+    help = "Rebuild the job and candidate full-text search indexes from their tables."
+
+    def handle(self, *args, **options):
+        backend = get_search_backend()
+        backend.rebuild()
+        self.stdout.write(self.style.SUCCESS(f"Rebuilt search indexes ({type(backend).__name__})."))
@@ -0,0 +1,11 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from jobsearch_app.counters import repair_counters
+
+class Command(BaseCommand):
+    help = "Recompute every job's applicant counters from the applications table."
+
+    def handle(self, *args, **options):
+        with transaction.atomic():
+            drifted = repair_counters()
+        self.stdout.write(self.style.SUCCESS(f"Recomputed applicant counters; {drifted} jobs had drifted."))
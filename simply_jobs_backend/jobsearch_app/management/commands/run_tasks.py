@@ -0,0 +1,20 @@
+import time
+from django.core.management.base import BaseCommand
+from jobsearch_app.tasks import run_pending
+
+class Command(BaseCommand):
+    help = "Run queued background tasks (resume and profile picture processing)."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--once', action='store_true', help="Drain the queue once and exit.")
+        parser.add_argument('--sleep', type=float, default=1.0, help="Seconds to wait when the queue is empty.")
+        parser.add_argument('--max-attempts', type=int, default=3)
+
+    def handle(self, *args, **options):
+        while True:
+            count = run_pending(max_attempts=options['max_attempts'])
+            if count:
+                self.stdout.write(f"Ran {count} task(s).")
+            if options['once']:
+                break
+            time.sleep(options['sleep'])
@@ -0,0 +1,14 @@
+from django.core.management.base import BaseCommand
+from jobsearch_app.matching import score_job_applicants
+from jobsearch_app.models import Application
+
+class Command(BaseCommand):
+    help = "Recompute the job/applicant match scores of every job with applicants."
+
+    def handle(self, *args, **options):
+        job_ids = Application.objects.values_list('job_id', flat=True).distinct().order_by('job_id')
+        count = 0
+        for job_id in job_ids.iterator():
+            score_job_applicants(job_id)
+            count += 1
+        self.stdout.write(self.style.SUCCESS(f"Scored applicants of {count} jobs."))
@@ -0,0 +1,158 @@
+import datetime
+import random
+from django.contrib.auth.hashers import make_password
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from django.utils import timezone
+from jobsearch_app.cache import bump_feed_generation
+from jobsearch_app.counters import repair_counters
+from jobsearch_app.matching import score_job_applicants
+from jobsearch_app.models import User, Employer, JobSeeker, Job, Application, Education, Experience
+from jobsearch_app.search import get_search_backend
+
+TITLES = [
+    'Software Engineer', 'Backend Developer', 'Frontend Developer', 'Data Analyst', 'Data Scientist',
+    'Product Manager', 'UX Designer', 'DevOps Engineer', 'QA Tester', 'Sales Associate', 'Accountant',
+    'Marketing Coordinator', 'Customer Support Agent', 'Nurse', 'Chef', 'Electrician', 'Teacher',
+]
+SKILLS = [
+    'python', 'django', 'react', 'sql', 'aws', 'kubernetes', 'excel', 'figma', 'seo', 'testing',
+    'communication', 'leadership', 'budgeting', 'cooking', 'wiring', 'patient care', 'curriculum',
+]
+JOB_TYPES = ['Full-time', 'Part-time', 'Contract', 'Internship']
+CITIES = [
+    ('London', 'UK'), ('Manchester', 'UK'), ('New York', 'USA'), ('Austin', 'USA'), ('Berlin', 'Germany'),
+    ('Toronto', 'Canada'), ('Sydney', 'Australia'), ('Dublin', 'Ireland'), ('Remote', ''),
+]
+COMPANIES = ['Acme', 'Globex', 'Initech', 'Umbrella', 'Hooli', 'Stark', 'Wayne', 'Wonka', 'Tyrell', 'Cyberdyne']
+DEGREES = [('BSc', 'Computer Science'), ('BA', 'Economics'), ('MSc', 'Data Science'), ('BEng', 'Electrical Engineering'),
+           ('BA', 'Design'), ('BSc', 'Nursing'), ('Diploma', 'Culinary Arts')]
+STATUSES = [(Application.PENDING, 0.7), (Application.SHORTLISTED, 0.15), (Application.REJECTED, 0.15)]
+
+class Command(BaseCommand):
+    help = (
+        "Seed a synthetic dataset for benchmarking: employers, jobs, jobseekers with "
+        "education/experience, and applications spread over jobs with Zipf-like popularity. "
+        "Every seeded user gets --password, so benchmark_api can log in as any of them."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--employers', type=int, default=50)
+        parser.add_argument('--jobs', type=int, default=2000)
+        parser.add_argument('--jobseekers', type=int, default=2000)
+        parser.add_argument('--applications', type=int, default=20000)
+        parser.add_argument('--skew', type=float, default=1.1,
+                            help="Zipf exponent of job popularity; 0 spreads applications evenly.")
+        parser.add_argument('--prefix', default='seed', help="Username prefix of the seeded users.")
+        parser.add_argument('--password', default='benchmark')
+        parser.add_argument('--seed', type=int, default=0, help="Random seed, for repeatable datasets.")
+        parser.add_argument('--clear', action='store_true', help="Delete a previous dataset with the same prefix first.")
+
+    def handle(self, *args, **options):
+        prefix = options['prefix']
+        existing = User.objects.filter(username__startswith=f'{prefix}-')
+        if existing.exists():
+            if not options['clear']:
+                raise CommandError(f"Users prefixed {prefix!r} already exist; pass --clear to replace them.")
+            with transaction.atomic():
+                existing.delete()
+        if options['applications'] > options['jobs'] * options['jobseekers']:
+            raise CommandError("More applications than (job, jobseeker) pairs.")
+        rng = random.Random(options['seed'])
+        with transaction.atomic():
+            counts = seed(rng, prefix, make_password(options['password']), options)
+        # bulk_create skips the signals, so derived data is rebuilt in one pass each
+        get_search_backend().rebuild()
+        repair_counters()
+        # Before scoring, so the match IDF is computed over the seeded jobs
+        bump_feed_generation()
+        applications = Application.objects.filter(jobseeker__user__username__startswith=f'{prefix}-')
+        for job_id in applications.values_list('job_id', flat=True).distinct().order_by('job_id').iterator():
+            score_job_applicants(job_id)
+        self.stdout.write(self.style.SUCCESS(
+            "Seeded {employers} employers, {jobs} jobs, {jobseekers} jobseekers and {applications} applications "
+            "(prefix {prefix!r}).".format(prefix=prefix, **counts)
+        ))
+
+def seed(rng, prefix, password, options):
+    now = timezone.now()
+    User.objects.bulk_create(
+        [User(username=f'{prefix}-employer{i}', password=password, account='EMPLOYER') for i in range(options['employers'])]
+        + [User(username=f'{prefix}-seeker{i}', password=password, account='JOBSEEKER') for i in range(options['jobseekers'])],
+        batch_size=1000,
+    )
+    # Not every backend returns primary keys from bulk_create
+    users = dict(User.objects.filter(username__startswith=f'{prefix}-').values_list('username', 'id'))
+    Employer.objects.bulk_create(
+        [Employer(user_id=users[f'{prefix}-employer{i}'], has_seen_tutorial=True) for i in range(options['employers'])],
+        batch_size=1000,
+    )
+    employers = list(Employer.objects.filter(user__username__startswith=f'{prefix}-').order_by('id'))
+
+    jobs = []
+    for i in range(options['jobs']):
+        city, country = rng.choice(CITIES)
+        title = rng.choice(TITLES)
+        jobs.append(Job(
+            employer=rng.choice(employers), company=rng.choice(COMPANIES), title=title,
+            description=f"{title} working with {', '.join(rng.sample(SKILLS, 3))}.",
+            location=f'{city}, {country}' if country else city, salary=rng.randrange(20000, 150000, 1000),
+            job_type=rng.choice(JOB_TYPES),
+        ))
+    Job.objects.bulk_create(jobs, batch_size=1000)
+    job_ids = list(Job.objects.filter(employer__in=employers).order_by('id').values_list('id', flat=True))
+    # auto_now_add stamps every row with the same time; spread postings over 90 days
+    created = {pk: now - datetime.timedelta(minutes=rng.randrange(90 * 24 * 60)) for pk in job_ids}
+    Job.objects.bulk_update([Job(id=pk, created_at=at) for pk, at in created.items()], ['created_at'], batch_size=500)
+
+    seekers = []
+    for i in range(options['jobseekers']):
+        city, country = rng.choice(CITIES)
+        seekers.append(JobSeeker(
+            user_id=users[f'{prefix}-seeker{i}'], first_name=f'Seeker{i}', last_name=rng.choice(COMPANIES),
+            email=f'{prefix}-seeker{i}@example.com', city=city, country=country or None, has_seen_tutorial=True,
+            bio=f"Experienced in {', '.join(rng.sample(SKILLS, 4))}.",
+        ))
+    JobSeeker.objects.bulk_create(seekers, batch_size=1000)
+    seeker_ids = list(JobSeeker.objects.filter(user__username__startswith=f'{prefix}-').order_by('id').values_list('id', flat=True))
+
+    educations, experiences = [], []
+    for pk in seeker_ids:
+        for _ in range(rng.randint(1, 2)):
+            degree, field = rng.choice(DEGREES)
+            start = datetime.date(rng.randint(2000, 2018), 9, 1)
+            educations.append(Education(
+                jobseeker_id=pk, school=f'{rng.choice(CITIES)[0]} University', degree=degree,
+                field_of_study=field, start_date=start, end_date=start.replace(year=start.year + 3),
+            ))
+        for _ in range(rng.randint(0, 3)):
+            title = rng.choice(TITLES)
+            start = datetime.date(rng.randint(2010, 2024), rng.randint(1, 12), 1)
+            experiences.append(Experience(
+                jobseeker_id=pk, title=title, job_type=rng.choice(JOB_TYPES), company=rng.choice(COMPANIES),
+                start_date=start, description=f"{title} using {', '.join(rng.sample(SKILLS, 3))}.",
+            ))
+    Education.objects.bulk_create(educations, batch_size=1000)
+    Experience.objects.bulk_create(experiences, batch_size=1000)
+
+    # A few jobs draw most applicants: weight of the job at popularity rank r is 1/r^skew
+    popularity = rng.sample(job_ids, len(job_ids))
+    weights = [1 / (rank + 1) ** options['skew'] for rank in range(len(popularity))]
+    pairs = set()
+    while len(pairs) < options['applications']:
+        missing = options['applications'] - len(pairs)
+        chosen = rng.choices(popularity, weights=weights, k=missing)
+        pairs.update(zip(chosen, rng.choices(seeker_ids, k=missing)))
+    statuses, status_weights = zip(*STATUSES)
+    applications = []
+    for job_id, seeker_id in sorted(pairs):
+        age = (now - created[job_id]).total_seconds()
+        applications.append(Application(
+            job_id=job_id, jobseeker_id=seeker_id, status=rng.choices(statuses, weights=status_weights)[0],
+            applied_at=now - datetime.timedelta(seconds=rng.uniform(0, age)),
+        ))
+    Application.objects.bulk_create(applications, batch_size=1000)
+    return {
+        'employers': len(employers), 'jobs': len(job_ids), 'jobseekers': len(seeker_ids),
+        'applications': len(applications),
+    }
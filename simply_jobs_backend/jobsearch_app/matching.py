@@ -0,0 +1,117 @@
+import math
+from collections import Counter, defaultdict
+from django.conf import settings
+from django.db import transaction
+from .cache import feed_cache, get_feed_generation
+from .models import Job, JobSeeker, Application, Education, Experience, Change
+from .changes import log_applications
+from .search import tokenize
+from .tasks import task, get_broker
+
+# Job/applicant match scores, stored on Application.match_score (one row per
+# (job, jobseeker) pair) so ApplicantsListView can order by it straight off an index.
+# Documents are sparse term-count vectors; IDF comes from the newest jobs rather than
+# from a job's applicant pool, so a pair's score doesn't depend on who else applied
+# and each apply or profile edit rescores just the pairs it touches. Titles are
+# counted twice.
+
+IDF_POOL_SIZE = 2000
+
+def terms(*texts):
+    return Counter(term.lower() for text in texts for term in tokenize(text))
+
+def job_terms(title, description, job_type, location):
+    return terms(title, title, description, job_type, location)
+
+def candidate_terms(jobseeker_ids):
+    # {jobseeker_id: Counter} in three queries however many candidates there are
+    documents = defaultdict(Counter)
+    for pk, city, country in JobSeeker.objects.filter(id__in=jobseeker_ids).values_list('id', 'city', 'country'):
+        documents[pk] += terms(city, country)
+    experiences = Experience.objects.filter(jobseeker_id__in=jobseeker_ids)
+    for pk, title, job_type, description in experiences.values_list('jobseeker_id', 'title', 'job_type', 'description'):
+        documents[pk] += terms(title, title, job_type, description)
+    educations = Education.objects.filter(jobseeker_id__in=jobseeker_ids)
+    for pk, degree, field_of_study in educations.values_list('jobseeker_id', 'degree', 'field_of_study'):
+        documents[pk] += terms(degree, field_of_study)
+    return documents
+
+def inverse_document_frequencies(documents):
+    frequencies = Counter(term for document in documents for term in document)
+    total = len(documents)
+    return {term: math.log((1 + total) / (1 + count)) + 1 for term, count in frequencies.items()}
+
+def job_idf():
+    # IDF over the newest JOB_MATCH_IDF_POOL jobs, plus the weight of a term none of them
+    # use. Cached until a job changes, which bumps the feed generation, or the entry expires.
+    cache = feed_cache()
+    key = f'matching:idf:{get_feed_generation()}'
+    idf = cache.get(key)
+    if idf is None:
+        pool_size = getattr(settings, 'JOB_MATCH_IDF_POOL', IDF_POOL_SIZE)
+        rows = Job.objects.order_by('-created_at', '-id').values_list('title', 'description', 'job_type', 'location')[:pool_size]
+        documents = [job_terms(*row) for row in rows]
+        idf = {'terms': inverse_document_frequencies(documents), 'unseen': math.log(1 + len(documents)) + 1}
+        cache.set(key, idf, getattr(settings, 'JOB_FEED_CACHE_TIMEOUT', 300))
+    return idf
+
+def tfidf(document, idf):
+    vector = {term: (1 + math.log(count)) * idf[term] for term, count in document.items()}
+    norm = math.sqrt(sum(weight * weight for weight in vector.values()))
+    return {term: weight / norm for term, weight in vector.items()} if norm else {}
+
+def cosine(a, b):
+    if len(a) > len(b):
+        a, b = b, a
+    return sum(weight * b.get(term, 0.0) for term, weight in a.items())
+
+def vector(document, idf):
+    return tfidf(document, {term: idf['terms'].get(term, idf['unseen']) for term in document})
+
+def score_applications(applications):
+    # Scores each (job, jobseeker) pair on its own: four queries for the documents, then
+    # one bulk_update of the scores that moved
+    applications = list(applications.only('id', 'job_id', 'jobseeker_id', 'match_score'))
+    if not applications:
+        return
+    idf = job_idf()
+    jobs = Job.objects.filter(id__in={application.job_id for application in applications})
+    job_vectors = {
+        pk: vector(job_terms(*row), idf)
+        for pk, *row in jobs.values_list('id', 'title', 'description', 'job_type', 'location')
+    }
+    candidate_vectors = {
+        pk: vector(document, idf)
+        for pk, document in candidate_terms({application.jobseeker_id for application in applications}).items()
+    }
+    changed = []
+    for application in applications:
+        if application.job_id not in job_vectors:
+            continue
+        score = round(cosine(job_vectors[application.job_id], candidate_vectors.get(application.jobseeker_id, {})), 6)
+        if score != application.match_score:
+            application.match_score = score
+            changed.append(application)
+    Application.objects.bulk_update(changed, ['match_score'], batch_size=500)
+    log_applications([(application.id, application.job_id, application.jobseeker_id) for application in changed], Change.UPSERT)
+
+@task
+def score_application(application_id):
+    score_applications(Application.objects.filter(pk=application_id))
+
+@task
+def score_job_applicants(job_id):
+    # After a job edit every applicant's score can move
+    score_applications(Application.objects.filter(job_id=job_id))
+
+@task
+def score_jobseeker_applications(jobseeker_id):
+    score_applications(Application.objects.filter(jobseeker_id=jobseeker_id))
+
+def enqueue_jobseeker_scoring(jobseeker_id):
+    # Profile edits only matter for jobseekers who have applied somewhere; checked after
+    # commit so the request itself doesn't pay for the lookup
+    def schedule():
+        if Application.objects.filter(jobseeker_id=jobseeker_id).exists():
+            get_broker().enqueue('score_jobseeker_applications', {'jobseeker_id': jobseeker_id})
+    transaction.on_commit(schedule)
@@ -0,0 +1,139 @@
+import mimetypes
+import os
+import posixpath
+import re
+import time
+from urllib.parse import quote, urlencode
+from django.conf import settings
+from django.core.exceptions import SuspiciousFileOperation
+from django.core.files.storage import FileSystemStorage, default_storage
+from django.core.signing import Signer
+from django.http import FileResponse, Http404, HttpResponse, HttpResponseForbidden, StreamingHttpResponse
+from django.utils.cache import get_conditional_response
+from django.utils.crypto import constant_time_compare
+from django.utils.http import http_date, parse_http_date_safe, quote_etag
+from django.views.decorators.http import require_safe
+
+# Uploads are served by serve_media behind signed, expiring URLs. Expiry times are
+# rounded up to whole MEDIA_URL_MAX_AGE periods so a file keeps the same URL (and
+# browser cache entry) for a while. With MEDIA_ACCEL set, the web server sends the
+# bytes and Django only checks the signature.
+
+CHUNK_SIZE = 64 * 1024
+HASH_NAME = re.compile(r'^[0-9a-f]{64}$')
+# upload_to of the JobSeeker file fields; nothing else under MEDIA_ROOT is served
+UPLOAD_PREFIXES = ('resumes/', 'profile_pictures/')
+signer = Signer(salt='jobsearch_app.media')
+
+def content_hash(name):
+    # The SHA-256 a storage.ContentAddressedStorage name carries, or None for other names
+    stem = posixpath.splitext(posixpath.basename(name or ''))[0]
+    return stem if HASH_NAME.match(stem) else None
+
+def max_age():
+    return getattr(settings, 'MEDIA_URL_MAX_AGE', 3600)
+
+def sign(name, expires):
+    return signer.signature(f'{name}:{expires}')
+
+def signed_query(name):
+    period = max_age()
+    expires = (int(time.time()) // period + 2) * period
+    return urlencode({'expires': expires, 'signature': sign(name, expires)})
+
+class SignedMediaStorage(FileSystemStorage):
+    # FileSystemStorage whose url() is a signed link to serve_media
+    def url(self, name):
+        return f'{super().url(name)}?{signed_query(name)}'
+
+def check_signature(request, name):
+    try:
+        expires = int(request.GET.get('expires', ''))
+    except ValueError:
+        return False
+    return expires > time.time() and constant_time_compare(request.GET.get('signature', ''), sign(name, expires))
+
+def parse_range(header, size):
+    # (start, end) for a single "bytes=" range, None to send the whole file, or
+    # False if the range lies outside the file
+    match = re.fullmatch(r'bytes=(\d*)-(\d*)', header.strip())
+    if not match or match.groups() == ('', ''):
+        return None
+    start, end = match.groups()
+    if not start:
+        return (max(size - int(end), 0), size - 1) if int(end) else False
+    start, end = int(start), min(int(end), size - 1) if end else size - 1
+    return (start, end) if start <= end else False
+
+def range_applies(request, etag, last_modified):
+    # If-Range with a stale validator means the client's partial copy is outdated
+    if_range = request.headers.get('If-Range')
+    if not if_range:
+        return True
+    if if_range.startswith(('"', 'W/')):
+        return if_range == etag
+    return parse_http_date_safe(if_range) == last_modified
+
+def read_range(path, start, length):
+    with open(path, 'rb') as f:
+        f.seek(start)
+        while length > 0:
+            chunk = f.read(min(CHUNK_SIZE, length))
+            if not chunk:
+                break
+            length -= len(chunk)
+            yield chunk
+
+@require_safe
+def serve_media(request, name):
+    if posixpath.normpath(name) != name or not name.startswith(UPLOAD_PREFIXES):
+        raise Http404
+    if not check_signature(request, name):
+        return HttpResponseForbidden()
+    try:
+        path = default_storage.path(name)
+        stat = os.stat(path)
+    except (SuspiciousFileOperation, FileNotFoundError, NotADirectoryError):
+        raise Http404
+    # Content-addressed names never change bytes, so their hash is a stable validator
+    checksum = content_hash(name)
+    etag = quote_etag(checksum or f'{stat.st_mtime_ns:x}-{stat.st_size:x}')
+    cache_control = f'private, max-age={int(request.GET["expires"]) - int(time.time())}'
+    headers = {
+        'ETag': etag,
+        'Last-Modified': http_date(stat.st_mtime),
+        'Cache-Control': f'{cache_control}, immutable' if checksum else cache_control,
+        'Accept-Ranges': 'bytes',
+    }
+    response = get_conditional_response(request, etag=etag, last_modified=int(stat.st_mtime))
+    if response is None:
+        response = file_response(request, name, path, stat.st_size, range_applies(request, etag, int(stat.st_mtime)))
+    for header, value in headers.items():
+        response.setdefault(header, value)
+    return response
+
+def file_response(request, name, path, size, use_range):
+    content_type = mimetypes.guess_type(path)[0] or 'application/octet-stream'
+    accel = getattr(settings, 'MEDIA_ACCEL', None)
+    if accel == 'x-accel-redirect':
+        # nginx serves an internal location mapped to MEDIA_ROOT, ranges included
+        response = HttpResponse(content_type=content_type)
+        response['X-Accel-Redirect'] = getattr(settings, 'MEDIA_ACCEL_PREFIX', '/protected-media/') + quote(name)
+        return response
+    if accel == 'x-sendfile':
+        response = HttpResponse(content_type=content_type)
+        response['X-Sendfile'] = path
+        return response
+    byte_range = parse_range(request.headers['Range'], size) if use_range and 'Range' in request.headers else None
+    if byte_range is False:
+        response = HttpResponse(status=416)
+        response['Content-Range'] = f'bytes */{size}'
+        return response
+    if byte_range:
+        start, end = byte_range
+        response = StreamingHttpResponse(read_range(path, start, end - start + 1), status=206, content_type=content_type)
+        response['Content-Range'] = f'bytes {start}-{end}/{size}'
+        response['Content-Length'] = str(end - start + 1)
+        return response
+    # FileResponse hands the open file to the server's wsgi.file_wrapper (sendfile where available)
+    return FileResponse(open(path, 'rb'), content_type=content_type)
@@ -0,0 +1,21 @@
+# Generated by Django 5.2.18 on 2026-10-18 06:13
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('jobsearch_app', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='job',
+            index=models.Index(fields=['-created_at', '-id'], name='job_feed_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='job',
+            index=models.Index(fields=['employer', '-created_at', '-id'], name='job_employer_feed_idx'),
+        ),
+    ]
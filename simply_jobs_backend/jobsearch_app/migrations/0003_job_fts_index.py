@@ -0,0 +1,31 @@
+from django.db import migrations
+
+
+def create_fts_index(apps, schema_editor):
+    if schema_editor.connection.vendor != 'sqlite':
+        return
+    schema_editor.execute(
+        "CREATE VIRTUAL TABLE IF NOT EXISTS jobsearch_app_job_fts "
+        "USING fts5(title, description, tokenize='porter unicode61')"
+    )
+    schema_editor.execute(
+        "INSERT INTO jobsearch_app_job_fts (rowid, title, description) "
+        "SELECT id, title, description FROM jobsearch_app_job"
+    )
+
+
+def drop_fts_index(apps, schema_editor):
+    if schema_editor.connection.vendor != 'sqlite':
+        return
+    schema_editor.execute("DROP TABLE IF EXISTS jobsearch_app_job_fts")
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('jobsearch_app', '0002_job_feed_indexes'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_fts_index, drop_fts_index),
+    ]
@@ -0,0 +1,41 @@
+# Generated by Django 5.2.18 on 2026-10-18 06:22
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('jobsearch_app', '0003_job_fts_index'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='application',
+            index=models.Index(fields=['job', '-applied_at'], name='application_job_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='application',
+            index=models.Index(fields=['job', 'status', '-applied_at'], name='application_job_status_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='application',
+            index=models.Index(fields=['jobseeker', '-applied_at'], name='application_seeker_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='job',
+            index=models.Index(fields=['company', '-created_at', '-id'], name='job_company_feed_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='job',
+            index=models.Index(fields=['job_type', '-created_at', '-id'], name='job_type_feed_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='job',
+            index=models.Index(fields=['location', '-created_at', '-id'], name='job_location_feed_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='job',
+            index=models.Index(fields=['salary', '-created_at', '-id'], name='job_salary_feed_idx'),
+        ),
+    ]
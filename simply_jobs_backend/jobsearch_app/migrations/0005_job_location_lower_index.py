@@ -0,0 +1,18 @@
+# Generated by Django 5.2.18 on 2026-10-18 06:23
+
+import django.db.models.functions.text
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('jobsearch_app', '0004_job_application_filter_indexes'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='job',
+            index=models.Index(django.db.models.functions.text.Lower('location'), name='job_location_lower_idx'),
+        ),
+    ]
@@ -0,0 +1,49 @@
+# Generated by Django 5.2.18 on 2026-10-18 06:31
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('jobsearch_app', '0005_job_location_lower_index'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='jobseeker',
+            name='profile_picture_checksum',
+            field=models.CharField(blank=True, db_index=True, default='', max_length=64),
+        ),
+        migrations.AddField(
+            model_name='jobseeker',
+            name='profile_thumbnail',
+            field=models.ImageField(blank=True, null=True, upload_to='profile_pictures/thumbnails/'),
+        ),
+        migrations.AddField(
+            model_name='jobseeker',
+            name='resume_checksum',
+            field=models.CharField(blank=True, db_index=True, default='', max_length=64),
+        ),
+        migrations.AddField(
+            model_name='jobseeker',
+            name='resume_text',
+            field=models.TextField(blank=True, default=''),
+        ),
+        migrations.CreateModel(
+            name='Task',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('name', models.CharField(max_length=100)),
+                ('kwargs', models.JSONField(default=dict)),
+                ('status', models.CharField(choices=[('PENDING', 'Pending'), ('RUNNING', 'Running'), ('DONE', 'Done'), ('FAILED', 'Failed')], default='PENDING', max_length=10)),
+                ('attempts', models.PositiveIntegerField(default=0)),
+                ('error', models.TextField(blank=True, default='')),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'indexes': [models.Index(fields=['status', 'id'], name='task_queue_idx')],
+            },
+        ),
+    ]
@@ -0,0 +1,34 @@
+from django.db import migrations
+
+
+def create_fts_index(apps, schema_editor):
+    if schema_editor.connection.vendor != 'sqlite':
+        return
+    schema_editor.execute(
+        "CREATE VIRTUAL TABLE IF NOT EXISTS jobsearch_app_candidate_fts "
+        "USING fts5(bio, experience, resume, tokenize='porter unicode61')"
+    )
+    schema_editor.execute(
+        "INSERT INTO jobsearch_app_candidate_fts (rowid, bio, experience, resume) "
+        "SELECT js.id, COALESCE(js.bio, ''), COALESCE(("
+        "SELECT group_concat(e.title || ' ' || e.description, ' ') "
+        "FROM jobsearch_app_experience e WHERE e.jobseeker_id = js.id), ''), js.resume_text "
+        "FROM jobsearch_app_jobseeker js"
+    )
+
+
+def drop_fts_index(apps, schema_editor):
+    if schema_editor.connection.vendor != 'sqlite':
+        return
+    schema_editor.execute("DROP TABLE IF EXISTS jobsearch_app_candidate_fts")
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('jobsearch_app', '0006_upload_processing_tasks'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_fts_index, drop_fts_index),
+    ]
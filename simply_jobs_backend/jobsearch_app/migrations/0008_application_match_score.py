@@ -0,0 +1,22 @@
+# Generated by Django 5.2.18 on 2026-10-18 06:40
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('jobsearch_app', '0007_candidate_fts_index'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='application',
+            name='match_score',
+            field=models.FloatField(default=0.0),
+        ),
+        migrations.AddIndex(
+            model_name='application',
+            index=models.Index(fields=['job', '-match_score', '-applied_at'], name='application_job_score_idx'),
+        ),
+    ]
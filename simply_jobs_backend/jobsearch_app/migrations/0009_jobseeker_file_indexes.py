@@ -0,0 +1,30 @@
+# Generated by Django 5.2.18 on 2026-10-18 06:50
+
+import django.core.validators
+import jobsearch_app.models
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('jobsearch_app', '0008_application_match_score'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='jobseeker',
+            name='profile_picture',
+            field=models.ImageField(blank=True, db_index=True, null=True, upload_to='profile_pictures/'),
+        ),
+        migrations.AlterField(
+            model_name='jobseeker',
+            name='profile_thumbnail',
+            field=models.ImageField(blank=True, db_index=True, null=True, upload_to='profile_pictures/thumbnails/'),
+        ),
+        migrations.AlterField(
+            model_name='jobseeker',
+            name='resume',
+            field=models.FileField(db_index=True, upload_to='resumes/', validators=[django.core.validators.FileExtensionValidator(allowed_extensions=['pdf', 'docx']), jobsearch_app.models.validate_file_size]),
+        ),
+    ]
@@ -0,0 +1,55 @@
+# Generated by Django 5.2.18 on 2026-10-18 06:54
+
+from django.db import migrations, models
+from django.db.models import Count, OuterRef, Subquery, Value
+from django.db.models.functions import Coalesce
+
+
+def backfill_counters(apps, schema_editor):
+    Job = apps.get_model('jobsearch_app', 'Job')
+    Application = apps.get_model('jobsearch_app', 'Application')
+
+    def count(**filters):
+        applications = (
+            Application.objects.filter(job=OuterRef('pk'), **filters).order_by()
+            .values('job').annotate(n=Count('id')).values('n')
+        )
+        return Coalesce(Subquery(applications), Value(0))
+
+    Job.objects.update(
+        applicant_count=count(),
+        pending_count=count(status='PENDING'),
+        shortlisted_count=count(status='SHORTLISTED'),
+        rejected_count=count(status='REJECTED'),
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('jobsearch_app', '0009_jobseeker_file_indexes'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='job',
+            name='applicant_count',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='job',
+            name='pending_count',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='job',
+            name='rejected_count',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='job',
+            name='shortlisted_count',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.RunPython(backfill_counters, migrations.RunPython.noop),
+    ]
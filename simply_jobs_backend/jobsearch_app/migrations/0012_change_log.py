@@ -0,0 +1,30 @@
+# Generated by Django 5.2.18 on 2026-10-18 07:11
+
+import django.db.models.deletion
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('jobsearch_app', '0011_application_status_events'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Change',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('model', models.CharField(choices=[('job', 'Job'), ('application', 'Application')], max_length=20)),
+                ('object_id', models.PositiveIntegerField()),
+                ('action', models.CharField(choices=[('upsert', 'Upsert'), ('delete', 'Delete')], max_length=10)),
+                ('created_at', models.DateTimeField(default=django.utils.timezone.now)),
+                ('job', models.ForeignKey(db_constraint=False, on_delete=django.db.models.deletion.DO_NOTHING, related_name='+', to='jobsearch_app.job')),
+                ('jobseeker', models.ForeignKey(blank=True, db_constraint=False, null=True, on_delete=django.db.models.deletion.DO_NOTHING, related_name='+', to='jobsearch_app.jobseeker')),
+            ],
+            options={
+                'indexes': [models.Index(fields=['job', 'id'], name='change_job_idx'), models.Index(fields=['jobseeker', 'id'], name='change_jobseeker_idx'), models.Index(fields=['created_at'], name='change_created_idx')],
+            },
+        ),
+    ]
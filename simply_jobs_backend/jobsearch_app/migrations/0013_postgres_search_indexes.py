@@ -0,0 +1,46 @@
+from django.db import migrations
+
+# GIN expression indexes behind search.PostgresSearchBackend. The expressions must stay
+# identical to search.postgres_vector() for the planner to use them.
+CONFIG = 'english'
+SEARCH_INDEXES = [
+    ('Job', 'job_search_gin_idx', [('title', 'A'), ('description', 'B')]),
+    ('JobSeeker', 'jobseeker_search_gin_idx', [('bio', 'A'), ('resume_text', 'C')]),
+    ('Experience', 'experience_search_gin_idx', [('title', 'B'), ('description', 'B')]),
+]
+
+
+def search_indexes(apps):
+    from django.contrib.postgres.indexes import GinIndex
+    from django.contrib.postgres.search import SearchVector
+    for model_name, name, columns in SEARCH_INDEXES:
+        vector = None
+        for column, weight in columns:
+            part = SearchVector(column, weight=weight, config=CONFIG)
+            vector = part if vector is None else vector + part
+        yield apps.get_model('jobsearch_app', model_name), GinIndex(vector, name=name)
+
+
+def add_search_indexes(apps, schema_editor):
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    for model, index in search_indexes(apps):
+        schema_editor.add_index(model, index)
+
+
+def remove_search_indexes(apps, schema_editor):
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    for model, index in search_indexes(apps):
+        schema_editor.remove_index(model, index)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('jobsearch_app', '0012_change_log'),
+    ]
+
+    operations = [
+        migrations.RunPython(add_search_indexes, remove_search_indexes),
+    ]
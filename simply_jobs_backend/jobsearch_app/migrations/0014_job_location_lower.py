@@ -0,0 +1,35 @@
+# Generated by Django 5.2.18 on 2026-10-18 07:41
+
+import jobsearch_app.models
+from django.db import migrations, models
+
+
+def backfill_location_lower(apps, schema_editor):
+    # Lowercased in Python, like LowercaseCopyField.pre_save, not with the database's LOWER()
+    Job = apps.get_model('jobsearch_app', 'Job')
+    jobs = [Job(id=pk, location_lower=location.lower()) for pk, location in Job.objects.values_list('id', 'location')]
+    Job.objects.bulk_update(jobs, ['location_lower'], batch_size=500)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('jobsearch_app', '0013_postgres_search_indexes'),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='job',
+            name='job_location_lower_idx',
+        ),
+        migrations.AddField(
+            model_name='job',
+            name='location_lower',
+            field=jobsearch_app.models.LowercaseCopyField('location', default='', editable=False, max_length=200),
+        ),
+        migrations.RunPython(backfill_location_lower, migrations.RunPython.noop),
+        migrations.AddIndex(
+            model_name='job',
+            index=models.Index(fields=['location_lower'], name='job_location_lower_idx'),
+        ),
+    ]
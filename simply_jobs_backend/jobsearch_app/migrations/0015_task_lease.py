@@ -0,0 +1,26 @@
+# Generated by Django 5.2.18 on 2026-10-18 07:44
+
+from django.db import migrations, models
+from django.db.models import F
+
+
+def lease_running_tasks(apps, schema_editor):
+    # Tasks claimed before leases existed count as claimed at their last update
+    Task = apps.get_model('jobsearch_app', 'Task')
+    Task.objects.filter(status='RUNNING').update(locked_at=F('updated_at'))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('jobsearch_app', '0014_job_location_lower'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='task',
+            name='locked_at',
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+        migrations.RunPython(lease_running_tasks, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,23 @@
+# Generated by Django 5.2.18 on 2026-10-18 08:09
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('jobsearch_app', '0015_task_lease'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='jobseeker',
+            name='profile_picture_checksum',
+            field=models.CharField(blank=True, default='', max_length=64),
+        ),
+        migrations.AlterField(
+            model_name='jobseeker',
+            name='resume_checksum',
+            field=models.CharField(blank=True, default='', max_length=64),
+        ),
+    ]
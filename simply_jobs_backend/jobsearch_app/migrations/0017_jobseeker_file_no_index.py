@@ -0,0 +1,38 @@
+# Generated by Django 5.2.18 on 2026-10-18 08:10
+
+import django.core.validators
+import jobsearch_app.models
+from django.db import migrations, models
+
+
+def delete_release_files_tasks(apps, schema_editor):
+    # The release_files task is gone (gc_media deletes unreferenced uploads), so queued
+    # ones would only fail
+    Task = apps.get_model('jobsearch_app', 'Task')
+    Task.objects.filter(name='release_files').delete()
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('jobsearch_app', '0016_jobseeker_checksum_no_index'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='jobseeker',
+            name='profile_picture',
+            field=models.ImageField(blank=True, null=True, upload_to='profile_pictures/'),
+        ),
+        migrations.AlterField(
+            model_name='jobseeker',
+            name='profile_thumbnail',
+            field=models.ImageField(blank=True, null=True, upload_to='profile_pictures/thumbnails/'),
+        ),
+        migrations.AlterField(
+            model_name='jobseeker',
+            name='resume',
+            field=models.FileField(upload_to='resumes/', validators=[django.core.validators.FileExtensionValidator(allowed_extensions=['pdf', 'docx']), jobsearch_app.models.validate_file_size]),
+        ),
+        migrations.RunPython(delete_release_files_tasks, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,33 @@
+# Generated by Django 5.2.18 on 2026-10-18 08:13
+
+import json
+
+from django.db import migrations, models
+
+
+def drop_duplicate_pending_tasks(apps, schema_editor):
+    # The broker's old exists() check could race; keep the oldest of each pending twin
+    Task = apps.get_model('jobsearch_app', 'Task')
+    seen = set()
+    duplicates = []
+    for pk, name, kwargs in Task.objects.filter(status='PENDING').order_by('id').values_list('id', 'name', 'kwargs'):
+        key = (name, json.dumps(kwargs, sort_keys=True))
+        if key in seen:
+            duplicates.append(pk)
+        seen.add(key)
+    Task.objects.filter(id__in=duplicates).delete()
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('jobsearch_app', '0017_jobseeker_file_no_index'),
+    ]
+
+    operations = [
+        migrations.RunPython(drop_duplicate_pending_tasks, migrations.RunPython.noop),
+        migrations.AddConstraint(
+            model_name='task',
+            constraint=models.UniqueConstraint(condition=models.Q(('status', 'PENDING')), fields=('name', 'kwargs'), name='task_pending_unique'),
+        ),
+    ]
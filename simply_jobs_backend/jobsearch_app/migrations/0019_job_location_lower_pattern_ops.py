@@ -0,0 +1,21 @@
+# Generated by Django 5.2.18 on 2026-10-18 08:17
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('jobsearch_app', '0018_task_pending_unique'),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='job',
+            name='job_location_lower_idx',
+        ),
+        migrations.AddIndex(
+            model_name='job',
+            index=models.Index(fields=['location_lower'], name='job_location_lower_idx', opclasses=['varchar_pattern_ops']),
+        ),
+    ]
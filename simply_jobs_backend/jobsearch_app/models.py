@@ -30,6 +30,8 @@ class JobSeeker(BaseProfile):
     email = models.EmailField()
     phone_number = models.CharField(max_length=15, blank=True, null=True)
     bio = models.TextField(blank=True, null=True)
+    # File names are content hashes shared between profiles (storage.ContentAddressedStorage);
+    # `manage.py gc_media` deletes the ones no profile names any more
     resume = models.FileField(
         upload_to='resumes/',
         validators=[
@@ -40,6 +42,11 @@ class JobSeeker(BaseProfile):
     city = models.CharField(max_length=100, blank=True, null=True)
     country = models.CharField(max_length=100, blank=True, null=True)
     profile_picture = models.ImageField(upload_to='profile_pictures/', null=True, blank=True)
+    # Filled in by the background upload tasks in uploads.py
+    profile_thumbnail = models.ImageField(upload_to='profile_pictures/thumbnails/', null=True, blank=True)
+    profile_picture_checksum = models.CharField(max_length=64, blank=True, default='')
+    resume_checksum = models.CharField(max_length=64, blank=True, default='')
+    resume_text = models.TextField(blank=True, default='')
 
     class Meta:
         permissions = [
@@ -75,6 +82,24 @@ class Employer(BaseProfile):
             ("can_post_jobs", "Can post jobs"),
         ]
 
+class LowercaseCopyField(models.CharField):
+    # Python-lowercased copy of another field, filled in on save() and bulk_create().
+    # SQLite's LOWER() only folds ASCII, so case-insensitive lookups compare against this
+    # column to get the same results on every backend.
+    def __init__(self, source, *args, **kwargs):
+        self.source = source
+        kwargs.setdefault('editable', False)
+        super().__init__(*args, **kwargs)
+
+    def deconstruct(self):
+        name, path, args, kwargs = super().deconstruct()
+        return name, path, [self.source, *args], kwargs
+
+    def pre_save(self, model_instance, add):
+        value = getattr(model_instance, self.source).lower()
+        setattr(model_instance, self.attname, value)
+        return value
+
 class Job(models.Model):
     id = models.AutoField(primary_key=True)
     employer = models.ForeignKey(Employer, on_delete=models.CASCADE, related_name='jobs')
@@ -82,9 +107,31 @@ class Job(models.Model):
     title = models.CharField(max_length=100)
     description = models.TextField()
     location = models.CharField(max_length=100)
+    # Lowercasing can lengthen a string (e.g. 'İ'), hence the wider column
+    location_lower = LowercaseCopyField('location', max_length=200, default='')
     salary = models.IntegerField(default=0)
     job_type = models.CharField(max_length=50)
     created_at = models.DateTimeField(auto_now_add=True)
+    # Applicant counters, kept current by counters.py; `manage.py repair_job_counters` recomputes them
+    applicant_count = models.PositiveIntegerField(default=0)
+    pending_count = models.PositiveIntegerField(default=0)
+    shortlisted_count = models.PositiveIntegerField(default=0)
+    rejected_count = models.PositiveIntegerField(default=0)
+
+    class Meta:
+        indexes = [
+            # Cursor feed ordering, see pagination.JobCursorPagination
+            models.Index(fields=['-created_at', '-id'], name='job_feed_idx'),
+            models.Index(fields=['employer', '-created_at', '-id'], name='job_employer_feed_idx'),
+            # Feed filters, each followed by the feed ordering so filter + page is one range scan
+            models.Index(fields=['company', '-created_at', '-id'], name='job_company_feed_idx'),
+            models.Index(fields=['job_type', '-created_at', '-id'], name='job_type_feed_idx'),
+            models.Index(fields=['location', '-created_at', '-id'], name='job_location_feed_idx'),
+            models.Index(fields=['salary', '-created_at', '-id'], name='job_salary_feed_idx'),
+            # Case-insensitive location prefix search, see filters.JobFilter. The opclass
+            # lets Postgres serve LIKE 'prefix%' whatever the collation; other backends ignore it.
+            models.Index(fields=['location_lower'], name='job_location_lower_idx', opclasses=['varchar_pattern_ops']),
+        ]
 
     def __str__(self):
         return f"{self.title} at {self.company}"
@@ -102,10 +149,104 @@ class Application(models.Model):
     jobseeker = models.ForeignKey(JobSeeker, on_delete=models.CASCADE, related_name='applications')
     applied_at = models.DateTimeField(default=timezone.now)
     status = models.CharField(max_length=20, choices=STATUS_CHOICES, default=PENDING)
+    # Job/profile similarity in [0, 1], kept current by matching.score_applications
+    match_score = models.FloatField(default=0.0)
 
     class Meta:
         unique_together = ('job', 'jobseeker')  # Prevent duplicate applications
         ordering = ['-applied_at']
+        indexes = [
+            models.Index(fields=['job', '-applied_at'], name='application_job_idx'),
+            models.Index(fields=['job', 'status', '-applied_at'], name='application_job_status_idx'),
+            models.Index(fields=['jobseeker', '-applied_at'], name='application_seeker_idx'),
+            models.Index(fields=['job', '-match_score', '-applied_at'], name='application_job_score_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.jobseeker.first_name} {self.jobseeker.last_name} applied to {self.job.title}"
+
+class ApplicationStatusEvent(models.Model):
+    # One row per status transition, written by counters.update_statuses
+    application = models.ForeignKey(Application, on_delete=models.CASCADE, related_name='status_events')
+    old_status = models.CharField(max_length=20, choices=Application.STATUS_CHOICES)
+    new_status = models.CharField(max_length=20, choices=Application.STATUS_CHOICES)
+    created_at = models.DateTimeField(default=timezone.now)
+    # Set once notifications.notify_status_changes has emailed the jobseeker
+    notified_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        ordering = ['-created_at', '-id']
+        indexes = [
+            models.Index(fields=['application', '-created_at'], name='status_event_application_idx'),
+            # The notification task reads the unsent events oldest first
+            models.Index(fields=['notified_at', 'id'], name='status_event_unnotified_idx'),
+        ]
+
+    def __str__(self):
+        return f"Application {self.application_id}: {self.old_status} -> {self.new_status}"
+
+class Change(models.Model):
+    # Append-only log of Job and Application writes behind the ?since= delta endpoints
+    # (see changes.py). The id is the sync token. job/jobseeker scope each entry to the
+    # lists it affects; they carry no constraint so entries outlive deleted rows.
+    JOB = 'job'
+    APPLICATION = 'application'
+    MODEL_CHOICES = [(JOB, 'Job'), (APPLICATION, 'Application')]
+    UPSERT = 'upsert'
+    DELETE = 'delete'
+    ACTION_CHOICES = [(UPSERT, 'Upsert'), (DELETE, 'Delete')]
+    model = models.CharField(max_length=20, choices=MODEL_CHOICES)
+    object_id = models.PositiveIntegerField()
+    action = models.CharField(max_length=10, choices=ACTION_CHOICES)
+    job = models.ForeignKey(Job, on_delete=models.DO_NOTHING, db_constraint=False, related_name='+')
+    jobseeker = models.ForeignKey(
+        JobSeeker, on_delete=models.DO_NOTHING, db_constraint=False, null=True, blank=True, related_name='+'
+    )
+    created_at = models.DateTimeField(default=timezone.now)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['job', 'id'], name='change_job_idx'),
+            models.Index(fields=['jobseeker', 'id'], name='change_jobseeker_idx'),
+            models.Index(fields=['created_at'], name='change_created_idx'),
+        ]
+
+    def __str__(self):
+        return f"#{self.pk} {self.action} {self.model} {self.object_id}"
+
+class Task(models.Model):
+    PENDING = 'PENDING'
+    RUNNING = 'RUNNING'
+    DONE = 'DONE'
+    FAILED = 'FAILED'
+    STATUS_CHOICES = [
+        (PENDING, 'Pending'),
+        (RUNNING, 'Running'),
+        (DONE, 'Done'),
+        (FAILED, 'Failed'),
+    ]
+    name = models.CharField(max_length=100)
+    kwargs = models.JSONField(default=dict)
+    status = models.CharField(max_length=10, choices=STATUS_CHOICES, default=PENDING)
+    attempts = models.PositiveIntegerField(default=0)
+    error = models.TextField(blank=True, default='')
+    # When a worker claimed the task; RUNNING tasks whose lease has run out are reclaimed
+    locked_at = models.DateTimeField(null=True, blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        indexes = [
+            # The worker polls for the oldest pending tasks
+            models.Index(fields=['status', 'id'], name='task_queue_idx'),
+        ]
+        constraints = [
+            # DatabaseBroker inserts with ignore_conflicts, so an identical pending task is
+            # skipped without a lookup first
+            models.UniqueConstraint(
+                fields=['name', 'kwargs'], condition=models.Q(status='PENDING'), name='task_pending_unique'
+            ),
+        ]
 
     def __str__(self):
-        return f"{self.jobseeker.first_name} {self.jobseeker.last_name} applied to {self.job.title}"
\ No newline at end of file
+        return f"{self.name} ({self.status})"
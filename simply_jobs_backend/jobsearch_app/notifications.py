@@ -0,0 +1,43 @@
+from django.conf import settings
+from django.core.mail import get_connection, EmailMessage
+from django.utils import timezone
+from .models import ApplicationStatusEvent
+from .tasks import task
+
+# Emails jobseekers about status changes. Events are recorded in bulk with the status
+# update itself; this task sends whatever hasn't been sent yet, so the queued task
+# (coalesced by DatabaseBroker) covers every update made before it runs.
+
+BATCH_SIZE = 500
+
+def status_message(event):
+    application = event.application
+    job = application.job
+    return EmailMessage(
+        subject=f"Your application for {job.title} at {job.company}",
+        body=(
+            f"Hi {application.jobseeker.first_name},\n\n"
+            f"Your application for {job.title} at {job.company} is now "
+            f"{event.get_new_status_display().lower()}.\n"
+        ),
+        from_email=settings.DEFAULT_FROM_EMAIL,
+        to=[application.jobseeker.email],
+    )
+
+@task
+def notify_status_changes():
+    # Three queries and one mail connection per batch, however many jobs are involved
+    connection = get_connection()
+    while True:
+        events = list(
+            ApplicationStatusEvent.objects.filter(notified_at__isnull=True).order_by('id')
+            .select_related('application__job', 'application__jobseeker')
+            .only(
+                'new_status', 'application__job__title', 'application__job__company',
+                'application__jobseeker__first_name', 'application__jobseeker__email',
+            )[:BATCH_SIZE]
+        )
+        if not events:
+            return
+        connection.send_messages([status_message(event) for event in events if event.application.jobseeker.email])
+        ApplicationStatusEvent.objects.filter(id__in=[event.id for event in events]).update(notified_at=timezone.now())
@@ -0,0 +1,15 @@
+from rest_framework.pagination import CursorPagination, PageNumberPagination
+
+class JobCursorPagination(CursorPagination):
+    # Keyset pagination over (created_at, id) so each page is an index range scan
+    # instead of an OFFSET over the whole jobs table.
+    page_size = 20
+    page_size_query_param = 'page_size'
+    max_page_size = 100
+    ordering = ('-created_at', '-id')
+
+class JobSearchPagination(PageNumberPagination):
+    # Search results are ordered by relevance, not by a unique column, so they page by number.
+    page_size = 20
+    page_size_query_param = 'page_size'
+    max_page_size = 100
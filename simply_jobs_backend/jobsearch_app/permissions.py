@@ -1,9 +1,10 @@
 from rest_framework.permissions import BasePermission
+from .profiles import get_jobseeker, get_employer
 
 class IsJobseeker(BasePermission):
     def has_permission(self, request, view):
-        return hasattr(request.user, 'jobseeker')
+        return get_jobseeker(request) is not None
 
 class IsEmployer(BasePermission):
     def has_permission(self, request, view):
-        return hasattr(request.user, 'employer')
\ No newline at end of file
+        return get_employer(request) is not None
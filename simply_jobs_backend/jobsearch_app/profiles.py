@@ -0,0 +1,43 @@
+from django.db import DEFAULT_DB_ALIAS
+from .models import JobSeeker, Employer
+
+PROFILE_MODELS = {
+    'JOBSEEKER': JobSeeker,
+    'EMPLOYER': Employer,
+}
+
+def resolve_profile(user, account=None):
+    # The account type says which profile table to look in, so this is at most one query
+    # instead of a hasattr() miss per profile type.
+    model = PROFILE_MODELS.get(account or getattr(user, 'account', None))
+    if model is None:
+        return None
+    profile = model.objects.filter(user_id=user.pk).first()
+    if profile is not None:
+        profile.user = user
+    return profile
+
+def profile_from_claims(account, profile_id, user_id):
+    # Builds the profile from token claims without a query. Only the keys are set; every
+    # other field is deferred and loads on first access, like a row from .only('id', 'user').
+    model = PROFILE_MODELS.get(account)
+    if model is None:
+        return None
+    return model.from_db(DEFAULT_DB_ALIAS, ['id', 'user_id'], [profile_id, int(user_id)])
+
+def get_profile(request):
+    # request.profile is normally set by ProfileJWTAuthentication; resolve it here for
+    # any other authentication path and keep it for the rest of the request.
+    http_request = getattr(request, '_request', request)
+    if not hasattr(http_request, 'profile'):
+        user = request.user
+        http_request.profile = resolve_profile(user) if user.is_authenticated else None
+    return http_request.profile
+
+def get_jobseeker(request):
+    profile = get_profile(request)
+    return profile if isinstance(profile, JobSeeker) else None
+
+def get_employer(request):
+    profile = get_profile(request)
+    return profile if isinstance(profile, Employer) else None
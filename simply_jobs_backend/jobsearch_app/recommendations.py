@@ -0,0 +1,91 @@
+from collections import Counter
+from django.conf import settings
+from django.core.cache import caches
+from .cache import get_feed_generation
+from .matching import terms, inverse_document_frequencies, tfidf, cosine
+from .models import Job, JobSeeker, Application, Experience
+
+# Personalized job ranking for the jobseeker feed. A jobseeker's profile (experience
+# titles and types, city/country, jobs applied to) and the newest jobs are turned into
+# sparse TF-IDF vectors; the top matches are cached per jobseeker so feed requests only
+# page through a stored list of ids. Ties keep newest-first order, so a new profile
+# with nothing to match on sees the plain feed.
+
+POOL_SIZE = 2000
+TOP_K = 200
+
+def recommendations_cache():
+    return caches[getattr(settings, 'JOB_RECOMMENDATIONS_CACHE_ALIAS', 'default')]
+
+def job_vectors():
+    # IDF and (job_id, vector) pairs for the newest POOL_SIZE jobs, shared by every
+    # jobseeker until a job changes (which bumps the feed generation) or the entry expires
+    cache = recommendations_cache()
+    key = f'recommendations:jobs:{get_feed_generation()}'
+    vectors = cache.get(key)
+    if vectors is None:
+        pool_size = getattr(settings, 'JOB_RECOMMENDATIONS_POOL', POOL_SIZE)
+        rows = Job.objects.order_by('-created_at', '-id').values_list('id', 'title', 'job_type', 'location')[:pool_size]
+        documents = [(pk, terms(title, title, job_type, location)) for pk, title, job_type, location in rows]
+        idf = inverse_document_frequencies([document for _, document in documents])
+        vectors = {'idf': idf, 'jobs': [(pk, tfidf(document, idf)) for pk, document in documents]}
+        cache.set(key, vectors, getattr(settings, 'JOB_RECOMMENDATIONS_TIMEOUT', 900))
+    return vectors
+
+def profile_terms(jobseeker_id):
+    document = terms(*JobSeeker.objects.filter(pk=jobseeker_id).values_list('city', 'country').first() or ())
+    for title, job_type in Experience.objects.filter(jobseeker_id=jobseeker_id).values_list('title', 'job_type'):
+        document += terms(title, title, job_type)
+    applied = Application.objects.filter(jobseeker_id=jobseeker_id).values_list('job__title', 'job__job_type', 'job__location')
+    for title, job_type, location in applied:
+        document += terms(title, job_type, location)
+    return document
+
+def rank_jobs(jobseeker_id):
+    vectors = job_vectors()
+    # Terms no pooled job uses can't match anything
+    idf = vectors['idf']
+    profile = tfidf(Counter({term: count for term, count in profile_terms(jobseeker_id).items() if term in idf}), idf)
+    applied = set(Application.objects.filter(jobseeker_id=jobseeker_id).values_list('job_id', flat=True))
+    scored = [(cosine(profile, vector), pk) for pk, vector in vectors['jobs'] if pk not in applied]
+    # sorted() is stable, so equal scores stay newest first
+    scored = sorted(scored, key=lambda item: item[0], reverse=True)
+    return [pk for _, pk in scored[:getattr(settings, 'JOB_RECOMMENDATIONS_SIZE', TOP_K)]]
+
+def recommendation_key(jobseeker_id):
+    return f'recommendations:{get_feed_generation()}:{jobseeker_id}'
+
+def get_recommendations(jobseeker):
+    cache = recommendations_cache()
+    key = recommendation_key(jobseeker.pk)
+    job_ids = cache.get(key)
+    if job_ids is None:
+        job_ids = rank_jobs(jobseeker.pk)
+        cache.set(key, job_ids, getattr(settings, 'JOB_RECOMMENDATIONS_TIMEOUT', 900))
+    return job_ids
+
+def invalidate_recommendations(jobseeker_id):
+    recommendations_cache().delete(recommendation_key(jobseeker_id))
+
+class RecommendedJobs:
+    # Sliceable, countable view of a cached ranking for the paginator. Jobs applied to
+    # since the ranking was cached are dropped from each page.
+    def __init__(self, job_ids, jobseeker):
+        self.job_ids = job_ids
+        self.jobseeker = jobseeker
+
+    def count(self):
+        return len(self.job_ids)
+
+    def __len__(self):
+        return self.count()
+
+    def __getitem__(self, key):
+        if not isinstance(key, slice):
+            return self[key:key + 1][0]
+        ids = self.job_ids[key]
+        applied = set(
+            Application.objects.filter(jobseeker=self.jobseeker, job_id__in=ids).values_list('job_id', flat=True)
+        )
+        jobs = Job.objects.in_bulk([pk for pk in ids if pk not in applied])
+        return [jobs[pk] for pk in ids if pk in jobs]
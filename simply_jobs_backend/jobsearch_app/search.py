@@ -0,0 +1,257 @@
+import re
+from abc import ABC, abstractmethod
+from functools import lru_cache
+from django.conf import settings
+from django.db import connection
+from django.db.models import Q, Exists, OuterRef
+from django.utils.module_loading import import_string
+from .models import Job, JobSeeker, Experience
+
+FTS_TABLE = 'jobsearch_app_job_fts'
+# bm25() column weights: a hit in the title counts more than one in the description
+FTS_WEIGHTS = (10.0, 1.0)
+
+# One row per JobSeeker (rowid = JobSeeker.id), created in migration 0007
+CANDIDATE_FTS_TABLE = 'jobsearch_app_candidate_fts'
+# bm25() weights for bio, experience and resume: bios are short and deliberate, resumes long
+CANDIDATE_FTS_WEIGHTS = (4.0, 2.0, 1.0)
+# Text search configuration of the Postgres vectors. It has to be spelled out for the
+# expressions to match the GIN indexes from migration 0013.
+POSTGRES_SEARCH_CONFIG = 'english'
+# Builds the candidate documents; experiences are flattened to "title description ..."
+CANDIDATE_DOCUMENT_SQL = (
+    f"SELECT js.id, COALESCE(js.bio, ''), COALESCE(("
+    f"SELECT group_concat(e.title || ' ' || e.description, ' ') "
+    f"FROM {Experience._meta.db_table} e WHERE e.jobseeker_id = js.id), ''), js.resume_text "
+    f"FROM {JobSeeker._meta.db_table} js"
+)
+
+def tokenize(query):
+    return re.findall(r'\w+', query or '')
+
+def fts_match(query):
+    # Quote every term so user input can't inject FTS5 syntax; the trailing * gives prefix matching
+    return ' '.join(f'"{term}"*' for term in tokenize(query))
+
+def load_applications(applications):
+    # RankedResults loader for candidate search: rowids are jobseeker ids
+    return lambda ids: {application.jobseeker_id: application for application in applications.filter(jobseeker_id__in=ids)}
+
+class BaseSearchBackend(ABC):
+    # Keeps keyword indexes of Job.title/description and of each candidate's bio,
+    # experience and resume text in sync, and answers ranked queries.
+    # search() returns a sliceable, countable sequence of Job objects, best match first;
+    # search_candidates() does the same for the given Application queryset. The index
+    # hooks do nothing by default, for backends that read the tables directly.
+    def index(self, job):
+        pass
+
+    def remove(self, job_id):
+        pass
+
+    def index_candidate(self, jobseeker_id):
+        pass
+
+    def remove_candidate(self, jobseeker_id):
+        pass
+
+    def rebuild(self):
+        pass
+
+    @abstractmethod
+    def search(self, query):
+        pass
+
+    @abstractmethod
+    def search_candidates(self, query, applications):
+        pass
+
+class SimpleSearchBackend(BaseSearchBackend):
+    # Fallback for databases without a full-text engine. Not indexed, fine for small tables.
+    def search(self, query):
+        terms = tokenize(query)
+        if not terms:
+            return Job.objects.none()
+        condition = Q()
+        for term in terms:
+            condition &= Q(title__icontains=term) | Q(description__icontains=term)
+        return Job.objects.filter(condition).order_by('-created_at', '-id')
+
+    def search_candidates(self, query, applications):
+        terms = tokenize(query)
+        if not terms:
+            return applications.none()
+        condition = Q()
+        for term in terms:
+            experience = Experience.objects.filter(jobseeker=OuterRef('jobseeker')).filter(
+                Q(title__icontains=term) | Q(description__icontains=term)
+            )
+            condition &= (
+                Q(jobseeker__bio__icontains=term) | Q(jobseeker__resume_text__icontains=term) | Exists(experience)
+            )
+        return applications.filter(condition).order_by('-applied_at', '-id')
+
+class RankedResults:
+    # Lazy result set over an FTS5 index. Only the requested slice is ranked and loaded,
+    # so pagination costs one index query, one count and one primary key lookup. Equal
+    # scores are ordered by rowid so pages don't overlap.
+    # scope is an optional (sql, params) subquery of rowids the matches are limited to;
+    # load maps a list of rowids to {rowid: object}.
+    def __init__(self, table, weights, match, load, scope=None):
+        self.table = table
+        self.weights = weights
+        self.match = match
+        self.load = load
+        self.scope = scope
+
+    def where(self):
+        sql, params = f'{self.table} MATCH %s', [self.match]
+        if self.scope is not None:
+            scope_sql, scope_params = self.scope
+            sql += f' AND rowid IN ({scope_sql})'
+            params += list(scope_params)
+        return sql, params
+
+    def count(self):
+        if not self.match:
+            return 0
+        where, params = self.where()
+        with connection.cursor() as cursor:
+            cursor.execute(f'SELECT COUNT(*) FROM {self.table} WHERE {where}', params)
+            return cursor.fetchone()[0]
+
+    def __len__(self):
+        return self.count()
+
+    def __getitem__(self, key):
+        if not isinstance(key, slice):
+            return self[key:key + 1][0]
+        if not self.match:
+            return []
+        offset = key.start or 0
+        limit = -1 if key.stop is None else max(key.stop - offset, 0)
+        where, params = self.where()
+        weights = ', '.join(['%s'] * len(self.weights))
+        with connection.cursor() as cursor:
+            cursor.execute(
+                f'SELECT rowid FROM {self.table} WHERE {where} '
+                f'ORDER BY bm25({self.table}, {weights}), rowid LIMIT %s OFFSET %s',
+                [*params, *self.weights, limit, offset],
+            )
+            ids = [row[0] for row in cursor.fetchall()]
+        objects = self.load(ids)
+        return [objects[pk] for pk in ids if pk in objects]
+
+class SQLiteSearchBackend(BaseSearchBackend):
+    # Inverted index in an FTS5 virtual table keyed by Job.id, created in migration 0003.
+    def index(self, job):
+        with connection.cursor() as cursor:
+            cursor.execute(f'DELETE FROM {FTS_TABLE} WHERE rowid = %s', [job.pk])
+            cursor.execute(
+                f'INSERT INTO {FTS_TABLE} (rowid, title, description) VALUES (%s, %s, %s)',
+                [job.pk, job.title, job.description],
+            )
+
+    def remove(self, job_id):
+        with connection.cursor() as cursor:
+            cursor.execute(f'DELETE FROM {FTS_TABLE} WHERE rowid = %s', [job_id])
+
+    def index_candidate(self, jobseeker_id):
+        # Re-reads the whole document in SQL, so any change to the profile, an experience
+        # or the extracted resume text costs one delete and one insert of a single row
+        with connection.cursor() as cursor:
+            cursor.execute(f'DELETE FROM {CANDIDATE_FTS_TABLE} WHERE rowid = %s', [jobseeker_id])
+            cursor.execute(
+                f'INSERT INTO {CANDIDATE_FTS_TABLE} (rowid, bio, experience, resume) '
+                f'{CANDIDATE_DOCUMENT_SQL} WHERE js.id = %s',
+                [jobseeker_id],
+            )
+
+    def remove_candidate(self, jobseeker_id):
+        with connection.cursor() as cursor:
+            cursor.execute(f'DELETE FROM {CANDIDATE_FTS_TABLE} WHERE rowid = %s', [jobseeker_id])
+
+    def rebuild(self):
+        with connection.cursor() as cursor:
+            cursor.execute(f'DELETE FROM {FTS_TABLE}')
+            cursor.execute(
+                f'INSERT INTO {FTS_TABLE} (rowid, title, description) '
+                f'SELECT id, title, description FROM {Job._meta.db_table}'
+            )
+            cursor.execute(f'DELETE FROM {CANDIDATE_FTS_TABLE}')
+            cursor.execute(f'INSERT INTO {CANDIDATE_FTS_TABLE} (rowid, bio, experience, resume) {CANDIDATE_DOCUMENT_SQL}')
+
+    def search(self, query):
+        return RankedResults(FTS_TABLE, FTS_WEIGHTS, fts_match(query), Job.objects.in_bulk)
+
+    def search_candidates(self, query, applications):
+        # Ranks the whole candidate index but only within the applicants in the queryset
+        scope = applications.values('jobseeker_id').query.sql_with_params()
+        return RankedResults(
+            CANDIDATE_FTS_TABLE, CANDIDATE_FTS_WEIGHTS, fts_match(query), load_applications(applications), scope
+        )
+
+def postgres_vector(*columns):
+    # (column, weight) pairs -> tsvector expression, as indexed in migration 0013
+    from django.contrib.postgres.search import SearchVector
+    vector = None
+    for column, weight in columns:
+        part = SearchVector(column, weight=weight, config=POSTGRES_SEARCH_CONFIG)
+        vector = part if vector is None else vector + part
+    return vector
+
+class PostgresSearchBackend(BaseSearchBackend):
+    # Ranks with tsvector/tsquery computed from the tables themselves, so there is nothing
+    # to keep in sync. The filters match the GIN expression indexes from migration 0013;
+    # only the matching rows are ranked.
+    def search(self, query):
+        from django.contrib.postgres.search import SearchQuery, SearchRank
+        if not tokenize(query):
+            return Job.objects.none()
+        vector = postgres_vector(('title', 'A'), ('description', 'B'))
+        search_query = SearchQuery(query, search_type='websearch', config=POSTGRES_SEARCH_CONFIG)
+        return (
+            Job.objects.annotate(search=vector)
+            .filter(search=search_query)
+            .annotate(rank=SearchRank(vector, search_query))
+            .order_by('-rank', '-created_at', '-id')
+        )
+
+    def search_candidates(self, query, applications):
+        from django.contrib.postgres.aggregates import StringAgg
+        from django.contrib.postgres.search import SearchQuery, SearchRank, SearchVector
+        from django.db.models import Subquery, Value
+        from django.db.models.functions import Coalesce, Concat
+        if not tokenize(query):
+            return applications.none()
+        search_query = SearchQuery(query, search_type='websearch', config=POSTGRES_SEARCH_CONFIG)
+        # Matching goes through the indexed profile and experience vectors separately
+        profile = postgres_vector(('jobseeker__bio', 'A'), ('jobseeker__resume_text', 'C'))
+        experience_match = Experience.objects.filter(jobseeker=OuterRef('jobseeker')).annotate(
+            search=postgres_vector(('title', 'B'), ('description', 'B'))
+        ).filter(search=search_query)
+        experience = (
+            Experience.objects.filter(jobseeker=OuterRef('jobseeker')).values('jobseeker')
+            .annotate(text=StringAgg(Concat('title', Value(' '), 'description'), ' ')).values('text')
+        )
+        vector = profile + SearchVector(
+            Coalesce(Subquery(experience), Value('')), weight='B', config=POSTGRES_SEARCH_CONFIG
+        )
+        return (
+            applications.annotate(profile_search=profile)
+            .filter(Q(profile_search=search_query) | Exists(experience_match))
+            .annotate(rank=SearchRank(vector, search_query))
+            .order_by('-rank', '-applied_at', '-id')
+        )
+
+VENDOR_BACKENDS = {
+    'sqlite': SQLiteSearchBackend,
+    'postgresql': PostgresSearchBackend,
+}
+
+@lru_cache(maxsize=None)
+def get_search_backend():
+    path = getattr(settings, 'JOB_SEARCH_BACKEND', None)
+    if path:
+        return import_string(path)()
+    return VENDOR_BACKENDS.get(connection.vendor, SimpleSearchBackend)()
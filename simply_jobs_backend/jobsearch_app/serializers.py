@@ -1,6 +1,11 @@
+import json
+from django.db import transaction
 from rest_framework import serializers
-from .models import User, Employer, JobSeeker, Job, Application, Education, Experience
+from .models import User, Employer, JobSeeker, Job, Application, ApplicationStatusEvent, Education, Experience
 from rest_framework_simplejwt.serializers import TokenObtainPairSerializer
+from .profiles import resolve_profile
+from .search import get_search_backend
+from .counters import COUNTER_FIELDS
 
 class MyTokenObtainPairSerializer(TokenObtainPairSerializer):
     # Custom JWT serializer to include account type in token
@@ -9,6 +14,9 @@ class MyTokenObtainPairSerializer(TokenObtainPairSerializer):
         token = super().get_token(user)
         token['account'] = user.account
         token['username'] = user.username
+        # Lets StatelessProfileJWTAuthentication resolve request.profile without a query
+        profile = resolve_profile(user)
+        token['profile_id'] = profile.pk if profile else None
         return token
 
 class UserSerializer(serializers.ModelSerializer):
@@ -65,7 +73,8 @@ class JobSeekerSerializer(serializers.ModelSerializer):
 
     class Meta:
         model = JobSeeker
-        fields = '__all__'
+        exclude = ['resume_text']
+        read_only_fields = ['profile_thumbnail', 'profile_picture_checksum', 'resume_checksum']
         extra_kwargs = {
             'user': {'read_only': True},
             'profile_picture': {'required': False, 'allow_null': True},
@@ -80,17 +89,182 @@ class JobSeekerSerializer(serializers.ModelSerializer):
             'has_seen_tutorial': {'read_only': True},
         }
 
+    @staticmethod
+    def setup_eager_loading(queryset, prefix=''):
+        # Load the nested username, educations and experiences in a fixed number of queries
+        return queryset.select_related(f'{prefix}user').prefetch_related(
+            f'{prefix}educations', f'{prefix}experiences'
+        )
+
+class SyncRowMixin(serializers.Serializer):
+    # Writable id so ProfileSyncSerializer can tell updates from inserts. Empty date
+    # inputs from the profile form mean "no date", which start_date (NOT NULL) rejects
+    # with a field error rather than an IntegrityError from bulk_create.
+    id = serializers.IntegerField(required=False, allow_null=True)
+
+    def to_internal_value(self, data):
+        if isinstance(data, dict):
+            data = {key: None if key.endswith('_date') and value == '' else value for key, value in data.items()}
+        return super().to_internal_value(data)
+
+class EducationSyncSerializer(SyncRowMixin, EducationSerializer):
+    class Meta(EducationSerializer.Meta):
+        extra_kwargs = {**EducationSerializer.Meta.extra_kwargs, 'start_date': {'required': True}}
+
+class ExperienceSyncSerializer(SyncRowMixin, ExperienceSerializer):
+    class Meta(ExperienceSerializer.Meta):
+        extra_kwargs = {**ExperienceSerializer.Meta.extra_kwargs, 'start_date': {'required': True}}
+
+EDITABLE_FIELDS = {
+    Education: ['school', 'degree', 'field_of_study', 'start_date', 'end_date'],
+    Experience: ['title', 'job_type', 'company', 'start_date', 'end_date', 'description'],
+}
+
+def sync_rows(jobseeker, model, rows):
+    # Makes jobseeker's rows of model match rows: one select, then at most one
+    # bulk_update, one bulk_create and one delete. Ids the jobseeker doesn't own are inserted.
+    existing = {obj.id: obj for obj in model.objects.filter(jobseeker=jobseeker)}
+    fields = [field for field in EDITABLE_FIELDS[model] if any(field in row for row in rows)]
+    to_create, to_update = [], []
+    for row in rows:
+        row = dict(row)
+        obj = existing.pop(row.pop('id', None), None)
+        if obj is None:
+            to_create.append(model(jobseeker=jobseeker, **row))
+            continue
+        for field, value in row.items():
+            setattr(obj, field, value)
+        to_update.append(obj)
+    if existing:
+        model.objects.filter(id__in=existing).delete()
+    if to_update and fields:
+        model.objects.bulk_update(to_update, fields)
+    if to_create:
+        model.objects.bulk_create(to_create)
+
+class ProfileSyncSerializer(JobSeekerSerializer):
+    # JobSeeker fields plus the complete desired educations/experiences lists, applied
+    # in one transaction. Lists that are left out are not touched.
+    educations = EducationSyncSerializer(many=True, required=False)
+    experiences = ExperienceSyncSerializer(many=True, required=False)
+
+    def to_internal_value(self, data):
+        # Multipart requests (needed for file uploads) carry the lists as JSON strings
+        if hasattr(data, 'getlist'):
+            data = data.dict()
+            for key in ('educations', 'experiences'):
+                if isinstance(data.get(key), str):
+                    try:
+                        data[key] = json.loads(data[key])
+                    except ValueError:
+                        raise serializers.ValidationError({key: ['Invalid JSON.']})
+        return super().to_internal_value(data)
+
+    def update(self, instance, validated_data):
+        educations = validated_data.pop('educations', None)
+        experiences = validated_data.pop('experiences', None)
+        with transaction.atomic():
+            instance = super().update(instance, validated_data)
+            if educations is not None:
+                sync_rows(instance, Education, educations)
+            if experiences is not None:
+                sync_rows(instance, Experience, experiences)
+                # bulk writes skip the signals that keep the candidate index current
+                get_search_backend().index_candidate(instance.pk)
+        return instance
+
 class JobSerializer(serializers.ModelSerializer):
     class Meta:
         model = Job
-        fields = '__all__'
+        # Applicant counters are for the employer dashboard only
+        exclude = [*COUNTER_FIELDS, 'location_lower']
         extra_kwargs = {'employer': {'read_only': True}}
 
+class JobDashboardSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = Job
+        exclude = ['location_lower']
+        read_only_fields = ['employer', *COUNTER_FIELDS]
+
 class ApplicationSerializer(serializers.ModelSerializer):
     job = JobSerializer(read_only=True)
     jobseeker = JobSeekerSerializer(read_only=True)
     
     class Meta:
         model = Application
-        fields = ['id', 'job', 'jobseeker', 'applied_at', 'status']
-        read_only_fields = ['jobseeker', 'applied_at']
\ No newline at end of file
+        fields = ['id', 'job', 'jobseeker', 'applied_at', 'status', 'match_score']
+        read_only_fields = ['jobseeker', 'applied_at', 'match_score']
+
+    @staticmethod
+    def setup_eager_loading(queryset):
+        queryset = queryset.select_related('job')
+        return JobSeekerSerializer.setup_eager_loading(queryset.select_related('jobseeker'), prefix='jobseeker__')
+
+    @staticmethod
+    def order_applicants(queryset, ordering):
+        # ?ordering=score puts the best matches first, read off application_job_score_idx
+        if ordering == 'score':
+            return queryset.order_by('-match_score', '-applied_at')
+        return queryset
+
+class AppliedSerializer(serializers.ModelSerializer):
+    # The POST /api/jobs/apply/ response: the new row with the job as an id, so
+    # answering takes no queries beyond the insert
+    class Meta:
+        model = Application
+        fields = ['id', 'job', 'applied_at', 'status', 'match_score']
+        read_only_fields = fields
+
+class ApplicationStatusEventSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = ApplicationStatusEvent
+        fields = ['id', 'old_status', 'new_status', 'created_at']
+
+class ApplicationSummarySerializer(serializers.Serializer):
+    # Compact applicant row serialized straight from Application.objects.values(),
+    # see ApplicantsListView (?view=summary or ?fields=).
+    id = serializers.IntegerField()
+    name = serializers.SerializerMethodField()
+    city = serializers.CharField(source='jobseeker__city', allow_null=True)
+    status = serializers.CharField()
+    applied_at = serializers.DateTimeField()
+    match_score = serializers.FloatField()
+
+    # Columns each output field reads, so the queryset selects nothing else
+    columns = {
+        'id': ['id'],
+        'name': ['jobseeker__first_name', 'jobseeker__last_name'],
+        'city': ['jobseeker__city'],
+        'status': ['status'],
+        'applied_at': ['applied_at'],
+        'match_score': ['match_score'],
+    }
+    # Returned when ?fields= names nothing known
+    default_fields = ['id', 'name', 'city', 'status', 'applied_at']
+
+    def __init__(self, *args, fields=None, **kwargs):
+        super().__init__(*args, **kwargs)
+        if fields:
+            for name in set(self.fields) - set(fields):
+                self.fields.pop(name)
+
+    @classmethod
+    def parse_fields(cls, value):
+        # Keeps known field names from a comma-separated ?fields= value, in declared order
+        requested = {name.strip() for name in (value or '').split(',')}
+        return [name for name in cls.columns if name in requested] or cls.default_fields
+
+    @classmethod
+    def setup_projection(cls, queryset, fields):
+        return queryset.values(*[column for name in fields for column in cls.columns[name]])
+
+    def get_name(self, obj):
+        return f"{obj['jobseeker__first_name']} {obj['jobseeker__last_name']}".strip()
+
+class ChangeFeedSerializer(serializers.Serializer):
+    # Response of the ?since= delta endpoints, see changes.ChangeFeed.read
+    token = serializers.CharField()
+    more = serializers.BooleanField()
+    reset = serializers.BooleanField()
+    changed = ApplicationSerializer(many=True)
+    deleted = serializers.ListField(child=serializers.IntegerField())
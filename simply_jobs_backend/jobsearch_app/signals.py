@@ -0,0 +1,63 @@
+from django.db.models.signals import post_save, post_delete
+from django.dispatch import receiver
+from .models import Job, JobSeeker, Application, Education, Experience, Change
+from .search import get_search_backend
+from .cache import bump_feed_generation
+from .matching import enqueue_jobseeker_scoring
+from .counters import application_added, application_removed
+from .recommendations import invalidate_recommendations
+from .changes import log_jobs, log_applications
+from .tasks import enqueue
+
+@receiver(post_save, sender=Job)
+def job_saved(sender, instance, created, **kwargs):
+    get_search_backend().index(instance)
+    bump_feed_generation()
+    log_jobs([instance.pk], Change.UPSERT)
+    if not created:
+        enqueue('score_job_applicants', job_id=instance.pk)
+
+@receiver(post_delete, sender=Job)
+def job_deleted(sender, instance, **kwargs):
+    get_search_backend().remove(instance.pk)
+    bump_feed_generation()
+    log_jobs([instance.pk], Change.DELETE)
+
+# Candidate index: profile edits, experience edits and the resume task (which saves
+# resume_text) all land here. ProfileSyncSerializer reindexes after its bulk writes,
+# which don't send signals.
+@receiver(post_save, sender=JobSeeker)
+def jobseeker_saved(sender, instance, update_fields, **kwargs):
+    get_search_backend().index_candidate(instance.pk)
+    if update_fields is None or {'city', 'country'} & set(update_fields):
+        enqueue_jobseeker_scoring(instance.pk)
+        invalidate_recommendations(instance.pk)
+
+@receiver(post_delete, sender=JobSeeker)
+def jobseeker_deleted(sender, instance, **kwargs):
+    get_search_backend().remove_candidate(instance.pk)
+
+@receiver([post_save, post_delete], sender=Experience)
+def experience_changed(sender, instance, **kwargs):
+    get_search_backend().index_candidate(instance.jobseeker_id)
+    enqueue_jobseeker_scoring(instance.jobseeker_id)
+    invalidate_recommendations(instance.jobseeker_id)
+
+# Match scores: the worker rescores the applications whose job or profile changed
+@receiver([post_save, post_delete], sender=Education)
+def education_changed(sender, instance, **kwargs):
+    enqueue_jobseeker_scoring(instance.jobseeker_id)
+
+@receiver(post_save, sender=Application)
+def application_saved(sender, instance, created, **kwargs):
+    log_applications([(instance.pk, instance.job_id, instance.jobseeker_id)], Change.UPSERT)
+    if created:
+        application_added(instance)
+        enqueue('score_application', application_id=instance.pk)
+
+@receiver(post_delete, sender=Application)
+def application_deleted(sender, instance, origin=None, **kwargs):
+    log_applications([(instance.pk, instance.job_id, instance.jobseeker_id)], Change.DELETE)
+    # Counters of a job that is being deleted itself don't need maintaining
+    if getattr(origin, 'model', type(origin)) is not Job:
+        application_removed(instance)
@@ -0,0 +1,45 @@
+import hashlib
+import os
+import posixpath
+import tempfile
+from .media import SignedMediaStorage
+
+class ContentAddressedStorage(SignedMediaStorage):
+    # Stores each upload as <upload_to>/<sha256><ext>. The hash is computed while the
+    # upload is copied to a temp file, so the bytes are read once; identical uploads map
+    # to the same name and the second copy is dropped instead of getting a suffix.
+    # Files are shared between rows, so nothing deletes them inline; `manage.py gc_media`
+    # collects unreferenced ones past a grace period, which a re-upload restarts.
+    temp_prefix = '.upload-'
+
+    def get_available_name(self, name, max_length=None):
+        return name
+
+    def _save(self, name, content):
+        directory = posixpath.dirname(name)
+        extension = posixpath.splitext(name)[1].lower()
+        os.makedirs(self.path(directory), exist_ok=True)
+        fd, temp_path = tempfile.mkstemp(dir=self.path(directory), prefix=self.temp_prefix)
+        try:
+            digest = hashlib.sha256()
+            with os.fdopen(fd, 'wb') as f:
+                if hasattr(content, 'seek'):
+                    content.seek(0)
+                for chunk in content.chunks():
+                    digest.update(chunk)
+                    f.write(chunk)
+            name = posixpath.join(directory, digest.hexdigest() + extension)
+            path = self.path(name)
+            if os.path.exists(path):
+                os.remove(temp_path)
+                # The row naming it may not be committed yet; keep gc_media away for now
+                os.utime(path)
+            else:
+                if self.file_permissions_mode is not None:
+                    os.chmod(temp_path, self.file_permissions_mode)
+                os.replace(temp_path, path)
+        except BaseException:
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+            raise
+        return name
@@ -0,0 +1,101 @@
+import datetime
+import logging
+import traceback
+from functools import lru_cache
+from django.conf import settings
+from django.db import IntegrityError, transaction
+from django.db.models import F, Q
+from django.utils import timezone
+from django.utils.module_loading import import_string
+from .models import Task
+
+logger = logging.getLogger(__name__)
+
+# name -> function, filled by the @task decorator
+registry = {}
+
+def task(func):
+    registry[func.__name__] = func
+    return func
+
+def run_task(name, kwargs):
+    return registry[name](**kwargs)
+
+class ImmediateBroker:
+    # Runs tasks inline. Useful for scripts and debugging; requests pay the full cost.
+    def enqueue(self, name, kwargs):
+        run_task(name, kwargs)
+
+class DatabaseBroker:
+    # Stores tasks as Task rows for the run_tasks worker command to pick up. A task that
+    # is already waiting with the same arguments isn't queued twice (task_pending_unique).
+    def enqueue(self, name, kwargs):
+        Task.objects.bulk_create([Task(name=name, kwargs=kwargs)], ignore_conflicts=True)
+
+@lru_cache(maxsize=None)
+def get_broker():
+    return import_string(getattr(settings, 'TASK_BROKER', 'jobsearch_app.tasks.DatabaseBroker'))()
+
+def enqueue(name, **kwargs):
+    # Deferred until the surrounding transaction commits so the worker sees the saved rows
+    if name not in registry:
+        raise KeyError(f"Unknown task {name!r}")
+    transaction.on_commit(lambda: get_broker().enqueue(name, kwargs))
+
+def claimable():
+    # Pending tasks, and running ones whose worker died: a claim is a lease of
+    # TASK_LEASE_SECONDS, after which the task is handed to the next worker that polls.
+    # Leases must outlast the slowest task, or it can run twice.
+    lease = datetime.timedelta(seconds=getattr(settings, 'TASK_LEASE_SECONDS', 600))
+    return Q(status=Task.PENDING) | Q(status=Task.RUNNING, locked_at__lt=timezone.now() - lease)
+
+def claim_next():
+    # Claims the oldest claimable task. The conditional UPDATE makes the claim safe with
+    # several workers polling the same table.
+    for task_id in Task.objects.filter(claimable()).order_by('id').values_list('id', flat=True)[:10]:
+        claimed = Task.objects.filter(claimable(), id=task_id).update(
+            status=Task.RUNNING, attempts=F('attempts') + 1, locked_at=timezone.now()
+        )
+        if claimed:
+            return Task.objects.get(id=task_id)
+    return None
+
+def run_pending(limit=None, max_attempts=3):
+    # Runs pending tasks until the queue is empty or limit is reached; returns how many ran
+    count = 0
+    while limit is None or count < limit:
+        queued = claim_next()
+        if queued is None:
+            break
+        count += 1
+        if queued.attempts > max_attempts:
+            # Reclaimed after its lease ran out on every attempt, e.g. it keeps killing the worker
+            queued.status = Task.FAILED
+            queued.error = "Lease expired on every attempt."
+        else:
+            try:
+                run_task(queued.name, queued.kwargs)
+            except Exception:
+                logger.exception("Task %s failed", queued)
+                queued.status = Task.PENDING if queued.attempts < max_attempts else Task.FAILED
+                queued.error = traceback.format_exc()
+            else:
+                queued.status = Task.DONE
+                queued.error = ''
+        queued.locked_at = None
+        fields = ['status', 'error', 'locked_at', 'updated_at']
+        if queued.status == Task.PENDING:
+            try:
+                with transaction.atomic():
+                    queued.save(update_fields=fields)
+            except IntegrityError:
+                # An identical task was queued while this one ran; that one is the retry
+                queued.delete()
+        else:
+            queued.save(update_fields=fields)
+    return count
+
+def prune(before):
+    # Drops finished tasks last updated before `before`; FAILED rows are kept until then so
+    # their tracebacks can be read
+    return Task.objects.filter(status__in=[Task.DONE, Task.FAILED], updated_at__lt=before).delete()[0]
@@ -1,5 +1,88 @@
-from django.test import TestCase
-from .models import User, JobSeeker, Employer, Job, Application
+import csv
+import datetime
+import hashlib
+import io
+import os
+import json
+import shutil
+import tempfile
+import zipfile
+import re
+import threading
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+from asgiref.sync import sync_to_async
+from django.core.cache import cache, caches
+from django.core.files.storage import default_storage
+from django.core import mail
+from django.core.management import call_command, CommandError
+from django.db import connection, connections, IntegrityError
+from django.db.models.signals import post_save
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.test import TestCase, TransactionTestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+from rest_framework.test import APIClient, APITestCase
+from .models import User, JobSeeker, Employer, Job, Application, ApplicationStatusEvent, Change, Education, Experience, Task
+from .tasks import run_pending, get_broker
+from .applications import apply_to_job
+from .search import BaseSearchBackend
+
+class QueryCountMixin:
+    # Fails if the number of queries for a request grows with the number of rows it returns
+    def assertConstantQueries(self, url, add_rows, batches=(1, 5, 20)):
+        counts = []
+        for batch in batches:
+            add_rows(batch)
+            with CaptureQueriesContext(connection) as ctx:
+                res = self.client.get(url)
+            self.assertEqual(res.status_code, 200)
+            counts.append(len(ctx.captured_queries))
+        self.assertEqual(len(set(counts)), 1, f"Query count grows with rows: {counts}")
+        return counts[0]
+
+def make_png(color="red"):
+    from PIL import Image
+    buffer = io.BytesIO()
+    Image.new("RGB", (800, 600), color).save(buffer, format="PNG")
+    return SimpleUploadedFile("avatar.png", buffer.getvalue(), content_type="image/png")
+
+def make_docx(text):
+    buffer = io.BytesIO()
+    with zipfile.ZipFile(buffer, "w") as archive:
+        archive.writestr("word/document.xml", (
+            '<w:document xmlns:w="http://schemas.openxmlformats.org/wordprocessingml/2006/main">'
+            f"<w:body><w:p><w:r><w:t>{text}</w:t></w:r></w:p></w:body></w:document>"
+        ))
+    return SimpleUploadedFile("cv.docx", buffer.getvalue())
+
+class TempMediaMixin:
+    # Keeps test uploads out of the checked-in media directory
+    @classmethod
+    def setUpClass(cls):
+        cls.media_root = tempfile.mkdtemp()
+        cls.media_override = override_settings(MEDIA_ROOT=cls.media_root)
+        cls.media_override.enable()
+        super().setUpClass()
+
+    @classmethod
+    def tearDownClass(cls):
+        super().tearDownClass()
+        cls.media_override.disable()
+        shutil.rmtree(cls.media_root, ignore_errors=True)
+
+def make_jobseeker(username, with_history=True):
+    user = User.objects.create_user(username=username, password="abc", account="JOBSEEKER")
+    jobseeker = JobSeeker.objects.create(user=user, first_name=username, last_name="Seeker", email=f"{username}@example.com")
+    if with_history:
+        Education.objects.create(
+            jobseeker=jobseeker, school="Uni", degree="BSc", field_of_study="CS", start_date=datetime.date(2015, 9, 1)
+        )
+        Experience.objects.create(
+            jobseeker=jobseeker, title="Developer", job_type="Full-time", company="Acme",
+            start_date=datetime.date(2019, 1, 1), description="Wrote code"
+        )
+    return jobseeker
 
 class UserModelTest(TestCase):
     def test_create_jobseeker_user(self):
@@ -49,3 +132,1161 @@ class ApplicationModelTest(TestCase):
         app = Application.objects.create(job=self.job, jobseeker=self.jobseeker)
         self.assertEqual(app.status, "PENDING")
         self.assertEqual(str(app), "John Doe applied to Developer")
+
+class JobFeedPaginationTest(APITestCase):
+    def setUp(self):
+        cache.clear()
+        self.emp_user = User.objects.create_user(username="feed_employer", password="abc", account="EMPLOYER")
+        self.employer = Employer.objects.create(user=self.emp_user)
+        for i in range(25):
+            Job.objects.create(
+                employer=self.employer,
+                company="SimplyJobs",
+                title=f"Job {i}",
+                description="Write code",
+                location="Remote" if i % 2 else "London",
+                salary=40000,
+                job_type="Full-time"
+            )
+        self.user = User.objects.create_user(username="feed_seeker", password="abc", account="JOBSEEKER")
+        JobSeeker.objects.create(user=self.user, first_name="Feed", last_name="Seeker", email="feed@example.com")
+        self.client.force_authenticate(self.user)
+
+    def test_feed_is_cursor_paginated_newest_first(self):
+        res = self.client.get("/api/jobs/")
+        self.assertEqual(res.status_code, 200)
+        self.assertEqual(len(res.data["results"]), 20)
+        self.assertEqual(res.data["results"][0]["title"], "Job 24")
+        res = self.client.get(res.data["next"])
+        self.assertEqual([job["title"] for job in res.data["results"]], [f"Job {i}" for i in range(4, -1, -1)])
+        self.assertIsNone(res.data["next"])
+
+    def test_feed_keeps_filters(self):
+        res = self.client.get("/api/jobs/", {"location": "London", "page_size": 5})
+        self.assertEqual(len(res.data["results"]), 5)
+        self.assertTrue(all(job["location"] == "London" for job in res.data["results"]))
+
+class JobFilterTest(APITestCase):
+    def setUp(self):
+        cache.clear()
+        self.emp_user = User.objects.create_user(username="filter_employer", password="abc", account="EMPLOYER")
+        employer = Employer.objects.create(user=self.emp_user)
+        for title, location, salary, job_type in [
+            ("A", "London", 55000, "Full-time"),
+            ("B", "london Bridge", 65000, "Full-time"),
+            ("C", "Remote", 50000, "Part-time"),
+            ("D", "Leeds", 70000, "Full-time"),
+        ]:
+            Job.objects.create(employer=employer, company="SimplyJobs", title=title, description="Code",
+                               location=location, salary=salary, job_type=job_type)
+        self.client.force_authenticate(make_jobseeker("filter_seeker", with_history=False).user)
+
+    def titles(self, params):
+        res = self.client.get("/api/jobs/", params)
+        self.assertEqual(res.status_code, 200)
+        return sorted(job["title"] for job in res.data["results"])
+
+    def test_salary_range_and_in_lists(self):
+        params = {"salary__gte": 50000, "location__in": "London,Remote", "job_type": "Full-time"}
+        self.assertEqual(self.titles(params), ["A"])
+        self.assertEqual(self.titles({"salary__gte": 55000, "salary__lte": 65000}), ["A", "B"])
+
+    def test_location_prefix_is_case_insensitive(self):
+        self.assertEqual(self.titles({"location__istartswith": "LON"}), ["A", "B"])
+        self.assertEqual(self.titles({"location__istartswith": "le"}), ["D"])
+
+    def test_location_prefix_folds_non_ascii(self):
+        # SQLite's LOWER() leaves non-ASCII letters alone; the stored copy is folded in Python
+        Job.objects.create(employer=Employer.objects.get(), company="SimplyJobs", title="E", description="Code",
+                           location="Łódź", salary=40000, job_type="Full-time")
+        self.assertEqual(self.titles({"location__istartswith": "ŁÓD"}), ["E"])
+        self.assertEqual(self.titles({"location__istartswith": "łódź"}), ["E"])
+
+    def test_location_prefix_at_max_code_point(self):
+        self.assertEqual(self.titles({"location__istartswith": "lon\U0010ffff"}), [])
+
+    def test_exact_filters_still_work(self):
+        self.assertEqual(self.titles({"location": "Remote"}), ["C"])
+
+class UnseenJobsFeedTest(APITestCase):
+    def setUp(self):
+        emp_user = User.objects.create_user(username="unseen_employer", password="abc", account="EMPLOYER")
+        employer = Employer.objects.create(user=emp_user)
+        self.jobs = [
+            Job.objects.create(employer=employer, company="SimplyJobs", title=f"Job {i}", description="Code",
+                               location="Remote", salary=40000, job_type="Full-time")
+            for i in range(5)
+        ]
+        self.jobseeker = make_jobseeker("unseen_seeker", with_history=False)
+        other = make_jobseeker("other_seeker", with_history=False)
+        Application.objects.create(job=self.jobs[1], jobseeker=self.jobseeker)
+        Application.objects.create(job=self.jobs[3], jobseeker=self.jobseeker)
+        Application.objects.create(job=self.jobs[0], jobseeker=other)
+        self.client.force_authenticate(self.jobseeker.user)
+
+    def test_feed_excludes_applied_jobs(self):
+        res = self.client.get("/api/jobs/feed/", {"page_size": 2})
+        self.assertEqual([job["title"] for job in res.data["results"]], ["Job 4", "Job 2"])
+        res = self.client.get(res.data["next"])
+        self.assertEqual([job["title"] for job in res.data["results"]], ["Job 0"])
+
+    def test_feed_is_jobseeker_only(self):
+        self.client.force_authenticate(User.objects.get(username="unseen_employer"))
+        self.assertEqual(self.client.get("/api/jobs/feed/").status_code, 403)
+
+class JobSearchTest(APITestCase):
+    def setUp(self):
+        self.emp_user = User.objects.create_user(username="search_employer", password="abc", account="EMPLOYER")
+        self.employer = Employer.objects.create(user=self.emp_user)
+        self.python_job = Job.objects.create(
+            employer=self.employer, company="SimplyJobs", title="Python Developer",
+            description="Build Django APIs", location="Remote", salary=50000, job_type="Full-time"
+        )
+        self.frontend_job = Job.objects.create(
+            employer=self.employer, company="SimplyJobs", title="Frontend Developer",
+            description="React work, some Python scripting", location="London", salary=45000, job_type="Full-time"
+        )
+        self.client.force_authenticate(self.emp_user)
+
+    def test_search_ranks_title_matches_first(self):
+        res = self.client.get("/api/jobs/search/", {"q": "python"})
+        self.assertEqual(res.status_code, 200)
+        self.assertEqual(res.data["count"], 2)
+        self.assertEqual([job["id"] for job in res.data["results"]], [self.python_job.id, self.frontend_job.id])
+
+    def test_index_follows_saves_and_deletes(self):
+        self.frontend_job.description = "React work"
+        self.frontend_job.save()
+        self.python_job.delete()
+        res = self.client.get("/api/jobs/search/", {"q": "python"})
+        self.assertEqual(res.data["count"], 0)
+        res = self.client.get("/api/jobs/search/", {"q": "reac"})
+        self.assertEqual([job["id"] for job in res.data["results"]], [self.frontend_job.id])
+
+    def test_search_syntax_is_escaped(self):
+        res = self.client.get("/api/jobs/search/", {"q": 'python" OR NEAR('})
+        self.assertEqual(res.status_code, 200)
+
+    def test_equal_scores_page_in_id_order(self):
+        jobs = [
+            Job.objects.create(employer=self.employer, company="SimplyJobs", title="Tester", description="Test code",
+                               location="Remote", salary=40000, job_type="Full-time")
+            for _ in range(3)
+        ]
+        pages = [self.client.get("/api/jobs/search/", {"q": "tester", "page_size": 1, "page": page}).data for page in (1, 2, 3)]
+        self.assertEqual([page["results"][0]["id"] for page in pages], [job.id for job in jobs])
+        with self.assertRaises(TypeError):
+            BaseSearchBackend()
+
+class ApplicationListQueryTest(QueryCountMixin, APITestCase):
+    def setUp(self):
+        self.emp_user = User.objects.create_user(username="nplus_employer", password="abc", account="EMPLOYER")
+        self.employer = Employer.objects.create(user=self.emp_user)
+        self.job = Job.objects.create(
+            employer=self.employer, company="SimplyJobs", title="Developer",
+            description="Write code", location="Remote", salary=40000, job_type="Full-time"
+        )
+        self.created = 0
+
+    def add_applicants(self, n):
+        for _ in range(n):
+            self.created += 1
+            Application.objects.create(job=self.job, jobseeker=make_jobseeker(f"applicant{self.created}"))
+
+    def test_applicants_list_query_count_is_constant(self):
+        self.client.force_authenticate(self.emp_user)
+        self.assertConstantQueries(f"/api/jobs/{self.job.id}/applicants/", self.add_applicants)
+
+    def test_applied_jobs_query_count_is_constant(self):
+        jobseeker = make_jobseeker("nplus_seeker")
+        self.client.force_authenticate(jobseeker.user)
+
+        def add_applications(n):
+            for _ in range(n):
+                self.created += 1
+                job = Job.objects.create(
+                    employer=self.employer, company="SimplyJobs", title=f"Job {self.created}",
+                    description="Write code", location="Remote", salary=40000, job_type="Full-time"
+                )
+                Application.objects.create(job=job, jobseeker=jobseeker)
+
+        self.assertConstantQueries("/api/applied/", add_applications)
+
+    def test_applicants_summary_projection(self):
+        self.add_applicants(2)
+        self.client.force_authenticate(self.emp_user)
+        with CaptureQueriesContext(connection) as ctx:
+            res = self.client.get(f"/api/jobs/{self.job.id}/applicants/", {"view": "summary"})
+        self.assertEqual(res.status_code, 200)
+        self.assertEqual(set(res.data[0]), {"id", "name", "city", "status", "applied_at"})
+        self.assertEqual(res.data[0]["name"], "applicant2 Seeker")
+        select = [q["sql"] for q in ctx.captured_queries if "jobsearch_app_application" in q["sql"]][-1]
+        self.assertNotIn("bio", select)
+
+    def test_applicants_fields_selection(self):
+        self.add_applicants(1)
+        self.client.force_authenticate(self.emp_user)
+        res = self.client.get(f"/api/jobs/{self.job.id}/applicants/", {"fields": "status,id,bogus"})
+        self.assertEqual(res.data, [{"id": Application.objects.get().id, "status": "PENDING"}])
+
+class ProfileResolutionTest(APITestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(username="profile_seeker", password="abc", account="JOBSEEKER")
+        self.jobseeker = JobSeeker.objects.create(user=self.user, first_name="Pro", last_name="File", email="p@example.com")
+        res = self.client.post("/api/token/", {"username": "profile_seeker", "password": "abc"})
+        self.client.credentials(HTTP_AUTHORIZATION=f"Bearer {res.data['access']}")
+
+    def test_profile_resolved_once_per_request(self):
+        # Writes load the user, then the profile named by the token's account claim
+        with CaptureQueriesContext(connection) as ctx:
+            res = self.client.patch("/api/tutorial_seen/")
+        self.assertEqual(res.data, {"has_seen_tutorial": True})
+        selects = [q["sql"] for q in ctx.captured_queries if q["sql"].startswith("SELECT")]
+        self.assertEqual(len(selects), 2)
+        self.jobseeker.refresh_from_db()
+        self.assertTrue(self.jobseeker.has_seen_tutorial)
+
+    def test_reads_authenticate_from_claims(self):
+        # Only the deferred has_seen_tutorial column is loaded; no users table access
+        with CaptureQueriesContext(connection) as ctx:
+            res = self.client.get("/api/tutorial_seen/")
+        self.assertEqual(res.data, {"has_seen_tutorial": False})
+        self.assertEqual(len(ctx.captured_queries), 1)
+        self.assertNotIn("jobsearch_app_user", ctx.captured_queries[0]["sql"])
+
+    def test_edit_profile_loads_profile_in_one_query(self):
+        # Claims authenticate the request; the profile and username come from one join,
+        # plus one prefetch each for educations and experiences
+        with CaptureQueriesContext(connection) as ctx:
+            res = self.client.get("/api/profile/edit/")
+        self.assertEqual(res.data["username"], "profile_seeker")
+        self.assertEqual(len(ctx.captured_queries), 3)
+        self.assertIn("jobsearch_app_user", ctx.captured_queries[0]["sql"])
+
+    def test_default_authentication_loads_user(self):
+        # Views that don't opt into stateless auth still check the user row
+        self.user.is_active = False
+        self.user.save()
+        res = self.client.get("/api/educations/")
+        self.assertEqual(res.status_code, 401)
+
+    def test_employer_endpoints_reject_jobseeker(self):
+        res = self.client.put("/api/applications/update/", {"application_ids": [1], "status": "REJECTED"}, format="json")
+        self.assertEqual(res.status_code, 403)
+
+class JobFeedCacheTest(APITestCase):
+    def setUp(self):
+        cache.clear()
+        self.emp_user = User.objects.create_user(username="cache_employer", password="abc", account="EMPLOYER")
+        self.employer = Employer.objects.create(user=self.emp_user)
+        self.job = Job.objects.create(
+            employer=self.employer, company="SimplyJobs", title="Developer",
+            description="Write code", location="Remote", salary=40000, job_type="Full-time"
+        )
+        self.client.force_authenticate(make_jobseeker("cache_seeker", with_history=False).user)
+
+    def test_etag_revalidation_skips_database(self):
+        res = self.client.get("/api/jobs/")
+        etag = res["ETag"]
+        with self.assertNumQueries(1):  # profile lookup only
+            res = self.client.get("/api/jobs/", HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(res.status_code, 304)
+
+    def test_job_changes_invalidate_feed(self):
+        first = self.client.get("/api/jobs/")
+        self.job.title = "Senior Developer"
+        self.job.save()
+        res = self.client.get("/api/jobs/", HTTP_IF_NONE_MATCH=first["ETag"])
+        self.assertEqual(res.status_code, 200)
+        self.assertNotEqual(res["ETag"], first["ETag"])
+        self.assertEqual(res.data["results"][0]["title"], "Senior Developer")
+
+@unittest.skipUnless(connection.vendor == "sqlite", "Query plans are checked with SQLite's EXPLAIN QUERY PLAN")
+class QueryPlanTest(APITestCase):
+    # Seeds a dataset large enough for the planner to prefer indexes, then runs EXPLAIN on
+    # every SELECT a hot endpoint issues and fails on plain table scans.
+    @classmethod
+    def setUpTestData(cls):
+        User.objects.bulk_create(
+            [User(username=f"plan_employer{i}", account="EMPLOYER") for i in range(20)]
+            + [User(username=f"plan_seeker{i}", account="JOBSEEKER") for i in range(300)]
+        )
+        Employer.objects.bulk_create([Employer(user=u) for u in User.objects.filter(account="EMPLOYER")])
+        JobSeeker.objects.bulk_create([
+            JobSeeker(user=u, first_name=u.username, last_name="Seeker", email="s@example.com", city="London")
+            for u in User.objects.filter(account="JOBSEEKER")
+        ])
+        employers = list(Employer.objects.all())
+        locations = ["London", "Remote", "Leeds", "Bristol", "Manchester"]
+        Job.objects.bulk_create([
+            Job(employer=employers[i % len(employers)], company=f"Company {i % 50}", title=f"Job {i}",
+                description="Write code", location=locations[i % len(locations)],
+                salary=30000 + (i % 40) * 1000, job_type=["Full-time", "Part-time", "Contract"][i % 3])
+            for i in range(3000)
+        ])
+        jobseekers = list(JobSeeker.objects.all())
+        jobs = list(Job.objects.filter(employer=employers[0])[:30])
+        Application.objects.bulk_create([
+            Application(job=job, jobseeker=jobseeker, status=Application.STATUS_CHOICES[i % 3][0])
+            for i, (job, jobseeker) in enumerate((j, s) for j in jobs for s in jobseekers[:100])
+        ])
+        cls.employer = employers[0]
+        cls.jobseeker = jobseekers[0]
+        cls.job = jobs[0]
+        Application.objects.bulk_create([Application(job=job, jobseeker=jobseekers[-1]) for job in jobs])
+        with connection.cursor() as cursor:
+            cursor.execute("ANALYZE")
+
+    def setUp(self):
+        cache.clear()
+
+    def assertIndexedPlan(self, url, params=None, allow_scans=(), allow_sort=False):
+        # A plain SCAN reads the whole table, and a temp B-tree sorts every matching row
+        # before LIMIT applies. allow_scans names indexes whose in-order walk stops at LIMIT.
+        with CaptureQueriesContext(connection) as ctx:
+            res = self.client.get(url, params or {})
+        self.assertEqual(res.status_code, 200, url)
+        for query in ctx.captured_queries:
+            if not query["sql"].startswith("SELECT"):
+                continue
+            with connection.cursor() as cursor:
+                cursor.execute("EXPLAIN QUERY PLAN " + query["sql"])
+                plan = [row[-1] for row in cursor.fetchall()]
+            bad = [
+                step for step in plan
+                if (step.startswith("SCAN ") and "VIRTUAL TABLE" not in step
+                    and not any(f"INDEX {index}" in step for index in allow_scans))
+                or (step.startswith("USE TEMP B-TREE FOR ORDER BY") and not allow_sort)
+            ]
+            self.assertEqual(bad, [], f"{url} {params or ''} is not index-driven:\n{query['sql']}\n{plan}")
+
+    def test_jobseeker_endpoints_use_indexes(self):
+        self.client.force_authenticate(self.jobseeker.user)
+        self.assertIndexedPlan("/api/jobs/", allow_scans=["job_feed_idx"])
+        for field, value in [("location", "London"), ("company", "Company 3"), ("job_type", "Contract"), ("salary", 40000)]:
+            self.assertIndexedPlan("/api/jobs/", {field: value})
+        for params in [
+            {"salary__gte": 50000, "salary__lte": 60000},
+            {"company__in": "Company 3,Company 4"},
+            {"location__istartswith": "lon"},
+        ]:
+            self.assertIndexedPlan("/api/jobs/", params, allow_sort=True)
+        self.assertIndexedPlan("/api/jobs/", {"created_at__gte": "2020-01-01T00:00:00Z"}, allow_scans=["job_feed_idx"])
+        self.assertIndexedPlan("/api/jobs/search/", {"q": "job"}, allow_sort=True)
+        self.assertIndexedPlan("/api/jobs/feed/", allow_scans=["job_feed_idx"])
+        self.assertIndexedPlan("/api/applied/")
+        self.assertIndexedPlan(f"/api/profile/{self.jobseeker.user.username}/")
+        self.assertIndexedPlan("/api/educations/")
+        self.assertIndexedPlan("/api/experiences/")
+
+    def test_employer_endpoints_use_indexes(self):
+        self.client.force_authenticate(self.employer.user)
+        self.assertIndexedPlan("/api/jobs/")
+        url = f"/api/jobs/{self.job.id}/applicants/"
+        self.assertIndexedPlan(url)
+        self.assertIndexedPlan(url, {"status": "SHORTLISTED"})
+        self.assertIndexedPlan(url, {"view": "summary"})
+        self.assertIndexedPlan(url, {"ordering": "score"})
+
+class ProfileSyncTest(APITestCase):
+    def setUp(self):
+        self.jobseeker = make_jobseeker("sync_seeker")
+        self.education = self.jobseeker.educations.get()
+        self.experience = self.jobseeker.experiences.get()
+        self.client.force_authenticate(self.jobseeker.user)
+
+    def test_sync_diffs_rows_in_one_request(self):
+        payload = {
+            "first_name": "Synced",
+            "educations": [
+                {"id": self.education.id, "school": "New Uni", "degree": "MSc", "field_of_study": "CS",
+                 "start_date": "2016-09-01", "end_date": ""},
+                {"school": "Night School", "degree": "Cert", "field_of_study": "Design", "start_date": "2020-01-01"},
+            ],
+            "experiences": [],
+        }
+        with CaptureQueriesContext(connection) as ctx:
+            res = self.client.put("/api/profile/sync/", payload, format="json")
+        self.assertEqual(res.status_code, 200, res.data)
+        self.assertLess(len(ctx.captured_queries), 20)
+        self.jobseeker.refresh_from_db()
+        self.assertEqual(self.jobseeker.first_name, "Synced")
+        self.assertEqual(self.jobseeker.educations.get(id=self.education.id).school, "New Uni")
+        self.assertEqual(sorted(self.jobseeker.educations.values_list("school", flat=True)), ["New Uni", "Night School"])
+        self.assertFalse(self.jobseeker.experiences.exists())
+        self.assertEqual(len(res.data["educations"]), 2)
+
+    def test_blank_start_date_is_a_field_error(self):
+        payload = {"experiences": [{"title": "Dev", "company": "Acme", "start_date": ""}]}
+        res = self.client.put("/api/profile/sync/", payload, format="json")
+        self.assertEqual(res.status_code, 400)
+        self.assertIn("start_date", res.data["experiences"][0])
+        res = self.client.put("/api/profile/sync/", {"educations": [{"school": "Uni"}]}, format="json")
+        self.assertEqual(res.status_code, 400)
+        self.assertIn("start_date", res.data["educations"][0])
+        self.assertEqual(self.jobseeker.experiences.get(), self.experience)
+
+    def test_patch_is_not_allowed(self):
+        res = self.client.patch("/api/profile/sync/", {"educations": [{"school": "X"}]}, format="json")
+        self.assertEqual(res.status_code, 405)
+        self.assertEqual(self.jobseeker.educations.get(), self.education)
+
+    def test_multipart_lists_and_foreign_ids(self):
+        other = make_jobseeker("sync_other")
+        other_education = other.educations.get()
+        res = self.client.put(
+            "/api/profile/sync/",
+            {"first_name": "Multi", "educations": json.dumps([{"id": other_education.id, "school": "Mine", "start_date": "2021-01-01"}])},
+            format="multipart",
+        )
+        self.assertEqual(res.status_code, 200, res.data)
+        other_education.refresh_from_db()
+        self.assertEqual(other_education.school, "Uni")
+        self.assertEqual(list(self.jobseeker.educations.values_list("school", flat=True)), ["Mine"])
+        self.assertTrue(self.jobseeker.experiences.exists())
+
+class AsyncReadEndpointsTest(TestCase):
+    def setUp(self):
+        self.emp_user = User.objects.create_user(username="async_employer", password="abc", account="EMPLOYER")
+        self.employer = Employer.objects.create(user=self.emp_user)
+        self.jobs = [
+            Job.objects.create(employer=self.employer, company="SimplyJobs", title=f"Job {i}", description="Code",
+                               location="Remote", salary=40000, job_type="Full-time")
+            for i in range(3)
+        ]
+        self.jobseeker = make_jobseeker("async_seeker")
+        self.jobseeker.user.set_password("abc")
+        self.jobseeker.user.save()
+        Application.objects.create(job=self.jobs[0], jobseeker=self.jobseeker)
+
+    def auth(self, username):
+        token = self.client.post("/api/token/", {"username": username, "password": "abc"}).data["access"]
+        return {"AUTHORIZATION": f"Bearer {token}"}
+
+    async def test_async_feed_pages_by_keyset(self):
+        headers = await sync_to_async(self.auth)("async_seeker")
+        res = await self.async_client.get("/api/async/jobs/", {"page_size": 2}, headers=headers)
+        self.assertEqual(res.status_code, 200)
+        data = res.json()
+        self.assertEqual([job["title"] for job in data["results"]], ["Job 2", "Job 1"])
+        res = await self.async_client.get(data["next"], headers=headers)
+        self.assertEqual([job["title"] for job in res.json()["results"]], ["Job 0"])
+        self.assertIsNone(res.json()["next"])
+
+    async def test_async_lists_match_sync_endpoints(self):
+        seeker = await sync_to_async(self.auth)("async_seeker")
+        employer = await sync_to_async(self.auth)("async_employer")
+        for url, headers in [
+            ("/api/applied/", seeker),
+            (f"/api/jobs/{self.jobs[0].id}/applicants/", employer),
+            (f"/api/jobs/{self.jobs[0].id}/applicants/?view=summary", employer),
+            ("/api/profile/async_seeker/", seeker),
+        ]:
+            expected = await sync_to_async(self.client.get)(url, headers=headers)
+            res = await self.async_client.get(url.replace("/api/", "/api/async/"), headers=headers)
+            self.assertEqual(res.status_code, 200, url)
+            self.assertEqual(res.json(), expected.json(), url)
+
+    async def test_async_permissions(self):
+        res = await self.async_client.get("/api/async/applied/")
+        self.assertEqual(res.status_code, 401)
+        employer = await sync_to_async(self.auth)("async_employer")
+        res = await self.async_client.get("/api/async/applied/", headers=employer)
+        self.assertEqual(res.status_code, 403)
+
+class ApplicantsExportTest(APITestCase):
+    def setUp(self):
+        self.emp_user = User.objects.create_user(username="export_employer", password="abc", account="EMPLOYER")
+        employer = Employer.objects.create(user=self.emp_user)
+        self.job = Job.objects.create(employer=employer, company="SimplyJobs", title="Developer", description="Code",
+                                      location="Remote", salary=40000, job_type="Full-time")
+        for i in range(3):
+            Application.objects.create(job=self.job, jobseeker=make_jobseeker(f"export{i}", with_history=False),
+                                       status="SHORTLISTED" if i else "PENDING")
+        self.client.force_authenticate(self.emp_user)
+
+    def test_csv_export_streams_filtered_rows(self):
+        res = self.client.get(f"/api/jobs/{self.job.id}/applicants/export.csv", {"status": "SHORTLISTED"})
+        self.assertEqual(res.status_code, 200)
+        self.assertTrue(res.streaming)
+        lines = b"".join(res.streaming_content).decode().splitlines()
+        self.assertEqual(lines[0].split(",")[:4], ["id", "applied_at", "status", "username"])
+        self.assertEqual(sorted(line.split(",")[3] for line in lines[1:]), ["export1", "export2"])
+
+    def test_csv_export_neutralizes_formulas(self):
+        JobSeeker.objects.filter(user__username="export0").update(first_name="=HYPERLINK(\"http://x\")", city="@SUM(A1)",
+                                                                  phone_number="+44 20 7946 0000")
+        res = self.client.get(f"/api/jobs/{self.job.id}/applicants/export.csv", {"status": "PENDING"})
+        row = next(csv.DictReader(b"".join(res.streaming_content).decode().splitlines()))
+        self.assertEqual(row["first_name"], "'=HYPERLINK(\"http://x\")")
+        self.assertEqual(row["city"], "'@SUM(A1)")
+        self.assertEqual(row["phone_number"], "'+44 20 7946 0000")
+        self.assertEqual(row["username"], "export0")
+        # NDJSON is data, not a spreadsheet, so it is left as entered
+        res = self.client.get(f"/api/jobs/{self.job.id}/applicants/export.ndjson", {"status": "PENDING"})
+        self.assertEqual(json.loads(b"".join(res.streaming_content))["city"], "@SUM(A1)")
+
+    def test_ndjson_export(self):
+        res = self.client.get(f"/api/jobs/{self.job.id}/applicants/export.ndjson")
+        rows = [json.loads(line) for line in b"".join(res.streaming_content).decode().splitlines()]
+        self.assertEqual(len(rows), 3)
+        self.assertEqual(rows[0]["email"], "export2@example.com")
+
+    def test_export_is_scoped_to_own_jobs(self):
+        other = User.objects.create_user(username="export_other", password="abc", account="EMPLOYER")
+        Employer.objects.create(user=other)
+        self.client.force_authenticate(other)
+        self.assertEqual(self.client.get(f"/api/jobs/{self.job.id}/applicants/export.csv").status_code, 404)
+        self.client.force_authenticate(self.emp_user)
+        self.assertEqual(self.client.get(f"/api/jobs/{self.job.id}/applicants/export.xml").status_code, 404)
+
+class UploadProcessingTest(TempMediaMixin, APITestCase):
+    def setUp(self):
+        self.jobseeker = make_jobseeker("upload_seeker", with_history=False)
+        self.client.force_authenticate(self.jobseeker.user)
+
+    def upload(self, **files):
+        with self.captureOnCommitCallbacks(execute=True):
+            res = self.client.put("/api/profile/edit/", {"first_name": "Up", **files}, format="multipart")
+        self.assertEqual(res.status_code, 200, res.data)
+        return res
+
+    def test_uploads_are_processed_by_the_worker(self):
+        self.upload(profile_picture=make_png(), resume=make_docx("Python and Django developer"))
+        self.assertEqual(
+            sorted(Task.objects.filter(status=Task.PENDING).values_list("name", flat=True)),
+            ["process_profile_picture", "process_resume"],
+        )
+        self.assertEqual(run_pending(), 2)
+        self.jobseeker.refresh_from_db()
+        self.assertEqual(self.jobseeker.resume_text, "Python and Django developer")
+        self.assertEqual(len(self.jobseeker.resume_checksum), 64)
+        from PIL import Image
+        with Image.open(self.jobseeker.profile_thumbnail.path) as thumbnail:
+            self.assertLessEqual(max(thumbnail.size), 256)
+        self.assertFalse(Task.objects.exclude(status=Task.DONE).exists())
+
+    def test_identical_uploads_share_one_file(self):
+        content = make_docx("Same CV").read()
+        self.upload(resume=SimpleUploadedFile("cv.docx", content))
+        other = make_jobseeker("upload_other", with_history=False)
+        self.client.force_authenticate(other.user)
+        self.upload(resume=SimpleUploadedFile("cv.docx", content))
+        run_pending()
+        self.jobseeker.refresh_from_db()
+        other.refresh_from_db()
+        self.assertEqual(self.jobseeker.resume.name, other.resume.name)
+        self.assertEqual(len(os.listdir(os.path.join(self.media_root, "resumes"))), 1)
+
+    def test_failed_tasks_are_retried_then_marked_failed(self):
+        Task.objects.create(name="process_resume", kwargs={"jobseeker_id": "not-an-id"})
+        with self.assertLogs("jobsearch_app.tasks", "ERROR"):
+            self.assertEqual(run_pending(max_attempts=2), 2)
+        task = Task.objects.get()
+        self.assertEqual((task.status, task.attempts), (Task.FAILED, 2))
+
+    def test_tasks_of_dead_workers_are_reclaimed(self):
+        stale = timezone.now() - datetime.timedelta(hours=1)
+        crashed = Task.objects.create(name="notify_status_changes", status=Task.RUNNING, attempts=1, locked_at=stale)
+        busy = Task.objects.create(name="notify_status_changes", status=Task.RUNNING, attempts=1, locked_at=timezone.now())
+        doomed = Task.objects.create(name="notify_status_changes", status=Task.RUNNING, attempts=3, locked_at=stale)
+        self.assertEqual(run_pending(), 2)
+        crashed.refresh_from_db()
+        self.assertEqual((crashed.status, crashed.attempts, crashed.locked_at), (Task.DONE, 2, None))
+        busy.refresh_from_db()
+        self.assertEqual(busy.status, Task.RUNNING)
+        doomed.refresh_from_db()
+        self.assertEqual((doomed.status, doomed.error), (Task.FAILED, "Lease expired on every attempt."))
+
+    def test_identical_pending_tasks_are_queued_once(self):
+        for _ in range(2):
+            get_broker().enqueue("score_application", {"application_id": 1})
+        get_broker().enqueue("score_application", {"application_id": 2})
+        self.assertEqual(Task.objects.count(), 2)
+        # A failed run going back to PENDING gives way to a twin queued while it ran
+        stale = timezone.now() - datetime.timedelta(hours=1)
+        retried = Task.objects.create(name="process_resume", kwargs={"jobseeker_id": "x"}, status=Task.RUNNING, locked_at=stale)
+        get_broker().enqueue("process_resume", {"jobseeker_id": "x"})
+        with self.assertLogs("jobsearch_app.tasks", "ERROR"):
+            run_pending()
+        twin = Task.objects.get(name="process_resume")
+        self.assertNotEqual(twin.id, retried.id)
+        self.assertEqual(twin.status, Task.FAILED)
+
+    def test_prune_tasks_drops_old_finished_tasks(self):
+        for status in (Task.DONE, Task.FAILED, Task.PENDING):
+            Task.objects.create(name="notify_status_changes", status=status)
+        Task.objects.update(updated_at=timezone.now() - datetime.timedelta(days=8))
+        recent = Task.objects.create(name="notify_status_changes", status=Task.DONE)
+        call_command("prune_tasks", stdout=io.StringIO())
+        self.assertEqual(sorted(Task.objects.values_list("status", flat=True)), [Task.DONE, Task.PENDING])
+        self.assertTrue(Task.objects.filter(id=recent.id).exists())
+
+class CandidateSearchTest(TempMediaMixin, APITestCase):
+    def setUp(self):
+        self.emp_user = User.objects.create_user(username="cand_employer", password="abc", account="EMPLOYER")
+        self.employer = Employer.objects.create(user=self.emp_user)
+        self.job = Job.objects.create(
+            employer=self.employer, company="SimplyJobs", title="Developer",
+            description="Write code", location="Remote", salary=40000, job_type="Full-time"
+        )
+        self.bio_match = make_jobseeker("cand_bio")
+        self.bio_match.bio = "Kubernetes enthusiast"
+        self.bio_match.save()
+        self.experience_match = make_jobseeker("cand_exp")
+        Experience.objects.create(
+            jobseeker=self.experience_match, title="Ops", job_type="Full-time", company="Acme",
+            start_date=datetime.date(2020, 1, 1), description="Ran kubernetes clusters"
+        )
+        outsider = make_jobseeker("cand_outsider")
+        outsider.bio = "Kubernetes expert"
+        outsider.save()
+        for jobseeker in (self.bio_match, self.experience_match, make_jobseeker("cand_none")):
+            Application.objects.create(job=self.job, jobseeker=jobseeker)
+        self.client.force_authenticate(self.emp_user)
+        self.url = f"/api/jobs/{self.job.id}/applicants/search/"
+
+    def search(self, q):
+        res = self.client.get(self.url, {"q": q})
+        self.assertEqual(res.status_code, 200)
+        return [application["jobseeker"]["id"] for application in res.data["results"]]
+
+    def test_ranks_only_this_jobs_applicants(self):
+        self.assertEqual(self.search("kubernetes"), [self.bio_match.id, self.experience_match.id])
+        other = Employer.objects.create(user=User.objects.create_user(username="cand_other", password="abc", account="EMPLOYER"))
+        self.client.force_authenticate(other.user)
+        self.assertEqual(self.search("kubernetes"), [])
+
+    def test_index_follows_profile_and_resume_changes(self):
+        self.client.force_authenticate(self.bio_match.user)
+        experiences = json.dumps([{"title": "Engineer", "job_type": "Full-time", "company": "Acme",
+                                   "start_date": "2021-01-01", "description": "Terraform modules"}])
+        with self.captureOnCommitCallbacks(execute=True):
+            res = self.client.put("/api/profile/sync/", {
+                "first_name": "Bio", "bio": "", "experiences": experiences,
+                "resume": make_docx("Golang microservices"),
+            }, format="multipart")
+        self.assertEqual(res.status_code, 200, res.data)
+        self.client.force_authenticate(self.emp_user)
+        self.assertEqual(self.search("terraform"), [self.bio_match.id])
+        self.assertEqual(self.search("kubernetes"), [self.experience_match.id])
+        self.assertEqual(self.search("golang"), [])
+        run_pending()
+        self.assertEqual(self.search("golang"), [self.bio_match.id])
+
+class MatchScoreTest(APITestCase):
+    def setUp(self):
+        self.emp_user = User.objects.create_user(username="match_employer", password="abc", account="EMPLOYER")
+        self.employer = Employer.objects.create(user=self.emp_user)
+        self.job = Job.objects.create(
+            employer=self.employer, company="SimplyJobs", title="Data Engineer",
+            description="Build Spark pipelines and data warehouses", location="London", salary=60000, job_type="Full-time"
+        )
+        self.engineer = make_jobseeker("match_engineer", with_history=False)
+        Experience.objects.create(
+            jobseeker=self.engineer, title="Data Engineer", job_type="Full-time", company="Acme",
+            start_date=datetime.date(2020, 1, 1), description="Spark pipelines feeding the warehouse"
+        )
+        self.chef = make_jobseeker("match_chef", with_history=False)
+        Experience.objects.create(
+            jobseeker=self.chef, title="Chef", job_type="Part-time", company="Bistro",
+            start_date=datetime.date(2020, 1, 1), description="Cooked dinners"
+        )
+        with self.captureOnCommitCallbacks(execute=True):
+            Application.objects.create(job=self.job, jobseeker=self.chef)
+            Application.objects.create(job=self.job, jobseeker=self.engineer)
+        self.assertEqual(Task.objects.filter(name="score_application").count(), 2)
+        run_pending()
+        self.client.force_authenticate(self.emp_user)
+        self.url = f"/api/jobs/{self.job.id}/applicants/"
+
+    def test_applicants_sort_by_match_score(self):
+        res = self.client.get(self.url, {"ordering": "score"})
+        self.assertEqual([row["jobseeker"]["id"] for row in res.data], [self.engineer.id, self.chef.id])
+        self.assertGreater(res.data[0]["match_score"], 0.3)
+        self.assertLess(res.data[1]["match_score"], 0.1)
+        summary = self.client.get(self.url, {"ordering": "score", "fields": "match_score"})
+        self.assertEqual(summary.data, [{"match_score": row["match_score"]} for row in res.data])
+
+    def test_apply_scores_only_the_new_pair(self):
+        Application.objects.filter(jobseeker=self.engineer).update(match_score=0.5)
+        newcomer = make_jobseeker("match_newcomer", with_history=False)
+        with self.captureOnCommitCallbacks(execute=True):
+            Application.objects.create(job=self.job, jobseeker=newcomer)
+        run_pending()
+        self.assertEqual(Application.objects.get(jobseeker=self.engineer).match_score, 0.5)
+        self.assertTrue(Task.objects.filter(name="score_application", status=Task.DONE).exists())
+
+    def test_scores_follow_profile_and_job_edits(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            Experience.objects.create(
+                jobseeker=self.chef, title="Data Engineer", job_type="Full-time", company="Acme",
+                start_date=datetime.date(2022, 1, 1), description="Spark data warehouses in London"
+            )
+        logged = Change.objects.latest("id").id
+        run_pending()
+        chef = Application.objects.get(jobseeker=self.chef)
+        self.assertGreater(chef.match_score, 0.0)
+        # Score refreshes are logged so ?ordering=score lists pick them up
+        self.assertEqual(
+            list(Change.objects.filter(id__gt=logged).values_list("model", "object_id")),
+            [(Change.APPLICATION, chef.id)],
+        )
+        with self.captureOnCommitCallbacks(execute=True):
+            self.job.description = "Cook dinners"
+            self.job.title = "Chef"
+            self.job.save()
+        run_pending()
+        self.assertEqual(
+            list(Application.objects.order_by("-match_score").values_list("jobseeker_id", flat=True)),
+            [self.chef.id, self.engineer.id],
+        )
+
+class RecommendedJobsTest(APITestCase):
+    def setUp(self):
+        cache.clear()
+        caches["recommendations"].clear()
+        employer = Employer.objects.create(user=User.objects.create_user(username="rec_employer", password="abc", account="EMPLOYER"))
+        self.jobs = {
+            title: Job.objects.create(employer=employer, company="SimplyJobs", title=title, description="Work",
+                                      location=location, salary=40000, job_type=job_type)
+            for title, location, job_type in [
+                ("Staff Nurse", "Leeds", "Full-time"),
+                ("Backend Developer", "Remote", "Contract"),
+                ("Night Nurse", "London", "Part-time"),
+                ("Accountant", "London", "Full-time"),
+            ]
+        }
+        self.jobseeker = make_jobseeker("rec_seeker", with_history=False)
+        self.jobseeker.city = "London"
+        self.jobseeker.save()
+        Experience.objects.create(
+            jobseeker=self.jobseeker, title="Nurse", job_type="Part-time", company="NHS",
+            start_date=datetime.date(2020, 1, 1), description="Ward shifts"
+        )
+        self.client.force_authenticate(self.jobseeker.user)
+
+    def titles(self):
+        res = self.client.get("/api/jobs/recommended/")
+        self.assertEqual(res.status_code, 200)
+        return [job["title"] for job in res.data["results"]]
+
+    def test_ranks_jobs_by_profile_and_hides_applied(self):
+        self.assertEqual(self.titles(), ["Night Nurse", "Staff Nurse", "Accountant", "Backend Developer"])
+        Application.objects.create(job=self.jobs["Night Nurse"], jobseeker=self.jobseeker)
+        self.assertEqual(self.titles()[0], "Staff Nurse")
+
+    def test_ranking_is_cached_until_profile_changes(self):
+        self.titles()
+        with CaptureQueriesContext(connection) as ctx:
+            self.titles()
+        self.assertFalse(any("jobsearch_app_experience" in q["sql"] for q in ctx.captured_queries))
+        Experience.objects.create(
+            jobseeker=self.jobseeker, title="Backend Developer", job_type="Contract", company="Acme",
+            start_date=datetime.date(2023, 1, 1), description="APIs"
+        )
+        self.jobseeker.experiences.filter(title="Nurse").delete()
+        self.assertEqual(self.titles()[0], "Backend Developer")
+
+    def test_employers_cannot_use_it(self):
+        self.client.force_authenticate(User.objects.get(username="rec_employer"))
+        self.assertEqual(self.client.get("/api/jobs/recommended/").status_code, 403)
+
+class MediaServingTest(TempMediaMixin, APITestCase):
+    def setUp(self):
+        self.jobseeker = make_jobseeker("media_seeker", with_history=False)
+        self.jobseeker.resume = SimpleUploadedFile("cv.pdf", b"0123456789" * 10)
+        self.jobseeker.save()
+        self.client.force_authenticate(self.jobseeker.user)
+        self.url = self.client.get(f"/api/profile/{self.jobseeker.user.username}/").data["resume"]
+
+    def test_signed_url_serves_file_with_validators(self):
+        self.assertIn("signature=", self.url)
+        res = self.client.get(self.url)
+        self.assertEqual(res.status_code, 200)
+        self.assertEqual(b"".join(res.streaming_content), b"0123456789" * 10)
+        self.assertEqual(res["Accept-Ranges"], "bytes")
+        again = self.client.get(self.url, HTTP_IF_NONE_MATCH=res["ETag"])
+        self.assertEqual(again.status_code, 304)
+        again = self.client.get(self.url, HTTP_IF_MODIFIED_SINCE=res["Last-Modified"])
+        self.assertEqual(again.status_code, 304)
+
+    def test_tampered_or_expired_links_are_rejected(self):
+        self.assertEqual(self.client.get(self.url.replace("/resumes/", "/profile_pictures/")).status_code, 403)
+        self.assertEqual(self.client.get(self.url.split("?")[0]).status_code, 403)
+        expired = re.sub(r"expires=\d+", "expires=1", self.url)
+        self.assertEqual(self.client.get(expired).status_code, 403)
+
+    def test_only_upload_directories_are_served(self):
+        from .media import signed_query, UPLOAD_PREFIXES
+        from .uploads import FILE_FIELDS
+        for field in FILE_FIELDS:
+            self.assertTrue(JobSeeker._meta.get_field(field).upload_to.startswith(UPLOAD_PREFIXES))
+        # Even a validly signed link can't reach other files
+        with open(os.path.join(self.media_root, "notes.txt"), "w") as f:
+            f.write("private")
+        for name in ("notes.txt", "resumes/../notes.txt"):
+            self.assertEqual(self.client.get(f"/media/{name}?{signed_query(name)}").status_code, 404)
+
+    def test_range_requests(self):
+        res = self.client.get(self.url, HTTP_RANGE="bytes=5-14")
+        self.assertEqual(res.status_code, 206)
+        self.assertEqual(res["Content-Range"], "bytes 5-14/100")
+        self.assertEqual(b"".join(res.streaming_content), b"5678901234")
+        res = self.client.get(self.url, HTTP_RANGE="bytes=-3")
+        self.assertEqual(b"".join(res.streaming_content), b"789")
+        self.assertEqual(self.client.get(self.url, HTTP_RANGE="bytes=200-").status_code, 416)
+        res = self.client.get(self.url, HTTP_RANGE="bytes=0-1", HTTP_IF_RANGE='"stale"')
+        self.assertEqual(res.status_code, 200)
+        self.assertEqual(len(b"".join(res.streaming_content)), 100)
+
+    @override_settings(MEDIA_ACCEL="x-accel-redirect")
+    def test_offloads_to_the_web_server(self):
+        res = self.client.get(self.url)
+        self.assertEqual(res.status_code, 200)
+        self.assertEqual(res["X-Accel-Redirect"], f"/protected-media/{self.jobseeker.resume.name}")
+        self.assertEqual(res.content, b"")
+
+class ContentAddressedStorageTest(TempMediaMixin, APITestCase):
+    def setUp(self):
+        self.first = make_jobseeker("cas_first", with_history=False)
+        self.second = make_jobseeker("cas_second", with_history=False)
+
+    def upload(self, jobseeker, content):
+        self.client.force_authenticate(jobseeker.user)
+        with self.captureOnCommitCallbacks(execute=True):
+            res = self.client.put("/api/profile/edit/", {"resume": SimpleUploadedFile("My CV.docx", content)}, format="multipart")
+        self.assertEqual(res.status_code, 200, res.data)
+        run_pending()
+        jobseeker.refresh_from_db()
+        return jobseeker.resume.name
+
+    def test_files_are_named_by_content(self):
+        content = make_docx("Shared CV").read()
+        checksum = hashlib.sha256(content).hexdigest()
+        name = self.upload(self.first, content)
+        self.assertEqual(name, f"resumes/{checksum}.docx")
+        self.assertEqual(self.upload(self.second, content), name)
+        self.assertEqual((self.first.resume_checksum, self.first.resume_text), (checksum, "Shared CV"))
+
+    def test_replaced_files_are_left_to_gc(self):
+        old, new = make_docx("Old CV").read(), make_docx("New CV").read()
+        shared = self.upload(self.first, old)
+        self.upload(self.second, old)
+        self.upload(self.first, new)
+        self.upload(self.second, new)
+        self.assertTrue(default_storage.exists(shared))
+        os.utime(default_storage.path(shared), (0, 0))
+        call_command("gc_media", stdout=io.StringIO())
+        self.assertFalse(default_storage.exists(shared))
+
+    def test_identical_upload_restarts_the_grace_period(self):
+        # A second upload of bytes already on disk may not be committed yet when gc runs
+        name = default_storage.save("resumes/cv.pdf", io.BytesIO(b"%PDF reused"))
+        os.utime(default_storage.path(name), (0, 0))
+        self.assertEqual(default_storage.save("resumes/again.pdf", io.BytesIO(b"%PDF reused")), name)
+        call_command("gc_media", stdout=io.StringIO())
+        self.assertTrue(default_storage.exists(name))
+
+    def test_gc_removes_orphans_past_the_grace_period(self):
+        kept = self.upload(self.first, make_docx("Kept CV").read())
+        orphan = default_storage.save("resumes/lost.pdf", io.BytesIO(b"%PDF lost"))
+        fresh = default_storage.save("resumes/fresh.pdf", io.BytesIO(b"%PDF fresh"))
+        for name in (kept, orphan):
+            os.utime(default_storage.path(name), (0, 0))
+        out = io.StringIO()
+        call_command("gc_media", "--dry-run", stdout=out)
+        self.assertIn("Would delete 1", out.getvalue())
+        self.assertTrue(default_storage.exists(orphan))
+        call_command("gc_media", stdout=io.StringIO())
+        self.assertFalse(default_storage.exists(orphan))
+        self.assertTrue(default_storage.exists(kept))
+        self.assertTrue(default_storage.exists(fresh))
+
+class JobCounterTest(QueryCountMixin, APITestCase):
+    def setUp(self):
+        self.emp_user = User.objects.create_user(username="count_employer", password="abc", account="EMPLOYER")
+        self.employer = Employer.objects.create(user=self.emp_user)
+        self.job = Job.objects.create(
+            employer=self.employer, company="SimplyJobs", title="Developer",
+            description="Write code", location="Remote", salary=40000, job_type="Full-time"
+        )
+        self.seekers = [make_jobseeker(f"count_seeker{i}", with_history=False) for i in range(3)]
+
+    def counts(self):
+        self.job.refresh_from_db()
+        return (self.job.applicant_count, self.job.pending_count, self.job.shortlisted_count, self.job.rejected_count)
+
+    def test_counters_follow_apply_status_changes_and_withdrawals(self):
+        for jobseeker in self.seekers:
+            self.client.force_authenticate(jobseeker.user)
+            self.assertEqual(self.client.post("/api/jobs/apply/", {"job": self.job.id}).status_code, 201)
+        self.assertEqual(self.counts(), (3, 3, 0, 0))
+        ids = list(Application.objects.order_by("id").values_list("id", flat=True))
+        self.client.force_authenticate(self.emp_user)
+        res = self.client.put("/api/applications/update/", {"application_ids": ids[:2], "status": "SHORTLISTED"}, format="json")
+        self.assertEqual(res.data, {"updated": 2})
+        self.client.put("/api/applications/update/", {"application_ids": ids[1:], "status": "REJECTED"}, format="json")
+        self.assertEqual(self.counts(), (3, 0, 1, 2))
+        self.client.force_authenticate(Application.objects.get(id=ids[2]).jobseeker.user)
+        self.assertEqual(self.client.delete(f"/api/applied/delete/{ids[2]}/").status_code, 204)
+        self.assertEqual(self.counts(), (2, 0, 1, 1))
+        self.seekers[0].delete()
+        self.assertEqual(self.counts(), (1, 0, 0, 1))
+
+    def test_dashboard_lists_counts_in_constant_queries(self):
+        def add_jobs(n):
+            for _ in range(n):
+                job = Job.objects.create(
+                    employer=self.employer, company="SimplyJobs", title="Tester",
+                    description="Test code", location="Remote", salary=40000, job_type="Full-time"
+                )
+                Application.objects.create(job=job, jobseeker=self.seekers[0])
+        self.client.force_authenticate(self.emp_user)
+        self.assertConstantQueries("/api/jobs/dashboard/", add_jobs)
+        res = self.client.get("/api/jobs/dashboard/")
+        self.assertEqual(res.data[0]["applicant_count"], 1)
+        self.assertEqual(res.data[0]["pending_count"], 1)
+        self.assertNotIn("applicant_count", self.client.get("/api/jobs/").data["results"][0])
+
+    def test_repair_command_recomputes_counters(self):
+        Application.objects.create(job=self.job, jobseeker=self.seekers[0], status=Application.SHORTLISTED)
+        Job.objects.filter(pk=self.job.pk).update(applicant_count=7, pending_count=7, shortlisted_count=0)
+        out = io.StringIO()
+        call_command("repair_job_counters", stdout=out)
+        self.assertIn("1 jobs had drifted", out.getvalue())
+        self.assertEqual(self.counts(), (1, 0, 1, 0))
+
+class StatusEventTest(APITestCase):
+    def setUp(self):
+        self.emp_user = User.objects.create_user(username="event_employer", password="abc", account="EMPLOYER")
+        self.job = Job.objects.create(
+            employer=Employer.objects.create(user=self.emp_user), company="SimplyJobs", title="Developer",
+            description="Write code", location="Remote", salary=40000, job_type="Full-time"
+        )
+        self.client.force_authenticate(self.emp_user)
+
+    def add_applications(self, n):
+        start = Application.objects.count()
+        return [
+            Application.objects.create(job=self.job, jobseeker=make_jobseeker(f"event_seeker{start + i}", with_history=False)).id
+            for i in range(n)
+        ]
+
+    def update(self, ids, status):
+        with CaptureQueriesContext(connection) as ctx:
+            res = self.client.put("/api/applications/update/", {"application_ids": ids, "status": status}, format="json")
+        self.assertEqual(res.data, {"updated": len(ids)})
+        return len(ctx)
+
+    def test_bulk_update_records_events_in_constant_queries(self):
+        few = self.update(self.add_applications(2), "SHORTLISTED")
+        many = self.update(self.add_applications(25), "SHORTLISTED")
+        self.assertEqual(few, many)
+        self.assertEqual(ApplicationStatusEvent.objects.count(), 27)
+        # Rows already in the target status don't get an event
+        self.update(list(Application.objects.values_list("id", flat=True)), "SHORTLISTED")
+        self.assertEqual(ApplicationStatusEvent.objects.count(), 27)
+
+    def test_events_are_emailed_once_and_listed_for_the_jobseeker(self):
+        ids = self.add_applications(2)
+        with self.captureOnCommitCallbacks(execute=True):
+            self.update(ids, "SHORTLISTED")
+        with self.captureOnCommitCallbacks(execute=True):
+            self.update(ids[:1], "REJECTED")
+        self.assertEqual(Task.objects.filter(name="notify_status_changes").count(), 1)
+        run_pending()
+        self.assertEqual(len(mail.outbox), 3)
+        self.assertIn("Developer at SimplyJobs is now rejected", mail.outbox[-1].body)
+        self.assertFalse(ApplicationStatusEvent.objects.filter(notified_at__isnull=True).exists())
+        application = Application.objects.get(id=ids[0])
+        self.client.force_authenticate(application.jobseeker.user)
+        res = self.client.get(f"/api/applied/{ids[0]}/history/")
+        self.assertEqual([(e["old_status"], e["new_status"]) for e in res.data], [("SHORTLISTED", "REJECTED"), ("PENDING", "SHORTLISTED")])
+        self.assertEqual(self.client.get(f"/api/applied/{ids[1]}/history/").data, [])
+
+class ChangeFeedTest(APITestCase):
+    def setUp(self):
+        self.emp_user = User.objects.create_user(username="changes_employer", password="abc", account="EMPLOYER")
+        self.job = Job.objects.create(
+            employer=Employer.objects.create(user=self.emp_user), company="SimplyJobs", title="Developer",
+            description="Write code", location="Remote", salary=40000, job_type="Full-time"
+        )
+        self.seekers = [make_jobseeker(f"changes_seeker{i}", with_history=False) for i in range(3)]
+        self.seekers[0].user.set_password("abc")
+        self.seekers[0].user.save()
+        self.applications = [Application.objects.create(job=self.job, jobseeker=seeker) for seeker in self.seekers[:2]]
+        self.url = f"/api/jobs/{self.job.id}/applicants/changes/"
+
+    def sync(self, url, since=None, **params):
+        if since is not None:
+            params["since"] = since
+        res = self.client.get(url, params)
+        self.assertEqual(res.status_code, 200, res.data)
+        return res.data
+
+    def test_applicant_deltas_carry_only_what_changed(self):
+        self.client.force_authenticate(self.emp_user)
+        snapshot = self.sync(self.url)
+        self.assertEqual((len(snapshot["changed"]), snapshot["reset"]), (2, True))
+        self.assertEqual(self.sync(self.url, snapshot["token"])["changed"], [])
+        self.client.put("/api/applications/update/", {"application_ids": [self.applications[0].id], "status": "SHORTLISTED"}, format="json")
+        added = Application.objects.create(job=self.job, jobseeker=self.seekers[2])
+        withdrawn = self.applications[1].id
+        self.applications[1].delete()
+        with CaptureQueriesContext(connection) as ctx:
+            delta = self.sync(self.url, snapshot["token"])
+        self.assertEqual(sorted(app["id"] for app in delta["changed"]), [self.applications[0].id, added.id])
+        self.assertEqual(delta["deleted"], [withdrawn])
+        # profile, ownership, log bounds, log entries, applications + two prefetches
+        self.assertEqual(len(ctx), 7)
+        self.assertFalse(delta["reset"])
+        self.assertEqual(self.sync(self.url, delta["token"])["changed"], [])
+        self.assertEqual(self.client.get(self.url, {"since": "abc"}).status_code, 400)
+        other = User.objects.create_user(username="changes_other", account="EMPLOYER")
+        Employer.objects.create(user=other)
+        self.client.force_authenticate(other)
+        self.assertEqual(self.client.get(self.url).status_code, 404)
+
+    def test_applied_feed_follows_job_edits_and_resets_pruned_tokens(self):
+        self.client.force_authenticate(self.seekers[0].user)
+        token = self.sync("/api/applied/changes/")["token"]
+        self.job.title = "Senior Developer"
+        self.job.save()
+        delta = self.sync("/api/applied/changes/", token)
+        self.assertEqual([app["job"]["title"] for app in delta["changed"]], ["Senior Developer"])
+        Application.objects.create(job=self.job, jobseeker=self.seekers[2])
+        Change.objects.update(created_at=timezone.now() - datetime.timedelta(days=30))
+        call_command("prune_changes", stdout=io.StringIO())
+        self.assertEqual(Change.objects.count(), 1)
+        delta = self.sync("/api/applied/changes/", token)
+        self.assertTrue(delta["reset"])
+        self.assertEqual(len(delta["changed"]), 1)
+
+    @override_settings(CHANGE_FEED_COMMIT_LAG=5)
+    def test_tokens_stop_short_of_entries_that_may_still_commit_out_of_order(self):
+        self.client.force_authenticate(self.emp_user)
+        Change.objects.update(created_at=timezone.now() - datetime.timedelta(minutes=1))
+        snapshot = self.sync(self.url)
+        added = Application.objects.create(job=self.job, jobseeker=self.seekers[2])
+        # Too recent to be sure no lower id is still uncommitted: held back, token unchanged
+        delta = self.sync(self.url, snapshot["token"])
+        self.assertEqual((delta["changed"], delta["token"]), ([], snapshot["token"]))
+        Change.objects.filter(object_id=added.id).update(created_at=timezone.now() - datetime.timedelta(minutes=1))
+        delta = self.sync(self.url, snapshot["token"])
+        self.assertEqual([app["id"] for app in delta["changed"]], [added.id])
+        self.assertGreater(delta["token"], snapshot["token"])
+
+    @override_settings(CHANGE_FEED_POLL_INTERVAL=0.05, CHANGE_STREAM_MAX_AGE=0.3)
+    async def test_async_feed_long_polls_and_streams(self):
+        token = (await sync_to_async(self.client.post)("/api/token/", {"username": "changes_seeker0", "password": "abc"})).data["access"]
+        headers = {"AUTHORIZATION": f"Bearer {token}"}
+        url = "/api/async/applied/changes/"
+        snapshot = (await self.async_client.get(url, headers=headers)).json()
+        res = await self.async_client.get(url, {"since": snapshot["token"], "wait": 0.2}, headers=headers)
+        self.assertEqual(res.json()["changed"], [])
+        self.job.title = "Lead"
+        await sync_to_async(self.job.save)()
+        res = await self.async_client.get(url, {"since": snapshot["token"], "wait": 5}, headers=headers)
+        self.assertEqual(res.json()["changed"][0]["job"]["title"], "Lead")
+        res = await self.async_client.get(url, headers={**headers, "Accept": "text/event-stream", "Last-Event-ID": snapshot["token"]})
+        self.assertEqual(res["Content-Type"], "text/event-stream")
+        body = b"".join([chunk async for chunk in res.streaming_content]).decode()
+        self.assertTrue(body.startswith("id: "))
+        self.assertIn("event: changes", body)
+        self.assertIn('"title": "Lead"', body)
+
+class ApplyTest(APITestCase):
+    def setUp(self):
+        employer = Employer.objects.create(user=User.objects.create_user(username="apply_employer", password="abc", account="EMPLOYER"))
+        self.job = Job.objects.create(
+            employer=employer, company="SimplyJobs", title="Developer",
+            description="Write code", location="Remote", salary=40000, job_type="Full-time"
+        )
+        self.jobseeker = make_jobseeker("apply_seeker", with_history=False)
+        self.client.force_authenticate(self.jobseeker.user)
+
+    def test_duplicate_apply_is_rejected_by_the_constraint(self):
+        with CaptureQueriesContext(connection) as ctx:
+            with self.captureOnCommitCallbacks(execute=True):
+                res = self.client.post("/api/jobs/apply/", {"job": self.job.id})
+        self.assertEqual(res.status_code, 201)
+        self.assertEqual(res.data["job"], self.job.id)
+        # profile, then the application, its change log entry, the job's counters and the
+        # scoring task: no lookups
+        statements = [q["sql"].split()[0] for q in ctx.captured_queries if not q["sql"].startswith(("SAVEPOINT", "RELEASE"))]
+        self.assertEqual(statements, ["SELECT", "INSERT", "INSERT", "UPDATE", "INSERT"])
+        res = self.client.post("/api/jobs/apply/", {"job": self.job.id})
+        self.assertEqual(res.status_code, 400)
+        self.assertEqual(res.data, ["You have already applied to this job."])
+        self.job.refresh_from_db()
+        self.assertEqual(self.job.applicant_count, 1)
+
+    def test_invalid_jobs_are_rejected(self):
+        self.assertEqual(self.client.post("/api/jobs/apply/", {"job": self.job.id + 100}).data, {"job": ["Job not found."]})
+        self.assertEqual(self.client.post("/api/jobs/apply/", {"job": "abc"}).status_code, 400)
+        self.assertEqual(self.client.post("/api/jobs/apply/", {}).status_code, 400)
+        self.assertFalse(Change.objects.filter(jobseeker_id=self.jobseeker.id).exists())
+
+    def test_other_integrity_errors_are_not_already_applied(self):
+        def fail(**kwargs):
+            raise IntegrityError("from a signal handler")
+        post_save.connect(fail, sender=Application)
+        try:
+            with self.assertRaises(IntegrityError):
+                apply_to_job(self.jobseeker, self.job.id)
+        finally:
+            post_save.disconnect(fail, sender=Application)
+        self.assertFalse(Application.objects.exists())
+
+class ConcurrentApplyTest(TransactionTestCase):
+    # Real threads with their own connections, so the unique constraint is what
+    # separates the winner from the double-taps
+    def test_parallel_double_taps_create_one_application(self):
+        employer = Employer.objects.create(user=User.objects.create_user(username="race_employer", account="EMPLOYER"))
+        job = Job.objects.create(
+            employer=employer, company="SimplyJobs", title="Developer",
+            description="Write code", location="Remote", salary=40000, job_type="Full-time"
+        )
+        jobseeker = make_jobseeker("race_seeker", with_history=False)
+        barrier = threading.Barrier(8)
+
+        def apply(_):
+            client = APIClient()
+            client.force_authenticate(jobseeker.user)
+            barrier.wait()
+            try:
+                return client.post("/api/jobs/apply/", {"job": job.id}).status_code
+            finally:
+                connections.close_all()
+
+        with ThreadPoolExecutor(max_workers=8) as pool:
+            statuses = sorted(pool.map(apply, range(8)))
+        self.assertEqual(statuses, [201] + [400] * 7)
+        job.refresh_from_db()
+        self.assertEqual((Application.objects.count(), job.applicant_count), (1, 1))
+
+class BenchmarkSuiteTest(TestCase):
+    def test_seed_and_benchmark_every_endpoint_against_a_baseline(self):
+        call_command("seed_data", employers=2, jobs=12, jobseekers=10, applications=40, stdout=io.StringIO())
+        self.assertEqual(Application.objects.count(), 40)
+        self.assertEqual(sum(Job.objects.values_list("applicant_count", flat=True)), 40)
+        self.assertTrue(Experience.objects.exists())
+        baseline = os.path.join(tempfile.mkdtemp(), "baseline.json")
+        self.addCleanup(shutil.rmtree, os.path.dirname(baseline))
+        out, err = io.StringIO(), io.StringIO()
+        call_command("benchmark_api", iterations=1, save_baseline=baseline, stdout=out, stderr=err)
+        # Every route has a scenario and none of them failed
+        self.assertEqual(err.getvalue(), "")
+        with open(baseline) as f:
+            results = json.load(f)
+        self.assertIn("queries", results["update-applications"])
+        # Writes were rolled back
+        self.assertEqual((Application.objects.count(), Job.objects.count()), (40, 12))
+        self.assertFalse(ApplicationStatusEvent.objects.exists())
+        results["job-dashboard"]["queries"] -= 1
+        with open(baseline, "w") as f:
+            json.dump(results, f)
+        with self.assertRaisesMessage(CommandError, "job-dashboard"):
+            call_command("benchmark_api", iterations=1, baseline=baseline, queries_only=True, endpoints=["dashboard"], stdout=io.StringIO())
+
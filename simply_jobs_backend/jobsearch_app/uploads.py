@@ -0,0 +1,82 @@
+import hashlib
+import io
+import os
+import zipfile
+from xml.etree import ElementTree
+from django.core.files.base import ContentFile
+from PIL import Image
+from .models import JobSeeker
+from .media import content_hash
+from .tasks import task, enqueue
+
+THUMBNAIL_SIZE = (256, 256)
+# JobSeeker file fields; a stored file stays on disk while any of them names it.
+# Replaced files are never deleted here: an identical upload may be about to reuse the
+# name, so `manage.py gc_media` removes them once they are unreferenced and old enough.
+FILE_FIELDS = ['resume', 'profile_picture', 'profile_thumbnail']
+
+def file_checksum(field_file):
+    # Content-addressed names already are the checksum; older uploads are hashed
+    checksum = content_hash(field_file.name)
+    if checksum:
+        return checksum
+    digest = hashlib.sha256()
+    with field_file.open('rb') as f:
+        for chunk in f.chunks():
+            digest.update(chunk)
+    return digest.hexdigest()
+
+def extract_text(field_file):
+    extension = os.path.splitext(field_file.name)[1].lower()
+    with field_file.open('rb') as f:
+        data = f.read()
+    if extension == '.docx':
+        with zipfile.ZipFile(io.BytesIO(data)) as archive:
+            root = ElementTree.fromstring(archive.read('word/document.xml'))
+        namespace = '{http://schemas.openxmlformats.org/wordprocessingml/2006/main}'
+        return '\n'.join(
+            ''.join(node.text or '' for node in paragraph.iter(f'{namespace}t'))
+            for paragraph in root.iter(f'{namespace}p')
+        ).strip()
+    if extension == '.pdf':
+        from pypdf import PdfReader
+        reader = PdfReader(io.BytesIO(data))
+        return '\n'.join(page.extract_text() or '' for page in reader.pages).strip()
+    return ''
+
+@task
+def process_profile_picture(jobseeker_id):
+    jobseeker = JobSeeker.objects.filter(pk=jobseeker_id).first()
+    if jobseeker is None or not jobseeker.profile_picture:
+        return
+    checksum = file_checksum(jobseeker.profile_picture)
+    with jobseeker.profile_picture.open('rb') as f:
+        image = Image.open(f)
+        image.thumbnail(THUMBNAIL_SIZE)
+        buffer = io.BytesIO()
+        image.convert('RGB').save(buffer, format='JPEG', quality=85)
+    jobseeker.profile_thumbnail.save('thumbnail.jpg', ContentFile(buffer.getvalue()), save=False)
+    jobseeker.profile_picture_checksum = checksum
+    jobseeker.save(update_fields=['profile_picture_checksum', 'profile_thumbnail'])
+
+@task
+def process_resume(jobseeker_id):
+    jobseeker = JobSeeker.objects.filter(pk=jobseeker_id).first()
+    if jobseeker is None or not jobseeker.resume:
+        return
+    jobseeker.resume_checksum = file_checksum(jobseeker.resume)
+    jobseeker.resume_text = extract_text(jobseeker.resume)
+    jobseeker.save(update_fields=['resume_checksum', 'resume_text'])
+
+def enqueue_upload_processing(jobseeker, changed_fields):
+    # Called by the profile views after a save; changed_fields are the validated field names
+    if 'profile_picture' in changed_fields:
+        if jobseeker.profile_picture:
+            enqueue('process_profile_picture', jobseeker_id=jobseeker.pk)
+        else:
+            JobSeeker.objects.filter(pk=jobseeker.pk).update(profile_picture_checksum='', profile_thumbnail='')
+    if 'resume' in changed_fields:
+        if jobseeker.resume:
+            enqueue('process_resume', jobseeker_id=jobseeker.pk)
+        else:
+            JobSeeker.objects.filter(pk=jobseeker.pk).update(resume_checksum='', resume_text='')
@@ -1,20 +1,37 @@
 from django.urls import path
-from . import views
+from . import views, async_views
 
 urlpatterns = [
     path("jobs/", views.CreateJobView.as_view(), name="job-list"),
+    path("jobs/feed/", views.UnseenJobsView.as_view(), name="job-feed"),
+    path("jobs/recommended/", views.RecommendedJobsView.as_view(), name="job-recommended"),
+    path("jobs/dashboard/", views.EmployerDashboardView.as_view(), name="job-dashboard"),
+    path("jobs/search/", views.JobSearchView.as_view(), name="job-search"),
     path("jobs/delete/<int:pk>/", views.DeleteJobView.as_view(), name="delete-job"),
     path("jobs/apply/", views.ApplyToJobView.as_view(), name="apply-to-job"),
     path("token/", views.MyTokenObtainPairView.as_view(), name="get_token"),
     path("profile/edit/", views.EditProfile.as_view(), name="edit-profile"),
+    path("profile/sync/", views.ProfileSyncView.as_view(), name="profile-sync"),
     path("profile/<str:username>/", views.ProfileView.as_view(), name="profile-detail"),
     path("jobs/<int:job_id>/applicants/", views.ApplicantsListView.as_view(), name="job-applicants"),
+    path("jobs/<int:job_id>/applicants/changes/", views.ApplicantChangesView.as_view(), name="job-applicant-changes"),
+    path("jobs/<int:job_id>/applicants/search/", views.CandidateSearchView.as_view(), name="job-applicants-search"),
+    path("jobs/<int:job_id>/applicants/export.<str:fmt>", views.ApplicantsExportView.as_view(), name="job-applicants-export"),
     path("applications/update/", views.UpdateApplicationStatusView.as_view(), name="update-applications"),
     path("applied/", views.AppliedJobsView.as_view(), name='applied-jobs'),
+    path("applied/changes/", views.AppliedChangesView.as_view(), name="applied-changes"),
     path("applied/delete/<int:pk>/", views.DeleteApplicationView.as_view(), name="delete-application"),
+    path("applied/<int:pk>/history/", views.ApplicationStatusHistoryView.as_view(), name="application-history"),
     path("educations/", views.AddEducationView.as_view(), name="education-list"),
     path("educations/<int:pk>/", views.EducationDetailView.as_view(), name="education-detail"),
     path("experiences/", views.AddExperienceView.as_view(), name="experience-list"),
     path("experiences/<int:pk>/", views.ExperienceDetailView.as_view(), name="experience-detail"),
     path('tutorial_seen/', views.SetTutorialSeenView.as_view(), name='tutorial-seen'),
+    # Async variants of the read-heavy endpoints, for ASGI deployments
+    path("async/jobs/", async_views.job_feed, name="async-job-list"),
+    path("async/jobs/<int:job_id>/applicants/", async_views.job_applicants, name="async-job-applicants"),
+    path("async/jobs/<int:job_id>/applicants/changes/", async_views.job_applicant_changes, name="async-job-applicant-changes"),
+    path("async/applied/", async_views.applied_jobs, name="async-applied-jobs"),
+    path("async/applied/changes/", async_views.applied_changes, name="async-applied-changes"),
+    path("async/profile/<str:username>/", async_views.profile_detail, name="async-profile-detail"),
 ]
\ No newline at end of file
@@ -1,15 +1,34 @@
+import csv
+import itertools
+import json
 from django.shortcuts import render
+from django.core.serializers.json import DjangoJSONEncoder
+from django.http import StreamingHttpResponse
+from django.db import transaction
+from django.db.models import Exists, OuterRef
 from rest_framework import viewsets, generics, status
 from rest_framework.permissions import AllowAny, IsAuthenticated
-from rest_framework.exceptions import ValidationError
 from .models import *
 from .serializers import *
+# After the star imports, which would otherwise shadow it with Django's ValidationError
+from rest_framework.exceptions import ValidationError, NotFound
 from django_filters import rest_framework as filters
 from rest_framework.response import Response
 from rest_framework_simplejwt.views import TokenObtainPairView
 from .serializers import MyTokenObtainPairSerializer
 from rest_framework.permissions import BasePermission
 from .permissions import IsJobseeker, IsEmployer
+from .authentication import StatelessProfileJWTAuthentication
+from .profiles import get_profile, get_jobseeker, get_employer
+from .pagination import JobCursorPagination, JobSearchPagination
+from .search import get_search_backend
+from .cache import CachedFeedMixin
+from .filters import JobFilter
+from .uploads import enqueue_upload_processing
+from .recommendations import get_recommendations, RecommendedJobs
+from .counters import update_statuses
+from .applications import apply_to_job, AlreadyApplied
+from .changes import ChangeFeed, parse_token
 from rest_framework.views import APIView
 from rest_framework.decorators import api_view, permission_classes
 
@@ -46,69 +65,140 @@ class JobSeekerViewSet(viewsets.ModelViewSet):
     queryset = JobSeeker.objects.all()
     permission_classes = [AllowAny]
 
-class CreateJobView(generics.ListCreateAPIView):
+class CreateJobView(CachedFeedMixin, generics.ListCreateAPIView):
     serializer_class = JobSerializer
     permission_classes = [IsAuthenticated]
+    authentication_classes = [StatelessProfileJWTAuthentication]
     filter_backends = (filters.DjangoFilterBackend,)
-    filterset_fields = ['company', 'job_type', 'location', 'salary']
+    filterset_class = JobFilter
+    pagination_class = JobCursorPagination
+
+    def get_feed_scope(self):
+        # Employers see only their own postings, so they get their own cache entries
+        employer = get_employer(self.request)
+        return f'employer:{employer.pk}' if employer is not None else 'public'
 
     def get_queryset(self):
-        user = self.request.user
-        if hasattr(user, 'employer'):
-            return Job.objects.filter(employer=user.employer)
+        employer = get_employer(self.request)
+        if employer is not None:
+            return Job.objects.filter(employer=employer)
         return Job.objects.all()
 
     def perform_create(self, serializer):
-        user = self.request.user
-        employer_profile = getattr(user, 'employer', None)
-        if employer_profile is None:
+        employer = get_employer(self.request)
+        if employer is None:
             raise ValidationError("Only employer users can create jobs.")
-        serializer.save(employer=employer_profile)
+        serializer.save(employer=employer)
+
+class UnseenJobsView(generics.ListAPIView):
+    # Swipe-stack feed: the next page of jobs the caller has not applied to yet
+    serializer_class = JobSerializer
+    permission_classes = [IsAuthenticated, IsJobseeker]
+    authentication_classes = [StatelessProfileJWTAuthentication]
+    filter_backends = (filters.DjangoFilterBackend,)
+    filterset_class = JobFilter
+    pagination_class = JobCursorPagination
+
+    def get_queryset(self):
+        # NOT EXISTS anti-join, answered per row by the (job, jobseeker) unique index
+        applied = Application.objects.filter(job=OuterRef('pk'), jobseeker=get_jobseeker(self.request))
+        return Job.objects.filter(~Exists(applied))
+
+class RecommendedJobsView(generics.ListAPIView):
+    # Personalized feed: pages through the jobseeker's cached ranking, see recommendations.py
+    serializer_class = JobSerializer
+    permission_classes = [IsAuthenticated, IsJobseeker]
+    authentication_classes = [StatelessProfileJWTAuthentication]
+    pagination_class = JobSearchPagination
+
+    def get_queryset(self):
+        jobseeker = get_jobseeker(self.request)
+        return RecommendedJobs(get_recommendations(jobseeker), jobseeker)
+
+class JobSearchView(generics.ListAPIView):
+    serializer_class = JobSerializer
+    permission_classes = [IsAuthenticated]
+    authentication_classes = [StatelessProfileJWTAuthentication]
+    pagination_class = JobSearchPagination
+
+    def get_queryset(self):
+        query = self.request.query_params.get('q', '')
+        return get_search_backend().search(query)
+
+class EmployerDashboardView(generics.ListAPIView):
+    # Every job of the employer with its applicant counters, in one query
+    serializer_class = JobDashboardSerializer
+    permission_classes = [IsAuthenticated, IsEmployer]
+    authentication_classes = [StatelessProfileJWTAuthentication]
+
+    def get_queryset(self):
+        return Job.objects.filter(employer=get_employer(self.request)).order_by('-created_at', '-id')
 
 class DeleteJobView(generics.DestroyAPIView):
     serializer_class = JobSerializer
     permission_classes = [IsAuthenticated, IsEmployer]
 
     def get_queryset(self):
-        user = self.request.user
-        if hasattr(user, 'employer'):
-            return Job.objects.filter(employer=user.employer)
+        employer = get_employer(self.request)
+        if employer is not None:
+            return Job.objects.filter(employer=employer)
         return Job.objects.none()
 
 class EditProfile(generics.RetrieveUpdateAPIView):
     serializer_class = JobSeekerSerializer
     permission_classes = [IsAuthenticated, IsJobseeker]
+    authentication_classes = [StatelessProfileJWTAuthentication]
 
     def get_object(self):
-        user = self.request.user
-        if not hasattr(user, 'jobseeker'):
+        jobseeker = get_jobseeker(self.request)
+        if jobseeker is None:
             raise ValidationError("User is not a jobseeker.")
-        return user.jobseeker
+        # One joined query for the profile and username instead of filling in the
+        # claims-only instance field by field
+        return JobSeekerSerializer.setup_eager_loading(JobSeeker.objects.filter(pk=jobseeker.pk)).get()
+
+    def perform_update(self, serializer):
+        jobseeker = serializer.save()
+        enqueue_upload_processing(jobseeker, serializer.validated_data)
+
+class ProfileSyncView(generics.UpdateAPIView):
+    # Saves the whole EditProfile form in one request, see ProfileSyncSerializer. PUT only:
+    # a PATCH would run the nested row serializers as partial and skip required start dates.
+    serializer_class = ProfileSyncSerializer
+    permission_classes = [IsAuthenticated, IsJobseeker]
+    http_method_names = ['put', 'options']
+
+    def get_object(self):
+        return get_jobseeker(self.request)
+
+    def perform_update(self, serializer):
+        jobseeker = serializer.save()
+        enqueue_upload_processing(jobseeker, serializer.validated_data)
 
 class AddEducationView(generics.ListCreateAPIView):
     serializer_class = EducationSerializer
     permission_classes = [IsAuthenticated, IsJobseeker]
 
     def get_queryset(self):
-        user = self.request.user
-        if hasattr(user, 'jobseeker'):
-            return Education.objects.filter(jobseeker=user.jobseeker)
+        jobseeker = get_jobseeker(self.request)
+        if jobseeker is not None:
+            return Education.objects.filter(jobseeker=jobseeker)
         return Education.objects.none()
 
     def perform_create(self, serializer):
-        user = self.request.user
-        if not hasattr(user, 'jobseeker'):
+        jobseeker = get_jobseeker(self.request)
+        if jobseeker is None:
             raise ValidationError("Only jobseekers can add education.")
-        serializer.save(jobseeker=user.jobseeker)
+        serializer.save(jobseeker=jobseeker)
 
 class EducationDetailView(generics.RetrieveUpdateDestroyAPIView):
     serializer_class = EducationSerializer
     permission_classes = [IsAuthenticated, IsJobseeker]
 
     def get_queryset(self):
-        user = self.request.user
-        if hasattr(user, 'jobseeker'):
-            return Education.objects.filter(jobseeker=user.jobseeker)
+        jobseeker = get_jobseeker(self.request)
+        if jobseeker is not None:
+            return Education.objects.filter(jobseeker=jobseeker)
         return Education.objects.none()
 
 class AddExperienceView(generics.ListCreateAPIView):
@@ -116,59 +206,186 @@ class AddExperienceView(generics.ListCreateAPIView):
     permission_classes = [IsAuthenticated, IsJobseeker]
 
     def get_queryset(self):
-        user = self.request.user
-        if hasattr(user, 'jobseeker'):
-            return Experience.objects.filter(jobseeker=user.jobseeker)
+        jobseeker = get_jobseeker(self.request)
+        if jobseeker is not None:
+            return Experience.objects.filter(jobseeker=jobseeker)
         return Experience.objects.none()
 
     def perform_create(self, serializer):
-        user = self.request.user
-        if not hasattr(user, 'jobseeker'):
+        jobseeker = get_jobseeker(self.request)
+        if jobseeker is None:
             raise ValidationError("Only jobseekers can add experience.")
-        serializer.save(jobseeker=user.jobseeker)
+        serializer.save(jobseeker=jobseeker)
 
 class ExperienceDetailView(generics.RetrieveUpdateDestroyAPIView):
     serializer_class = ExperienceSerializer
     permission_classes = [IsAuthenticated, IsJobseeker]
 
     def get_queryset(self):
-        user = self.request.user
-        if hasattr(user, 'jobseeker'):
-            return Experience.objects.filter(jobseeker=user.jobseeker)
+        jobseeker = get_jobseeker(self.request)
+        if jobseeker is not None:
+            return Experience.objects.filter(jobseeker=jobseeker)
         return Experience.objects.none()
 
 class ProfileView(generics.RetrieveAPIView):
-    queryset = JobSeeker.objects.all()
+    queryset = JobSeekerSerializer.setup_eager_loading(JobSeeker.objects.all())
     lookup_field = 'user__username'
     lookup_url_kwarg = 'username'
     serializer_class = JobSeekerSerializer
     permission_classes = [IsAuthenticated]
 
 class ApplyToJobView(generics.CreateAPIView):
-    serializer_class = ApplicationSerializer
+    serializer_class = AppliedSerializer
     permission_classes = [IsAuthenticated, IsJobseeker]
 
     def perform_create(self, serializer):
-        user = self.request.user
-        if not hasattr(user, 'jobseeker'):
+        jobseeker = get_jobseeker(self.request)
+        if jobseeker is None:
             raise ValidationError("Only jobseekers can apply to jobs.")
-        job_id = self.request.data.get('job')
-        job = Job.objects.filter(id=job_id).first()
-        if Application.objects.filter(job=job, jobseeker=user.jobseeker).exists():
+        try:
+            job_id = int(self.request.data.get('job'))
+        except (TypeError, ValueError):
+            raise ValidationError({"job": ["A valid job id is required."]})
+        try:
+            serializer.instance = apply_to_job(jobseeker, job_id)
+        except Job.DoesNotExist:
+            raise ValidationError({"job": ["Job not found."]})
+        except AlreadyApplied:
             raise ValidationError("You have already applied to this job.")
-        serializer.save(job=job, jobseeker=user.jobseeker)
 
 class ApplicantsListView(generics.ListAPIView):
     serializer_class = ApplicationSerializer
     permission_classes = [IsAuthenticated, IsEmployer]
+    authentication_classes = [StatelessProfileJWTAuthentication]
+
+    def summary_fields(self):
+        # ?view=summary or ?fields=a,b switches to the compact projection; None means full rows
+        params = self.request.query_params
+        if params.get('view') != 'summary' and 'fields' not in params:
+            return None
+        return ApplicationSummarySerializer.parse_fields(params.get('fields'))
+
+    def get_serializer_class(self):
+        if self.summary_fields() is not None:
+            return ApplicationSummarySerializer
+        return ApplicationSerializer
+
+    def get_serializer(self, *args, **kwargs):
+        fields = self.summary_fields()
+        if fields is not None:
+            kwargs['fields'] = fields
+        return super().get_serializer(*args, **kwargs)
 
     def get_queryset(self):
         job_id = self.kwargs.get('job_id')
         status = self.request.query_params.get('status', None)
-        qs = Application.objects.filter(job_id=job_id, job__employer__user=self.request.user)
+        qs = Application.objects.filter(job_id=job_id, job__employer=get_employer(self.request))
         if status:
             qs = qs.filter(status=status)
-        return qs
+        qs = ApplicationSerializer.order_applicants(qs, self.request.query_params.get('ordering'))
+        fields = self.summary_fields()
+        if fields is not None:
+            return ApplicationSummarySerializer.setup_projection(qs, fields)
+        return ApplicationSerializer.setup_eager_loading(qs)
+
+class CandidateSearchView(generics.ListAPIView):
+    # Ranked full-text search over one job's applicants (bio, experience, resume text)
+    serializer_class = ApplicationSerializer
+    permission_classes = [IsAuthenticated, IsEmployer]
+    authentication_classes = [StatelessProfileJWTAuthentication]
+    pagination_class = JobSearchPagination
+
+    def get_queryset(self):
+        qs = Application.objects.filter(job_id=self.kwargs.get('job_id'), job__employer=get_employer(self.request))
+        status = self.request.query_params.get('status')
+        if status:
+            qs = qs.filter(status=status)
+        query = self.request.query_params.get('q', '')
+        return get_search_backend().search_candidates(query, ApplicationSerializer.setup_eager_loading(qs))
+
+class Echo:
+    # File-like object for csv.writer that hands each row back instead of buffering it
+    def write(self, value):
+        return value
+
+# Spreadsheets run cells starting with these as formulas
+FORMULA_PREFIXES = ('=', '+', '-', '@', '\t', '\r')
+
+def csv_cell(value):
+    # Applicant-entered text is quoted with a leading ' so it opens as plain text
+    if isinstance(value, str) and value.startswith(FORMULA_PREFIXES):
+        return "'" + value
+    return value
+
+class ApplicantsExportView(APIView):
+    permission_classes = [IsAuthenticated, IsEmployer]
+    authentication_classes = [StatelessProfileJWTAuthentication]
+    columns = [
+        ('id', 'id'),
+        ('applied_at', 'applied_at'),
+        ('status', 'status'),
+        ('username', 'jobseeker__user__username'),
+        ('first_name', 'jobseeker__first_name'),
+        ('last_name', 'jobseeker__last_name'),
+        ('email', 'jobseeker__email'),
+        ('phone_number', 'jobseeker__phone_number'),
+        ('city', 'jobseeker__city'),
+        ('country', 'jobseeker__country'),
+    ]
+    chunk_size = 2000
+
+    def get(self, request, job_id, fmt):
+        if fmt not in ('csv', 'ndjson'):
+            return Response({"detail": "Format must be csv or ndjson."}, status=404)
+        if not Job.objects.filter(id=job_id, employer=get_employer(request)).exists():
+            return Response({"detail": "Not found."}, status=404)
+        qs = Application.objects.filter(job_id=job_id)
+        status = request.query_params.get('status')
+        if status:
+            qs = qs.filter(status=status)
+        # Rows are read from the cursor in chunks and written out as they arrive,
+        # so memory stays flat however many applicants the job has
+        rows = qs.values_list(*[source for _, source in self.columns]).iterator(chunk_size=self.chunk_size)
+        header = [name for name, _ in self.columns]
+        if fmt == 'csv':
+            writer = csv.writer(Echo())
+            lines = itertools.chain([writer.writerow(header)], (writer.writerow(map(csv_cell, row)) for row in rows))
+            content_type = 'text/csv'
+        else:
+            lines = (json.dumps(dict(zip(header, row)), cls=DjangoJSONEncoder) + '\n' for row in rows)
+            content_type = 'application/x-ndjson'
+        response = StreamingHttpResponse(lines, content_type=content_type)
+        response['Content-Disposition'] = f'attachment; filename="job-{job_id}-applicants.{fmt}"'
+        return response
+
+def change_feed_response(request, feed):
+    try:
+        since = parse_token(request.query_params.get('since'))
+    except ValueError:
+        raise ValidationError({"since": ["Invalid token."]})
+    return Response(ChangeFeedSerializer(feed.read(since), context={'request': request}).data)
+
+class ApplicantChangesView(APIView):
+    # Applicants inserted, updated or deleted since ?since=<token>. Without a token it
+    # returns the whole list and the token to continue from. The /api/async/ twin can
+    # long-poll or stream.
+    permission_classes = [IsAuthenticated, IsEmployer]
+    authentication_classes = [StatelessProfileJWTAuthentication]
+
+    def get(self, request, job_id):
+        if not Job.objects.filter(pk=job_id, employer=get_employer(request)).exists():
+            raise NotFound()
+        applications = ApplicationSerializer.setup_eager_loading(Application.objects.filter(job_id=job_id))
+        return change_feed_response(request, ChangeFeed.applicants(job_id, applications))
+
+class AppliedChangesView(APIView):
+    permission_classes = [IsAuthenticated, IsJobseeker]
+    authentication_classes = [StatelessProfileJWTAuthentication]
+
+    def get(self, request):
+        jobseeker = get_jobseeker(request)
+        applications = ApplicationSerializer.setup_eager_loading(Application.objects.filter(jobseeker=jobseeker))
+        return change_feed_response(request, ChangeFeed.applied(jobseeker.pk, applications))
 
 class UpdateApplicationStatusView(APIView):
     permission_classes = [IsAuthenticated, IsEmployer]
@@ -184,10 +401,11 @@ class UpdateApplicationStatusView(APIView):
         if new_status not in valid_statuses:
             return Response({"detail": "Invalid status."}, status=400)
 
-        updated = Application.objects.filter(
-            id__in=app_ids,
-            job__employer__user=request.user
-        ).update(status=new_status)
+        with transaction.atomic():
+            updated = update_statuses(
+                Application.objects.filter(id__in=app_ids, job__employer=get_employer(request)),
+                new_status,
+            )
 
         return Response({"updated": updated}, status=200)
 
@@ -197,46 +415,49 @@ class MyTokenObtainPairView(TokenObtainPairView):
 class AppliedJobsView(generics.ListAPIView):
     serializer_class = ApplicationSerializer
     permission_classes = [IsAuthenticated, IsJobseeker]
+    authentication_classes = [StatelessProfileJWTAuthentication]
 
     def get_queryset(self):
-        user = self.request.user
-        if not hasattr(user, 'jobseeker'):
+        jobseeker = get_jobseeker(self.request)
+        if jobseeker is None:
             return Application.objects.none()
-        return Application.objects.filter(jobseeker=user.jobseeker)
+        return ApplicationSerializer.setup_eager_loading(Application.objects.filter(jobseeker=jobseeker))
 
 class DeleteApplicationView(generics.DestroyAPIView):
     serializer_class = ApplicationSerializer
     permission_classes = [IsAuthenticated, IsJobseeker]
 
     def get_queryset(self):
-        user = self.request.user
-        if hasattr(user, 'jobseeker'):
-            return Application.objects.filter(jobseeker=user.jobseeker)
+        jobseeker = get_jobseeker(self.request)
+        if jobseeker is not None:
+            return Application.objects.filter(jobseeker=jobseeker)
         return Application.objects.none()
 
+class ApplicationStatusHistoryView(generics.ListAPIView):
+    # Status changes of one of the jobseeker's own applications, newest first
+    serializer_class = ApplicationStatusEventSerializer
+    permission_classes = [IsAuthenticated, IsJobseeker]
+    authentication_classes = [StatelessProfileJWTAuthentication]
+
+    def get_queryset(self):
+        return ApplicationStatusEvent.objects.filter(
+            application_id=self.kwargs['pk'], application__jobseeker=get_jobseeker(self.request)
+        )
+
 class SetTutorialSeenView(APIView):
     permission_classes = [IsAuthenticated]
+    authentication_classes = [StatelessProfileJWTAuthentication]
 
     def get(self, request):
-        user = request.user
-        profile = None
-        if hasattr(user, 'jobseeker'):
-            profile = user.jobseeker
-        elif hasattr(user, 'employer'):
-            profile = user.employer
-        else:
+        profile = get_profile(request)
+        if profile is None:
             return Response({"detail": "No profile found."}, status=400)
         return Response({"has_seen_tutorial": profile.has_seen_tutorial})
 
     def patch(self, request):
-        user = request.user
-        profile = None
-        if hasattr(user, 'jobseeker'):
-            profile = user.jobseeker
-        elif hasattr(user, 'employer'):
-            profile = user.employer
-        else:
+        profile = get_profile(request)
+        if profile is None:
             return Response({"detail": "No profile found."}, status=400)
         profile.has_seen_tutorial = True
-        profile.save()
+        profile.save(update_fields=['has_seen_tutorial'])
         return Response({"has_seen_tutorial": True})
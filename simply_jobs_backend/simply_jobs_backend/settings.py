@@ -13,6 +13,7 @@ https://docs.djangoproject.com/en/5.1/ref/settings/
 from pathlib import Path
 from datetime import timedelta
 from dotenv import load_dotenv
+from django.core.exceptions import ImproperlyConfigured
 import os
 
 load_dotenv()
@@ -24,17 +25,24 @@ BASE_DIR = Path(__file__).resolve().parent.parent
 # Quick-start development settings - unsuitable for production
 # See https://docs.djangoproject.com/en/5.1/howto/deployment/checklist/
 
-# SECURITY WARNING: keep the secret key used in production secret!
-SECRET_KEY = 'django-insecure-!@@oq*l*!(^*wv*3ofwu86_#o-&+)0hym=l@(f=g97*iq$)7*)'
-
 # SECURITY WARNING: don't run with debug turned on in production!
-DEBUG = True
+DEBUG = os.getenv('DEBUG', 'true').lower() == 'true'
+
+# SECURITY WARNING: keep the secret key used in production secret! It signs tokens and
+# media links, so outside DEBUG it must come from the environment.
+SECRET_KEY = os.getenv('SECRET_KEY')
+if not SECRET_KEY:
+    if not DEBUG:
+        raise ImproperlyConfigured("Set SECRET_KEY in the environment (or .env) when DEBUG is off.")
+    SECRET_KEY = 'django-insecure-!@@oq*l*!(^*wv*3ofwu86_#o-&+)0hym=l@(f=g97*iq$)7*)'
 
 ALLOWED_HOSTS = ['*']
 
 REST_FRAMEWORK = {
     'DEFAULT_AUTHENTICATION_CLASSES': (
-        'rest_framework_simplejwt.authentication.JWTAuthentication',
+        # Loads the user row on every request; read-heavy views opt into
+        # StatelessProfileJWTAuthentication to authenticate from token claims alone.
+        'jobsearch_app.authentication.ProfileJWTAuthentication',
     ),
     "DEFAULT_PERMISSION_CLASSES": [
         "rest_framework.permissions.IsAuthenticated",
@@ -96,12 +104,129 @@ WSGI_APPLICATION = 'simply_jobs_backend.wsgi.application'
 # Database
 # https://docs.djangoproject.com/en/5.1/ref/settings/#databases
 
-DATABASES = {
-    'default': {
-        'ENGINE': 'django.db.backends.sqlite3',
-        'NAME': BASE_DIR / 'db.sqlite3',
+# DB_ENGINE selects the profile: 'sqlite' (default) or 'postgres'. Everything else
+# comes from the environment / .env so production needs no code changes.
+
+DB_ENGINE = os.getenv('DB_ENGINE', 'sqlite')
+
+if DB_ENGINE == 'postgres':
+    DB_POOL = os.getenv('DB_POOL', 'false').lower() == 'true'
+    DATABASES = {
+        'default': {
+            'ENGINE': 'django.db.backends.postgresql',
+            'NAME': os.getenv('DB_NAME', 'simply_jobs'),
+            'USER': os.getenv('DB_USER', ''),
+            'PASSWORD': os.getenv('DB_PASSWORD', ''),
+            'HOST': os.getenv('DB_HOST', 'localhost'),
+            'PORT': os.getenv('DB_PORT', '5432'),
+            # The psycopg pool and persistent connections are mutually exclusive. Under ASGI
+            # persistent connections aren't reused across requests, so use the pool there.
+            'CONN_MAX_AGE': 0 if DB_POOL else int(os.getenv('DB_CONN_MAX_AGE', '0')),
+            'CONN_HEALTH_CHECKS': True,
+            'OPTIONS': {
+                'pool': {
+                    'min_size': int(os.getenv('DB_POOL_MIN_SIZE', '2')),
+                    'max_size': int(os.getenv('DB_POOL_MAX_SIZE', '10')),
+                },
+            } if DB_POOL else {},
+        }
     }
-}
+else:
+    DATABASES = {
+        'default': {
+            'ENGINE': 'django.db.backends.sqlite3',
+            'NAME': os.getenv('DB_NAME', BASE_DIR / 'db.sqlite3'),
+            'CONN_MAX_AGE': int(os.getenv('DB_CONN_MAX_AGE', '0')),
+            # A file rather than the shared-cache in-memory default, so tests that use
+            # several threads get WAL and the busy timeout like a real deployment.
+            # TEST_RUNNER removes one left behind by a killed run.
+            'TEST': {'NAME': BASE_DIR / 'test_db.sqlite3'},
+            'OPTIONS': {
+                # Seconds a writer waits for the lock before "database is locked"
+                'timeout': int(os.getenv('DB_BUSY_TIMEOUT', '20')),
+                # Take the write lock at BEGIN so concurrent writers queue instead of deadlocking
+                'transaction_mode': 'IMMEDIATE',
+                # WAL lets readers run alongside a writer; NORMAL sync is safe with WAL
+                'init_command': (
+                    'PRAGMA journal_mode=WAL;'
+                    'PRAGMA synchronous=NORMAL;'
+                    'PRAGMA mmap_size=134217728;'
+                    'PRAGMA cache_size=-20000;'
+                ),
+            },
+        }
+    }
+
+TEST_RUNNER = 'simply_jobs_backend.test_runner.TestRunner'
+
+
+# Cache
+# Saves invalidate cached feeds and rankings by bumping keys in the cache, so every web
+# and task worker process must share it. LocMemCache is per process and only used with
+# DEBUG; otherwise REDIS_URL selects Redis (needs the redis package), falling back to
+# database tables made by `python manage.py createcachetable`.
+
+REDIS_URL = os.getenv('REDIS_URL')
+
+if REDIS_URL:
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.redis.RedisCache',
+            'LOCATION': REDIS_URL,
+            'KEY_PREFIX': 'simply-jobs',
+        },
+        # Per-jobseeker recommendation rankings
+        'recommendations': {
+            'BACKEND': 'django.core.cache.backends.redis.RedisCache',
+            'LOCATION': REDIS_URL,
+            'KEY_PREFIX': 'simply-jobs-recommendations',
+            'TIMEOUT': 900,
+        },
+    }
+else:
+    CACHE_BACKEND = (
+        'django.core.cache.backends.locmem.LocMemCache' if DEBUG
+        else 'django.core.cache.backends.db.DatabaseCache'
+    )
+    CACHES = {
+        'default': {
+            'BACKEND': CACHE_BACKEND,
+            'LOCATION': 'simply_jobs_cache',
+        },
+        # Per-jobseeker recommendation rankings. Both backends cull entries once
+        # MAX_ENTRIES is reached.
+        'recommendations': {
+            'BACKEND': CACHE_BACKEND,
+            'LOCATION': 'simply_jobs_recommendations',
+            'TIMEOUT': 900,
+            'OPTIONS': {'MAX_ENTRIES': 10000},
+        },
+    }
+
+# Seconds a rendered job feed page stays cached; Job saves/deletes invalidate it sooner
+JOB_FEED_CACHE_TIMEOUT = 300
+
+# Recommended jobs feed: rank the newest JOB_RECOMMENDATIONS_POOL jobs per jobseeker and
+# keep the top JOB_RECOMMENDATIONS_SIZE ids for JOB_RECOMMENDATIONS_TIMEOUT seconds
+JOB_RECOMMENDATIONS_CACHE_ALIAS = 'recommendations'
+JOB_RECOMMENDATIONS_POOL = 2000
+JOB_RECOMMENDATIONS_SIZE = 200
+JOB_RECOMMENDATIONS_TIMEOUT = 900
+
+# Applicant match scores weigh terms by how rare they are among the newest JOB_MATCH_IDF_POOL jobs
+JOB_MATCH_IDF_POOL = 2000
+
+# Background tasks (upload processing). DatabaseBroker queues them for
+# `python manage.py run_tasks`; ImmediateBroker runs them inside the request.
+TASK_BROKER = 'jobsearch_app.tasks.DatabaseBroker'
+# Seconds a worker may hold a task before it is assumed dead and the task is run again
+TASK_LEASE_SECONDS = 600
+
+# Application status emails, sent by the task worker. Prints to the console unless
+# EMAIL_BACKEND is set (e.g. 'django.core.mail.backends.smtp.EmailBackend' with EMAIL_HOST).
+EMAIL_BACKEND = os.getenv('EMAIL_BACKEND', 'django.core.mail.backends.console.EmailBackend')
+EMAIL_HOST = os.getenv('EMAIL_HOST', 'localhost')
+DEFAULT_FROM_EMAIL = os.getenv('DEFAULT_FROM_EMAIL', 'SimplyJobs <noreply@simplyjobs.local>')
 
 
 # Password validation
@@ -140,9 +265,23 @@ USE_TZ = True
 
 STATIC_URL = 'static/'
 
-# Media files (uploads like resumes)
-MEDIA_URL = '/resumes/'
-MEDIA_ROOT = BASE_DIR
+# Media files (uploads like resumes), served by jobsearch_app.media.serve_media through
+# signed links that stay valid for one to two MEDIA_URL_MAX_AGE periods
+MEDIA_URL = '/media/'
+# Only uploads live here; serve_media also refuses names outside the upload_to directories
+MEDIA_ROOT = os.getenv('MEDIA_ROOT', BASE_DIR / 'media')
+MEDIA_URL_MAX_AGE = 3600
+
+# Let the web server send media files once the signature is checked:
+# 'x-accel-redirect' (nginx, internal location MEDIA_ACCEL_PREFIX aliased to MEDIA_ROOT),
+# 'x-sendfile' (Apache mod_xsendfile, lighttpd) or None to stream from Django
+MEDIA_ACCEL = os.environ.get('MEDIA_ACCEL') or None
+MEDIA_ACCEL_PREFIX = '/protected-media/'
+
+STORAGES = {
+    'default': {'BACKEND': 'jobsearch_app.storage.ContentAddressedStorage'},
+    'staticfiles': {'BACKEND': 'django.contrib.staticfiles.storage.StaticFilesStorage'},
+}
 
 # Default primary key field type
 # https://docs.djangoproject.com/en/5.1/ref/settings/#default-auto-field
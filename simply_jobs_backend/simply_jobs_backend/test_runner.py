@@ -0,0 +1,18 @@
+import os
+from django.db import connections
+from django.test.runner import DiscoverRunner
+
+class TestRunner(DiscoverRunner):
+    # The SQLite test database is a file (DATABASES TEST NAME), so a killed run leaves it
+    # behind and the next one would stop at Django's "delete the old test database?"
+    # prompt. It is removed up front, along with its WAL files, which SQLite would
+    # otherwise replay into the new database.
+    def setup_databases(self, **kwargs):
+        if not self.keepdb:
+            for connection in connections.all():
+                name = connection.settings_dict['TEST']['NAME']
+                if connection.vendor == 'sqlite' and name:
+                    for path in (str(name), f'{name}-wal', f'{name}-shm'):
+                        if os.path.exists(path):
+                            os.remove(path)
+        return super().setup_databases(**kwargs)
@@ -2,8 +2,7 @@ from django.contrib import admin
 from django.urls import path, include
 from rest_framework_simplejwt.views import TokenRefreshView
 from jobsearch_app.views import UserRegisterView
-from django.conf import settings
-from django.conf.urls.static import static
+from jobsearch_app.media import serve_media
 
 urlpatterns = [
     path('admin/', admin.site.urls),
@@ -11,6 +10,6 @@ urlpatterns = [
     path('api/token/refresh/', TokenRefreshView.as_view(), name='refresh_token'),
     path('api/auth/', include('rest_framework.urls')),
     path('api/', include('jobsearch_app.urls')),
+    # Signed upload links, see settings.MEDIA_URL
+    path('media/<path:name>', serve_media, name='media'),
 ]
-if settings.DEBUG:
-    urlpatterns += static(settings.MEDIA_URL, document_root=settings.MEDIA_ROOT)